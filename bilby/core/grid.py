@@ -12,6 +12,22 @@ from .utils import BilbyJsonEncoder, load_json, move_old_file
 from .result import FileMovedError
 
 
+_likelihood = None
+
+
+def _initialize_global_variables(likelihood):
+    """
+    Store a global copy of the likelihood for multiprocessing.
+    """
+    global _likelihood
+    _likelihood = likelihood
+
+
+def _log_likelihood_batch_wrapper(parameters):
+    """Wrapper to the batched log likelihood. Needed for multiprocessing."""
+    return _likelihood.log_likelihood_batch(parameters)
+
+
 def grid_file_name(outdir, label, gzip=False):
     """ Returns the standard filename used for a grid file
 
@@ -37,7 +53,8 @@ def grid_file_name(outdir, label, gzip=False):
 class Grid(object):
 
     def __init__(self, likelihood=None, priors=None, grid_size=101,
-                 save=False, label='no_label', outdir='.', gzip=False):
+                 save=False, label='no_label', outdir='.', gzip=False,
+                 npool=1):
         """
 
         Parameters
@@ -58,11 +75,14 @@ class Grid(object):
             The output directory to which the grid will be saved
         gzip: bool
             Set whether to gzip the output grid file
+        npool: int
+            The number of processes to use to evaluate the likelihood
         """
 
         if priors is None:
             priors = dict()
         self.likelihood = likelihood
+        self.npool = npool
         self.priors = PriorDict(priors)
         self.n_dims = len(priors)
         self.parameter_names = list(self.priors.keys())
@@ -301,22 +321,34 @@ class Grid(object):
         # NOTE: the output will not be properly normalised
         return np.exp(ln_post - np.max(ln_post))
 
-    def _evaluate(self):
-        self._ln_likelihood = np.empty(self.mesh_grid[0].shape)
-        self._evaluate_recursion(0)
-        self.ln_noise_evidence = self.likelihood.noise_log_likelihood()
+    def _evaluate(self, batch_size=10000):
+        """ Evaluate the likelihood on the grid points
 
-    def _evaluate_recursion(self, dimension):
-        if dimension == self.n_dims:
-            current_point = tuple([[int(np.where(
-                self.likelihood.parameters[name] ==
-                self.sample_points[name])[0])] for name in self.parameter_names])
-            self._ln_likelihood[current_point] = self.likelihood.log_likelihood()
+        The flattened grid is passed to the `log_likelihood_batch` method of
+        the likelihood in chunks of `batch_size` points. If `npool` is greater
+        than one the chunks are distributed over a pool of processes.
+        """
+        flat_grid = {key: self.mesh_grid[ii].flatten()
+                     for ii, key in enumerate(self.parameter_names)}
+        n_points = self.mesh_grid[0].size
+        npool = getattr(self, 'npool', 1)
+        batch_size = max(1, min(batch_size, int(np.ceil(n_points / npool))))
+        batches = [{key: value[start:start + batch_size]
+                    for key, value in flat_grid.items()}
+                   for start in range(0, n_points, batch_size)]
+        if npool > 1:
+            import multiprocessing
+            logger.info("Evaluating the likelihood with {} processes".format(npool))
+            with multiprocessing.Pool(
+                    processes=npool, initializer=_initialize_global_variables,
+                    initargs=(self.likelihood,)) as pool:
+                ln_likelihood = pool.map(_log_likelihood_batch_wrapper, batches)
         else:
-            name = self.parameter_names[dimension]
-            for ii in range(self._ln_likelihood.shape[dimension]):
-                self.likelihood.parameters[name] = self.sample_points[name][ii]
-                self._evaluate_recursion(dimension + 1)
+            ln_likelihood = [self.likelihood.log_likelihood_batch(batch)
+                             for batch in batches]
+        self._ln_likelihood = np.concatenate(ln_likelihood).reshape(
+            self.mesh_grid[0].shape)
+        self.ln_noise_evidence = self.likelihood.noise_log_likelihood()
 
     def _get_sample_points(self, grid_size):
         for ii, key in enumerate(self.parameter_names):
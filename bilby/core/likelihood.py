@@ -5,7 +5,7 @@ import numpy as np
 from scipy.special import gammaln, xlogy
 from scipy.stats import multivariate_normal
 
-from .utils import infer_parameters_from_function
+from .utils import infer_parameters_from_function, logger
 
 
 class Likelihood(object):
@@ -52,6 +52,67 @@ class Likelihood(object):
         """
         return self.log_likelihood() - self.noise_log_likelihood()
 
+    def log_likelihood_batch(self, parameters):
+        """Log likelihood for a batch of points
+
+        By default this evaluates `log_likelihood` for each point in turn,
+        subclasses may provide a vectorised implementation.
+
+        Parameters
+        ----------
+        parameters: dict
+            A dictionary of parameter names and arrays of values, all arrays
+            should have the same length. Parameters not included keep their
+            current value in `self.parameters`.
+
+        Returns
+        -------
+        array_like: The log likelihood for each point
+        """
+        return self._evaluate_batch(self.log_likelihood, parameters)
+
+    def log_likelihood_ratio_batch(self, parameters):
+        """Difference between log likelihood and noise log likelihood for a
+        batch of points
+
+        By default this evaluates `log_likelihood_ratio` for each point in
+        turn, subclasses may provide a vectorised implementation.
+
+        Parameters
+        ----------
+        parameters: dict
+            A dictionary of parameter names and arrays of values, all arrays
+            should have the same length. Parameters not included keep their
+            current value in `self.parameters`.
+
+        Returns
+        -------
+        array_like: The log likelihood ratio for each point
+        """
+        return self._evaluate_batch(self.log_likelihood_ratio, parameters)
+
+    def _evaluate_batch(self, method, parameters):
+        """Evaluate a method of the likelihood for each point in a batch
+
+        The parameters of the likelihood are restored afterwards.
+        """
+        n_points = _batch_size(parameters)
+        original = {key: self.parameters[key] for key in parameters
+                    if key in self.parameters}
+        output = np.empty(n_points)
+        try:
+            for ii in range(n_points):
+                self.parameters.update(
+                    {key: parameters[key][ii] for key in parameters})
+                output[ii] = method()
+        finally:
+            for key in parameters:
+                if key in original:
+                    self.parameters[key] = original[key]
+                else:
+                    self.parameters.pop(key, None)
+        return output
+
     @property
     def meta_data(self):
         return getattr(self, '_meta_data', None)
@@ -167,6 +228,37 @@ class Analytical1DLikelihood(Likelihood):
         """ Residual of the function against the data. """
         return self.y - self.func(self.x, **self.model_parameters)
 
+    def _batch_parameter(self, parameters, key):
+        """ A parameter value for a batch, either a column array from the
+        batch or the current value in `self.parameters` """
+        if key in parameters:
+            return np.asarray(parameters[key])[:, np.newaxis]
+        return self.parameters[key]
+
+    def _model_batch(self, parameters):
+        """ Evaluate the function for a batch of points
+
+        The function is called once with the parameters as column arrays. If
+        the function does not broadcast over the parameters None is returned.
+
+        Returns
+        -------
+        array_like, None: The model with shape (n_points, n_data)
+        """
+        n_points = _batch_size(parameters)
+        model_parameters = {key: self._batch_parameter(parameters, key)
+                            for key in self.function_keys}
+        try:
+            model = np.asarray(self.func(self.x, **model_parameters))
+            return np.broadcast_to(model, (n_points, self.n))
+        except (ValueError, TypeError, IndexError):
+            logger.debug("Unable to vectorise {}, evaluating points individually"
+                         .format(self.func.__name__))
+            return None
+
+    def log_likelihood_ratio_batch(self, parameters):
+        return self.log_likelihood_batch(parameters) - self.noise_log_likelihood()
+
 
 class GaussianLikelihood(Analytical1DLikelihood):
     def __init__(self, x, y, func, sigma=None):
@@ -203,6 +295,17 @@ class GaussianLikelihood(Analytical1DLikelihood):
                        np.log(2 * np.pi * self.sigma**2) / 2)
         return log_l
 
+    def log_likelihood_batch(self, parameters):
+        model = self._model_batch(parameters)
+        if model is None:
+            return super(GaussianLikelihood, self).log_likelihood_batch(parameters)
+        residual = self.y - model
+        sigma = np.broadcast_to(
+            self._batch_parameter(parameters, 'sigma') if 'sigma' in parameters
+            else self.sigma, residual.shape)
+        return np.sum(- (residual / sigma)**2 / 2 -
+                      np.log(2 * np.pi * sigma**2) / 2, axis=-1)
+
     def __repr__(self):
         return self.__class__.__name__ + '(x={}, y={}, func={}, sigma={})' \
             .format(self.x, self.y, self.func.__name__, self.sigma)
@@ -268,6 +371,18 @@ class PoissonLikelihood(Analytical1DLikelihood):
         else:
             return np.sum(-rate + self.y * np.log(rate) - gammaln(self.y + 1))
 
+    def log_likelihood_batch(self, parameters):
+        rate = self._model_batch(parameters)
+        if rate is None:
+            return super(PoissonLikelihood, self).log_likelihood_batch(parameters)
+        elif np.any(rate < 0.):
+            raise ValueError(("Poisson rate function returns a negative",
+                              " value!"))
+        with np.errstate(divide='ignore'):
+            log_l = np.sum(-rate + self.y * np.log(rate) - gammaln(self.y + 1), axis=-1)
+        log_l[np.any(rate == 0., axis=-1)] = -np.inf
+        return log_l
+
     def __repr__(self):
         return Analytical1DLikelihood.__repr__(self)
 
@@ -311,6 +426,15 @@ class ExponentialLikelihood(Analytical1DLikelihood):
             return -np.inf
         return -np.sum(np.log(mu) + (self.y / mu))
 
+    def log_likelihood_batch(self, parameters):
+        mu = self._model_batch(parameters)
+        if mu is None:
+            return super(ExponentialLikelihood, self).log_likelihood_batch(parameters)
+        with np.errstate(invalid='ignore'):
+            log_l = -np.sum(np.log(mu) + (self.y / mu), axis=-1)
+        log_l[np.any(mu < 0., axis=-1)] = -np.inf
+        return log_l
+
     def __repr__(self):
         return Analytical1DLikelihood.__repr__(self)
 
@@ -379,6 +503,23 @@ class StudentTLikelihood(Analytical1DLikelihood):
                    gammaln((nu + 1) / 2) - gammaln(nu / 2))
         return log_l
 
+    def log_likelihood_batch(self, parameters):
+        model = self._model_batch(parameters)
+        if model is None:
+            return super(StudentTLikelihood, self).log_likelihood_batch(parameters)
+        residual = self.y - model
+        if 'nu' in parameters:
+            nu = self._batch_parameter(parameters, 'nu')
+        else:
+            nu = self.nu
+        if np.any(np.asarray(nu) <= 0.):
+            raise ValueError("Number of degrees of freedom for Student's "
+                             "t-likelihood must be positive")
+        nu = np.broadcast_to(nu, residual.shape)
+        return np.sum(- (nu + 1) * np.log1p(self.lam * residual**2 / nu) / 2 +
+                      np.log(self.lam / (nu * np.pi)) / 2 +
+                      gammaln((nu + 1) / 2) - gammaln(nu / 2), axis=-1)
+
     def __repr__(self):
         base_string = '(x={}, y={}, func={}, nu={}, sigma={})'
         return self.__class__.__name__ + base_string.format(
@@ -478,6 +619,13 @@ class AnalyticalMultidimensionalCovariantGaussian(Likelihood):
         x = np.array([self.parameters["x{0}".format(i)] for i in range(self.dim)])
         return self.pdf.logpdf(x)
 
+    def log_likelihood_batch(self, parameters):
+        n_points = _batch_size(parameters)
+        x = np.array([
+            np.broadcast_to(parameters.get(key, self.parameters[key]), n_points)
+            for key in ["x{0}".format(i) for i in range(self.dim)]]).T
+        return np.atleast_1d(self.pdf.logpdf(x))
+
 
 class AnalyticalMultidimensionalBimodalCovariantGaussian(Likelihood):
     """
@@ -567,6 +715,40 @@ class JointLikelihood(Likelihood):
         """ This is just the sum of the noise likelihoods of all parts of the joint likelihood"""
         return sum([likelihood.noise_log_likelihood() for likelihood in self.likelihoods])
 
+    def log_likelihood_batch(self, parameters):
+        """ The sum of the batched log likelihoods of all parts of the joint likelihood"""
+        return sum([likelihood.log_likelihood_batch(parameters)
+                    for likelihood in self.likelihoods])
+
+    def log_likelihood_ratio_batch(self, parameters):
+        """ The sum of the batched log likelihood ratios of all parts of the joint likelihood"""
+        return sum([likelihood.log_likelihood_ratio_batch(parameters)
+                    for likelihood in self.likelihoods])
+
+
+def _batch_size(parameters):
+    """ The number of points in a batch of parameters
+
+    Parameters
+    ----------
+    parameters: dict
+        A dictionary of parameter names and arrays of values
+
+    Returns
+    -------
+    int: The length of the arrays
+
+    Raises
+    ------
+    ValueError: If the arrays have different lengths
+    """
+    sizes = set(len(np.atleast_1d(value)) for value in parameters.values())
+    if len(sizes) != 1:
+        raise ValueError(
+            "All parameters in a batch must have the same length, got {}"
+            .format(sizes))
+    return sizes.pop()
+
 
 class MarginalizedLikelihoodReconstructionError(Exception):
     pass
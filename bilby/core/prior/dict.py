@@ -110,6 +110,10 @@ class PriorDict(dict):
         total_dict["__prior_dict__"] = True
         total_dict["__module__"] = self.__module__
         total_dict["__name__"] = self.__class__.__name__
+        if len(self._cached_normalizations) > 0:
+            total_dict["__normalizations__"] = [
+                [list(keys), factor]
+                for keys, factor in self._cached_normalizations.items()]
         return total_dict
 
     def to_json(self, outdir, label):
@@ -166,8 +170,11 @@ class PriorDict(dict):
         for key in ["__module__", "__name__", "__prior_dict__"]:
             if key in prior_dict:
                 del prior_dict[key]
+        normalizations = prior_dict.pop("__normalizations__", list())
         obj = cls(dict())
         obj.from_dictionary(prior_dict)
+        obj._cached_normalizations = {
+            tuple(keys): factor for keys, factor in normalizations}
         return obj
 
     @classmethod
@@ -358,50 +365,105 @@ class PriorDict(dict):
         return samples
 
     def sample_subset_constrained(self, keys=iter([]), size=None):
-        if size is None or size == 1:
-            while True:
-                sample = self.sample_subset(keys=keys, size=size)
-                if self.evaluate_constraints(sample):
-                    return sample
-        else:
-            needed = np.prod(size)
-            constraint_keys = list()
-            for ii, key in enumerate(keys[-1::-1]):
-                if isinstance(self[key], Constraint):
-                    constraint_keys.append(-ii - 1)
-            for ii in constraint_keys[-1::-1]:
-                del keys[ii]
-            all_samples = {key: np.array([]) for key in keys}
-            _first_key = list(all_samples.keys())[0]
-            while len(all_samples[_first_key]) < needed:
-                samples = self.sample_subset(keys=keys, size=needed)
-                keep = np.array(self.evaluate_constraints(samples), dtype=bool)
-                for key in samples:
-                    all_samples[key] = np.hstack(
-                        [all_samples[key], samples[key][keep].flatten()])
-            all_samples = {key: np.reshape(all_samples[key][:needed], size)
-                           for key in all_samples
-                           if not isinstance(self[key], Constraint)}
-            return all_samples
+        """Draw samples from the prior set which satisfy the constraints
+
+        Parameters
+        ----------
+        keys: list
+            List of prior keys to draw samples from
+        size: int or tuple of ints, optional
+            See numpy.random.uniform docs
+
+        Returns
+        -------
+        dict: Dictionary of the drawn samples
+        """
+        keys = list(keys)
+        if not self._has_constraints():
+            return self.sample_subset(keys=keys, size=size)
+        needed = 1 if size is None else int(np.prod(size))
+        all_samples, _, _ = self._sample_constrained_array(
+            keys=keys, needed=needed)
+        if size is None:
+            return {key: all_samples[key][0] for key in all_samples}
+        return {key: np.reshape(all_samples[key], size)
+                for key in all_samples}
+
+    def _sample_constrained_array(self, keys, needed):
+        """ Draw a fixed number of samples satisfying the constraints
+
+        The number of samples drawn in each round is set by the running
+        acceptance rate (or the cached normalisation factor) so that only
+        a few rounds are needed even for tight constraints. Accepted
+        samples are written into preallocated arrays.
+
+        Parameters
+        ----------
+        keys: list
+            List of prior keys to draw samples from
+        needed: int
+            The number of accepted samples required
+
+        Returns
+        -------
+        samples: dict
+            Dictionary of arrays of the accepted samples
+        n_drawn: int
+            The total number of samples drawn
+        n_accepted: int
+            The total number of drawn samples satisfying the constraints
+        """
+        max_draw = 1000000
+        keys = [key for key in keys if not isinstance(self[key], Constraint)]
+        samples = {key: np.empty(needed) for key in keys}
+        factor = self._cached_normalizations.get(tuple(keys), 1.2)
+        n_filled = n_drawn = n_accepted = 0
+        while n_filled < needed:
+            if n_accepted > 0:
+                factor = n_drawn / n_accepted
+            elif n_drawn > 0:
+                factor = 10 * n_drawn
+            n_draw = int(min(
+                np.ceil(1.1 * (needed - n_filled) * factor) + 10, max_draw))
+            draw = self.sample_subset(keys=keys, size=n_draw)
+            keep = np.broadcast_to(np.asarray(
+                self.evaluate_constraints(draw), dtype=bool), (n_draw,))
+            n_keep = min(np.count_nonzero(keep), needed - n_filled)
+            for key in samples:
+                samples[key][n_filled:n_filled + n_keep] = np.reshape(
+                    draw[key], n_draw)[keep][:n_keep]
+            n_filled += n_keep
+            n_drawn += n_draw
+            n_accepted += np.count_nonzero(keep)
+        return samples, n_drawn, n_accepted
+
+    def _has_constraints(self):
+        return any(isinstance(self[key], Constraint) for key in self)
 
     def normalize_constraint_factor(self, keys):
+        """ The inverse of the fraction of the prior volume allowed by the
+        constraints, estimated by sampling and cached for each set of keys.
+
+        The cached values are kept by `copy` and written to json files.
+
+        Parameters
+        ----------
+        keys: tuple
+            The keys of the parameters being evaluated
+
+        Returns
+        -------
+        float: The normalisation factor
+        """
         if keys in self._cached_normalizations.keys():
             return self._cached_normalizations[keys]
+        elif not self._has_constraints():
+            return 1
         else:
             min_accept = 1000
-            sampling_chunk = 5000
-            samples = self.sample_subset(keys=keys, size=sampling_chunk)
-            keep = np.atleast_1d(self.evaluate_constraints(samples))
-            if len(keep) == 1:
-                return 1
-            all_samples = {key: np.array([]) for key in keys}
-            while np.count_nonzero(keep) < min_accept:
-                samples = self.sample_subset(keys=keys, size=sampling_chunk)
-                for key in samples:
-                    all_samples[key] = np.hstack(
-                        [all_samples[key], samples[key].flatten()])
-                keep = np.array(self.evaluate_constraints(all_samples), dtype=bool)
-            factor = len(keep) / np.count_nonzero(keep)
+            _, n_drawn, n_accepted = self._sample_constrained_array(
+                keys=keys, needed=min_accept)
+            factor = n_drawn / n_accepted
             self._cached_normalizations[keys] = factor
             return factor
 
@@ -488,6 +550,93 @@ class PriorDict(dict):
         """
         return list(flatten([self[key].rescale(sample) for key, sample in zip(keys, theta)]))
 
+    def rescale_array(self, keys, theta):
+        """Rescale an array of points from the unit cube to the prior
+
+        Parameters
+        ----------
+        keys: list
+            List of prior keys to be rescaled, one for each column of theta
+        theta: array_like
+            Array of values drawn from a unit cube with shape
+            (n_points, len(keys))
+
+        Returns
+        -------
+        array_like: Array of rescaled points with shape (n_points, len(keys))
+        """
+        theta = np.atleast_2d(theta)
+        keys = list(keys)
+        output = np.empty(theta.shape)
+        joint_keys = list()
+        for ii, key in enumerate(keys):
+            if isinstance(self[key], JointPrior):
+                joint_keys.append(key)
+            else:
+                output[:, ii] = self[key].rescale(theta[:, ii])
+        for dist, indexes in self._joint_prior_columns(keys, joint_keys):
+            output[:, indexes] = np.reshape(
+                dist.rescale(theta[:, indexes]), (len(theta), len(indexes)))
+        return output
+
+    def ln_prob_array(self, keys, theta):
+        """Calculate the joint log probability of an array of points
+
+        Parameters
+        ----------
+        keys: list
+            List of prior keys, one for each column of theta
+        theta: array_like
+            Array of points with shape (n_points, len(keys))
+
+        Returns
+        -------
+        array_like: Joint log probability of each point including the
+            prior constraints
+        """
+        theta = np.atleast_2d(theta)
+        keys = list(keys)
+        ln_prob = np.zeros(len(theta))
+        joint_keys = list()
+        for ii, key in enumerate(keys):
+            if isinstance(self[key], JointPrior):
+                joint_keys.append(key)
+            else:
+                ln_prob += self[key].ln_prob(theta[:, ii])
+        for dist, indexes in self._joint_prior_columns(keys, joint_keys):
+            ln_prob += dist.ln_prob(theta[:, indexes])
+        return self._constrain_ln_prob_array(keys, theta, ln_prob)
+
+    def _joint_prior_columns(self, keys, joint_keys):
+        """ Group the columns belonging to each joint prior distribution
+
+        The columns are ordered as the names of the distribution so the
+        whole block can be passed to the distribution in one call.
+        """
+        dists = list()
+        for key in joint_keys:
+            if not any(self[key].dist is dist for dist in dists):
+                dists.append(self[key].dist)
+        for dist in dists:
+            missing = [name for name in dist.names if name not in keys]
+            if len(missing) > 0:
+                raise ValueError(
+                    "Array evaluation of a joint prior requires all of its "
+                    "parameters, missing {}".format(missing))
+            yield dist, [keys.index(name) for name in dist.names]
+
+    def _constrain_ln_prob_array(self, keys, theta, ln_prob):
+        if not self._has_constraints():
+            return ln_prob
+        sample = {key: theta[:, ii] for ii, key in enumerate(keys)}
+        keep = np.broadcast_to(np.asarray(
+            self.evaluate_constraints(sample), dtype=bool), ln_prob.shape)
+        constrained_ln_prob = -np.inf * np.ones_like(ln_prob)
+        if np.any(keep):
+            ratio = self.normalize_constraint_factor(tuple(keys))
+            constrained_ln_prob[keep] = ln_prob[keep] + np.log(ratio)
+        return constrained_ln_prob
+
     def test_redundancy(self, key, disable_logging=False):
         """Empty redundancy test, should be overwritten in subclasses"""
         return False
@@ -517,7 +666,21 @@ class PriorDict(dict):
         We have to overwrite the copy method as it fails due to the presence of
         defaults.
         """
-        return self.__class__(dictionary=dict(self))
+        prior = self.__class__(dictionary=dict(self))
+        prior._cached_normalizations = self._cached_normalizations.copy()
+        return prior
+
+    def __setitem__(self, key, value):
+        super(PriorDict, self).__setitem__(key, value)
+        self._cached_normalizations = dict()
+
+    def __delitem__(self, key):
+        super(PriorDict, self).__delitem__(key)
+        self._cached_normalizations = dict()
+
+    def update(self, *args, **kwargs):
+        super(PriorDict, self).update(*args, **kwargs)
+        self._cached_normalizations = dict()
 
 
 class PriorSet(PriorDict):
@@ -691,6 +854,65 @@ class ConditionalPriorDict(PriorDict):
             result[key] = self[key].rescale(theta[index], **required_variables)
         return [result[key] for key in keys]
 
+    def rescale_array(self, keys, theta):
+        """Rescale an array of points from the unit cube to the prior
+
+        Parameters
+        ----------
+        keys: list
+            List of prior keys to be rescaled, one for each column of theta
+        theta: array_like
+            Array of values drawn from a unit cube with shape
+            (n_points, len(keys))
+
+        Returns
+        -------
+        array_like: Array of rescaled points with shape (n_points, len(keys))
+        """
+        self._check_resolved()
+        keys = list(keys)
+        self._update_rescale_keys(keys)
+        theta = np.atleast_2d(theta)
+        result = dict()
+        for key, index in zip(self.sorted_keys_without_fixed_parameters, self._rescale_indexes):
+            required_variables = {k: result[k] for k in getattr(self[key], 'required_variables', [])}
+            try:
+                result[key] = self[key].rescale(theta[:, index], **required_variables)
+            except ValueError:
+                # Some prior classes can not handle an array of conditional parameters
+                result[key] = np.array([
+                    self[key].rescale(theta[ii, index], **{
+                        k: value[ii] for k, value in required_variables.items()})
+                    for ii in range(len(theta))])
+        return np.array([result[key] for key in keys]).T
+
+    def ln_prob_array(self, keys, theta):
+        """Calculate the joint log probability of an array of points
+
+        Parameters
+        ----------
+        keys: list
+            List of prior keys, one for each column of theta
+        theta: array_like
+            Array of points with shape (n_points, len(keys))
+
+        Returns
+        -------
+        array_like: Joint log probability of each point including the
+            prior constraints
+        """
+        self._check_resolved()
+        theta = np.atleast_2d(theta)
+        keys = list(keys)
+        sample = {key: theta[:, ii] for ii, key in enumerate(keys)}
+        ln_prob = np.zeros(len(theta))
+        for key in keys:
+            required_variables = {
+                k: sample[k] if k in sample else self[k].least_recently_sampled
+                for k in getattr(self[key], 'required_variables', [])}
+            ln_prob += self[key].ln_prob(sample[key], **required_variables)
+        return self._constrain_ln_prob_array(keys, theta, ln_prob)
+
     def _update_rescale_keys(self, keys):
         if not keys == self._least_recently_rescaled_keys:
             self._rescale_indexes = [keys.index(element) for element in self.sorted_keys_without_fixed_parameters]
@@ -550,15 +550,25 @@ class MultivariateGaussianDist(BaseJointPriorDist):
             if self.nmodes == 1:
                 mode = 0
             else:
-                mode = np.argwhere(self.cumweights - np.random.rand() > 0)[0][0]
+                # pick a mode for each sample
+                mode = np.searchsorted(
+                    self.cumweights, np.random.rand(samp.shape[0]), side='right')
 
         samp = erfinv(2. * samp - 1) * 2. ** 0.5
 
+        if np.ndim(mode) == 0:
+            return self._rescale_to_mode(samp, mode)
+        rescaled = np.empty(samp.shape)
+        for ii in np.unique(mode):
+            in_mode = mode == ii
+            rescaled[in_mode] = self._rescale_to_mode(samp[in_mode], ii)
+        return rescaled
+
+    def _rescale_to_mode(self, samp, mode):
         # rotate and scale to the multivariate normal shape
-        samp = self.mus[mode] + self.sigmas[mode] * np.einsum('ij,kj->ik',
+        return self.mus[mode] + self.sigmas[mode] * np.einsum('ij,kj->ik',
                                                               samp * self.sqeigvalues[mode],
                                                               self.eigvectors[mode])
-        return samp
 
     def _sample(self, size, **kwargs):
         try:
@@ -605,10 +615,9 @@ class MultivariateGaussianDist(BaseJointPriorDist):
         return samps
 
     def _ln_prob(self, samp, lnprob, outbounds):
-        for j in range(samp.shape[0]):
-            # loop over the modes and sum the probabilities
-            for i in range(self.nmodes):
-                lnprob[j] = np.logaddexp(lnprob[j], self.mvn[i].logpdf(samp[j]))
+        # loop over the modes and sum the probabilities
+        for i in range(self.nmodes):
+            lnprob = np.logaddexp(lnprob, self.mvn[i].logpdf(samp))
 
         # set out-of-bounds values to -inf
         lnprob[outbounds] = -np.inf
@@ -1,7 +1,10 @@
 from __future__ import division
 
+import hashlib
 import inspect
 import os
+import pickle
+import re
 from collections import OrderedDict, namedtuple
 from copy import copy
 from distutils.version import LooseVersion
@@ -39,7 +42,8 @@ def result_file_name(outdir, label, extension='json', gzip=False):
     label: str
         Naming scheme of the output file
     extension: str, optional
-        Whether to save as `hdf5` or `json`
+        Whether to save as `hdf5`, `json` or `columnar`, columnar files are
+        saved with a `.h5` extension
     gzip: bool, optional
         Set to True to append `.gz` to the extension for saving in gzipped format
 
@@ -47,7 +51,9 @@ def result_file_name(outdir, label, extension='json', gzip=False):
     -------
     str: File name of the output file
     """
-    if extension in ['json', 'hdf5']:
+    if extension == 'columnar':
+        return os.path.join(outdir, '{}_result.h5'.format(label))
+    elif extension in ['json', 'hdf5']:
         if extension == 'json' and gzip:
             return os.path.join(outdir, '{}_result.{}.gz'.format(label, extension))
         else:
@@ -67,7 +73,8 @@ def _determine_file_name(filename, outdir, label, extension, gzip):
             return result_file_name(outdir, label, extension, gzip)
 
 
-def read_in_result(filename=None, outdir=None, label=None, extension='json', gzip=False):
+def read_in_result(filename=None, outdir=None, label=None, extension='json',
+                   gzip=False, columns=None, metadata_only=False):
     """ Reads in a stored bilby result object
 
     Parameters
@@ -77,6 +84,18 @@ def read_in_result(filename=None, outdir=None, label=None, extension='json', gzi
     outdir, label, extension: str
         Name of the output directory, label and extension used for the default
         naming scheme.
+    columns: list, optional
+        If given, only these columns of the posterior are read
+    metadata_only: bool, optional
+        If True, only the metadata (evidences, priors, labels, etc.) are read,
+        the posterior and other sample arrays are not loaded
+
+    Notes
+    -----
+    Only columnar files (see `Result.save_to_file`) can be partially read, for
+    other formats the whole file is read and the unwanted data discarded.
+    The posterior of a columnar file is read the first time it is accessed,
+    see `Result.from_columnar`.
 
     """
     filename = _determine_file_name(filename, outdir, label, extension, gzip)
@@ -87,19 +106,245 @@ def read_in_result(filename=None, outdir=None, label=None, extension='json', gzi
         extension = os.path.splitext(os.path.splitext(filename)[0])[1].lstrip('.')
 
     if 'json' in extension:
-        result = Result.from_json(filename=filename)
+        result = Result.from_json(filename=filename, metadata_only=metadata_only)
     elif ('hdf5' in extension) or ('h5' in extension):
+        if _is_columnar_file(filename):
+            return Result.from_columnar(
+                filename=filename, columns=columns, metadata_only=metadata_only)
         result = Result.from_hdf5(filename=filename)
     elif extension is None:
         raise ValueError("No filetype extension provided")
     else:
         raise ValueError("Filetype {} not understood".format(extension))
+    if metadata_only:
+        for attr in _COLUMNAR_ARRAY_ATTRS:
+            setattr(result, attr, None)
+    elif columns is not None:
+        result.posterior = result.posterior[list(columns)]
     return result
 
 
+_COLUMNAR_FORMAT = "bilby-columnar"
+_COLUMNAR_FORMAT_VERSION = 1
+_COLUMNAR_ARRAY_ATTRS = [
+    'posterior', 'nested_samples', 'samples', 'walkers',
+    'log_likelihood_evaluations', 'log_prior_evaluations']
+
+
+def _is_columnar_file(filename):
+    """ Check if filename is a result file written in the columnar format """
+    try:
+        import h5py
+    except ImportError:
+        return False
+    try:
+        with h5py.File(filename, 'r') as ff:
+            return ff.attrs.get('format', None) == _COLUMNAR_FORMAT
+    except (OSError, IOError):
+        return False
+
+
+def _load_json_metadata(filename, gzip=False):
+    """ Load a JSON result file without decoding the sample arrays
+
+    Files written by `Result.save_to_file` without gzip are indented, so each
+    top-level key starts a line indented by exactly two spaces (newlines
+    inside JSON strings are always escaped). This is used to split the file
+    into its top-level entries and only decode those which are not sample
+    arrays. Other files are decoded in full.
+    """
+    if gzip or os.path.splitext(filename)[1].lstrip('.') == 'gz':
+        dictionary = load_json(filename, gzip)
+    else:
+        with open(filename, 'r') as ff:
+            text = ff.read()
+        matches = list(_JSON_TOP_LEVEL_KEY.finditer(text))
+        if len(matches) == 0:
+            dictionary = json.loads(text, object_hook=decode_bilby_json)
+        else:
+            dictionary = OrderedDict()
+            ends = [match.start() for match in matches[1:]] + [text.rindex('}')]
+            try:
+                for match, end in zip(matches, ends):
+                    key = json.loads(match.group(1))
+                    if key in _COLUMNAR_ARRAY_ATTRS:
+                        continue
+                    value = text[match.end():end].rstrip().rstrip(',')
+                    dictionary[key] = json.loads(
+                        value, object_hook=decode_bilby_json)
+            except ValueError:
+                dictionary = json.loads(text, object_hook=decode_bilby_json)
+    for key in _COLUMNAR_ARRAY_ATTRS:
+        dictionary.pop(key, None)
+    return dictionary
+
+
+_JSON_TOP_LEVEL_KEY = re.compile(r'\n  ("(?:[^"\\]|\\.)*"): ')
+
+
+def _write_columns(group, frame):
+    """ Write each column of a DataFrame to its own dataset in group """
+    import h5py
+    columns = list(frame.columns)
+    group.attrs['columns'] = json.dumps(columns, cls=BilbyJsonEncoder)
+    group.attrs['length'] = len(frame)
+    for ii, column in enumerate(columns):
+        values = np.asarray(frame[column].values)
+        if values.dtype.kind in 'OSU':
+            dataset = group.create_dataset(
+                'column_{}'.format(ii), data=values.astype(str).astype(object),
+                dtype=h5py.string_dtype())
+        else:
+            dataset = group.create_dataset('column_{}'.format(ii), data=values)
+        dataset.attrs['name'] = json.dumps(column, cls=BilbyJsonEncoder)
+
+
+def _read_column(group, index):
+    """ Read a single column written by `_write_columns` """
+    dataset = group['column_{}'.format(index)]
+    if dataset.dtype.kind in 'OSU':
+        return dataset.asstr()[()]
+    return dataset[()]
+
+
+def _read_column_names(filename, group='posterior'):
+    """ Read the names of the columns written by `_write_columns` """
+    import h5py
+    with h5py.File(filename, 'r') as ff:
+        return json.loads(ff[group].attrs['columns'])
+
+
+def _read_columns(filename, group='posterior', keys=None):
+    """ Read the columns written by `_write_columns` into a DataFrame
+
+    If keys is given, only those columns are read from the file.
+    """
+    import h5py
+    names = _read_column_names(filename, group)
+    if keys is None:
+        keys = names
+    missing = [key for key in keys if key not in names]
+    if len(missing) > 0:
+        raise KeyError("Columns {} not in {}".format(missing, filename))
+    with h5py.File(filename, 'r') as ff:
+        return pd.DataFrame(OrderedDict(
+            (key, _read_column(ff[group], names.index(key))) for key in keys))
+
+
+_reweighting_likelihood = None
+
+
+def _initialize_reweighting_likelihood(likelihood):
+    """ Store the likelihood in a global variable for multiprocessing """
+    global _reweighting_likelihood
+    _reweighting_likelihood = likelihood
+
+
+def _reweighting_log_likelihood_batch(parameters):
+    """ Wrapper to the batched log likelihood. Needed for multiprocessing. """
+    return _reweighting_likelihood.log_likelihood_batch(parameters)
+
+
+def _evaluate_log_likelihood_in_chunks(
+        likelihood, samples, keys, log_likelihood_array, completed, chunk_size,
+        npool, resume_file, resume_hash=None):
+    """ Evaluate the log likelihood of each sample in chunks
+
+    Chunks are spread over a multiprocessing pool when npool > 1 and the
+    progress is written to the resume_file, along with the resume_hash,
+    after each round of chunks.
+    """
+    starts = list(range(completed, len(samples), chunk_size))
+    batches = [
+        {key: samples[start:start + chunk_size, ii] for ii, key in enumerate(keys)}
+        for start in starts
+    ]
+    _initialize_reweighting_likelihood(likelihood)
+    if npool > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(
+            npool, initializer=_initialize_reweighting_likelihood,
+            initargs=(likelihood,))
+    else:
+        pool = None
+    try:
+        for ii in range(0, len(batches), max(npool, 1)):
+            round_batches = batches[ii:ii + max(npool, 1)]
+            if pool is None:
+                values = list(map(_reweighting_log_likelihood_batch, round_batches))
+            else:
+                values = pool.map(_reweighting_log_likelihood_batch, round_batches)
+            for start, value in zip(starts[ii:ii + len(round_batches)], values):
+                log_likelihood_array[start:start + len(value)] = value
+                completed = start + len(value)
+            if resume_file is not None:
+                utils.safe_file_dump(
+                    dict(log_likelihood=log_likelihood_array, completed=completed,
+                         hash=resume_hash),
+                    resume_file, pickle)
+            logger.debug("Reweighting likelihood evaluated for {}/{} samples".format(
+                completed, len(samples)))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return log_likelihood_array
+
+
+def _reweighting_hash(samples, likelihood, prior, resume_key=None):
+    """ A hash identifying the samples, likelihood and prior of a reweighting
+
+    Only inputs which are the same in every process are used: the samples,
+    the class of the likelihood, the repr of the prior and the optional
+    resume_key. Whether the likelihood itself matches is checked by
+    `_resumed_likelihood_matches`.
+    """
+    samples = np.ascontiguousarray(samples, dtype=float)
+    sha = hashlib.sha256()
+    sha.update(str(samples.shape).encode())
+    sha.update(samples.tobytes())
+    sha.update("{}.{}".format(
+        type(likelihood).__module__, type(likelihood).__name__).encode())
+    sha.update(repr(prior).encode())
+    if resume_key is not None:
+        sha.update(str(resume_key).encode())
+    return sha.hexdigest()
+
+
+def _resumed_likelihood_matches(likelihood, samples, keys, log_likelihood_array,
+                                completed, ncheck=3):
+    """ Check resumed likelihood values by re-evaluating a few of them """
+    indices = np.unique(np.linspace(0, completed - 1, ncheck).astype(int))
+    values = likelihood.log_likelihood_batch(
+        {key: samples[indices, ii] for ii, key in enumerate(keys)})
+    return np.allclose(values, log_likelihood_array[indices])
+
+
+def _read_reweighting_resume_file(resume_file, nposterior, resume_hash=None):
+    """ Read the progress of an interrupted reweighting, if any
+
+    The stored progress is ignored if it was written for a different
+    posterior, likelihood or prior, as identified by the resume_hash.
+    """
+    if resume_file is None or not os.path.isfile(resume_file):
+        return np.zeros(nposterior), 0
+    with open(resume_file, "rb") as ff:
+        data = pickle.load(ff)
+    if len(data["log_likelihood"]) != nposterior or \
+            data.get("hash", None) != resume_hash:
+        logger.warning(
+            "Reweighting resume file {} does not match the posterior, "
+            "likelihood and prior, ignoring it".format(resume_file))
+        return np.zeros(nposterior), 0
+    logger.info("Resuming reweighting from {} completed samples".format(
+        data["completed"]))
+    return data["log_likelihood"], data["completed"]
+
+
 def get_weights_for_reweighting(
         result, new_likelihood=None, new_prior=None, old_likelihood=None,
-        old_prior=None):
+        old_prior=None, npool=1, chunk_size=1000, resume_file=None,
+        resume_key=None):
     """ Calculate the weights for reweight()
 
     See bilby.core.result.reweight() for help with the inputs
@@ -115,38 +360,50 @@ def get_weights_for_reweighting(
 
     """
     nposterior = len(result.posterior)
-    old_log_likelihood_array = np.zeros(nposterior)
-    old_log_prior_array = np.zeros(nposterior)
-    new_log_likelihood_array = np.zeros(nposterior)
-    new_log_prior_array = np.zeros(nposterior)
-
-    for ii, sample in result.posterior.iterrows():
-        # Convert sample to dictionary
-        par_sample = {key: sample[key] for key in result.search_parameter_keys}
-
-        if old_likelihood is not None:
-            old_likelihood.parameters.update(par_sample)
-            old_log_likelihood_array[ii] = old_likelihood.log_likelihood()
-        else:
-            old_log_likelihood_array[ii] = sample["log_likelihood"]
+    keys = result.search_parameter_keys
+    samples = result.posterior[keys].values.astype(float)
 
-        if new_likelihood is not None:
-            new_likelihood.parameters.update(par_sample)
-            new_log_likelihood_array[ii] = new_likelihood.log_likelihood()
-        else:
-            # Don't perform likelihood reweighting (i.e. likelihood isn't updated)
-            new_log_likelihood_array[ii] = old_log_likelihood_array[ii]
+    if old_likelihood is not None:
+        old_log_likelihood_array = _evaluate_log_likelihood_in_chunks(
+            old_likelihood, samples, keys, np.zeros(nposterior), 0,
+            chunk_size=chunk_size, npool=npool, resume_file=None)
+    else:
+        old_log_likelihood_array = result.posterior["log_likelihood"].values
 
-        if old_prior is not None:
-            old_log_prior_array[ii] = old_prior.ln_prob(par_sample)
+    if new_likelihood is not None:
+        if resume_file is not None:
+            resume_hash = _reweighting_hash(
+                samples, new_likelihood, new_prior, resume_key)
         else:
-            old_log_prior_array[ii] = sample["log_prior"]
+            resume_hash = None
+        new_log_likelihood_array, completed = _read_reweighting_resume_file(
+            resume_file, nposterior, resume_hash)
+        if completed > 0 and not _resumed_likelihood_matches(
+                new_likelihood, samples, keys, new_log_likelihood_array, completed):
+            logger.warning(
+                "The likelihood values in the reweighting resume file {} do "
+                "not match the new likelihood, ignoring it".format(resume_file))
+            new_log_likelihood_array, completed = np.zeros(nposterior), 0
+        new_log_likelihood_array = _evaluate_log_likelihood_in_chunks(
+            new_likelihood, samples, keys, new_log_likelihood_array, completed,
+            chunk_size=chunk_size, npool=npool, resume_file=resume_file,
+            resume_hash=resume_hash)
+        if resume_file is not None and os.path.isfile(resume_file):
+            os.remove(resume_file)
+    else:
+        # Don't perform likelihood reweighting (i.e. likelihood isn't updated)
+        new_log_likelihood_array = old_log_likelihood_array
 
-        if new_prior is not None:
-            new_log_prior_array[ii] = new_prior.ln_prob(par_sample)
-        else:
-            # Don't perform prior reweighting (i.e. prior isn't updated)
-            new_log_prior_array[ii] = old_log_prior_array[ii]
+    if old_prior is not None:
+        old_log_prior_array = old_prior.ln_prob_array(keys, samples)
+    else:
+        old_log_prior_array = result.posterior["log_prior"].values
+
+    if new_prior is not None:
+        new_log_prior_array = new_prior.ln_prob_array(keys, samples)
+    else:
+        # Don't perform prior reweighting (i.e. prior isn't updated)
+        new_log_prior_array = old_log_prior_array
 
     ln_weights = (
         new_log_likelihood_array + new_log_prior_array - old_log_likelihood_array - old_log_prior_array)
@@ -174,8 +431,42 @@ def rejection_sample(posterior, weights):
     return posterior[keep]
 
 
+def importance_sample(posterior, weights, nsamples=None):
+    """ Perform importance resampling on a posterior using weights
+
+    Samples are drawn with replacement with probability proportional to
+    their weights. Unlike rejection sampling, this keeps (on average) the
+    effective sample size of the weighted posterior.
+
+    Parameters
+    ----------
+    posterior: pd.DataFrame or np.ndarray of shape (nsamples, nparameters)
+        The dataframe or array containing posterior samples
+    weights: np.ndarray
+        An array of weights
+    nsamples: int, optional
+        The number of samples to draw, defaults to the effective sample
+        size of the weights
+
+    Returns
+    -------
+    reweighted_posterior: pd.DataFrame
+        The posterior resampled using importance resampling
+
+    """
+    weights = np.asarray(weights) / np.sum(weights)
+    if nsamples is None:
+        nsamples = int(np.floor(1 / np.sum(weights ** 2)))
+    idxs = np.random.choice(len(weights), size=nsamples, replace=True, p=weights)
+    if isinstance(posterior, pd.DataFrame):
+        return posterior.iloc[idxs].reset_index(drop=True)
+    else:
+        return posterior[idxs]
+
+
 def reweight(result, label=None, new_likelihood=None, new_prior=None,
-             old_likelihood=None, old_prior=None):
+             old_likelihood=None, old_prior=None, npool=1, chunk_size=1000,
+             resume_file=None, resume_key=None, resampling_method="rejection"):
     """ Reweight a result to a new likelihood/prior using rejection sampling
 
     Parameters
@@ -194,6 +485,22 @@ def reweight(result, label=None, new_likelihood=None, new_prior=None,
     old_prior: bilby.core.prior.PriorDict, (optional)
         If given, calculate the old prior from this object. If not given,
         the values stored in the posterior are used.
+    npool: int, (optional)
+        The number of processes to use for the likelihood evaluations,
+        default is 1
+    chunk_size: int, (optional)
+        The number of samples passed to each batched likelihood call
+    resume_file: str, (optional)
+        If given, the new likelihood values are written to this file after
+        each round of chunks and read back to resume an interrupted
+        reweighting of the same posterior, likelihood and prior. The file is
+        removed once all the new likelihood values are evaluated.
+    resume_key: str, (optional)
+        An additional key identifying the reweighting in the resume file,
+        e.g., the names of the data files used by the new likelihood
+    resampling_method: str, (optional)
+        Either "rejection" (default) to use `rejection_sample` or
+        "importance" to use `importance_sample`
 
     Returns
     -------
@@ -201,6 +508,9 @@ def reweight(result, label=None, new_likelihood=None, new_prior=None,
         A copy of the result object with a reweighted posterior
 
     """
+    if resampling_method not in ["rejection", "importance"]:
+        raise ValueError("Resampling method {} not understood".format(
+            resampling_method))
 
     result = copy(result)
     nposterior = len(result.posterior)
@@ -208,17 +518,25 @@ def reweight(result, label=None, new_likelihood=None, new_prior=None,
 
     ln_weights, new_log_likelihood_array, new_log_prior_array = get_weights_for_reweighting(
         result, new_likelihood=new_likelihood, new_prior=new_prior,
-        old_likelihood=old_likelihood, old_prior=old_prior)
+        old_likelihood=old_likelihood, old_prior=old_prior, npool=npool,
+        chunk_size=chunk_size, resume_file=resume_file, resume_key=resume_key)
 
     # Overwrite the likelihood and prior evaluations
     result.posterior["log_likelihood"] = new_log_likelihood_array
     result.posterior["log_prior"] = new_log_prior_array
 
-    weights = np.exp(ln_weights)
+    weights = np.exp(ln_weights - np.max(ln_weights))
 
-    result.posterior = rejection_sample(result.posterior, weights=weights)
-    logger.info("Rejection sampling resulted in {} samples".format(len(result.posterior)))
-    result.meta_data["reweighted_using_rejection_sampling"] = True
+    if resampling_method == "rejection":
+        result.posterior = rejection_sample(result.posterior, weights=weights)
+        logger.info("Rejection sampling resulted in {} samples".format(
+            len(result.posterior)))
+        result.meta_data["reweighted_using_rejection_sampling"] = True
+    else:
+        result.posterior = importance_sample(result.posterior, weights=weights)
+        logger.info("Importance resampling resulted in {} samples".format(
+            len(result.posterior)))
+        result.meta_data["reweighted_using_importance_sampling"] = True
 
     result.log_evidence += logsumexp(ln_weights) - np.log(nposterior)
     result.priors = new_prior
@@ -244,7 +562,7 @@ class Result(object):
                  num_likelihood_evaluations=None, walkers=None,
                  max_autocorrelation_time=None, use_ratio=None,
                  parameter_labels=None, parameter_labels_with_unit=None,
-                 gzip=False, version=None):
+                 gzip=False, version=None, density_estimators=None):
         """ A class to store the results of the sampling run
 
         Parameters
@@ -293,6 +611,9 @@ class Result(object):
         version: str,
             Version information for software used to generate the result. Note,
             this information is generated when the result object is initialized
+        density_estimators: list
+            The fitted parameters of parametric density estimates of the
+            posterior, see `Result.get_density_estimator`
 
         Note
         ---------
@@ -330,8 +651,11 @@ class Result(object):
         self.version = version
         self.max_autocorrelation_time = max_autocorrelation_time
 
+        self.density_estimators = density_estimators
+
         self.prior_values = None
         self._kde = None
+        self._density_estimator_cache = dict()
 
     @classmethod
     def from_hdf5(cls, filename=None, outdir=None, label=None):
@@ -371,7 +695,8 @@ class Result(object):
                     try:
                         priordict = PriorDict()
                         for key, value in dictionary["priors"].items():
-                            if key not in ["__module__", "__name__", "__prior_dict__"]:
+                            if key not in ["__module__", "__name__", "__prior_dict__",
+                                           "__normalizations__"]:
                                 priordict[key] = decode_bilby_json(value)
                         dictionary["priors"] = priordict
                     except Exception as e:
@@ -390,7 +715,8 @@ class Result(object):
             raise IOError("No result '{}' found".format(filename))
 
     @classmethod
-    def from_json(cls, filename=None, outdir=None, label=None, gzip=False):
+    def from_json(cls, filename=None, outdir=None, label=None, gzip=False,
+                  metadata_only=False):
         """ Read in a saved .json data file
 
         Parameters
@@ -399,6 +725,9 @@ class Result(object):
             If given, try to load from this filename
         outdir, label: str
             If given, use the default naming convention for saved results file
+        metadata_only: bool, optional
+            If True, the posterior and other sample arrays are skipped without
+            being decoded (where the file layout allows it) and not loaded
 
         Returns
         -------
@@ -413,7 +742,10 @@ class Result(object):
         filename = _determine_file_name(filename, outdir, label, 'json', gzip)
 
         if os.path.isfile(filename):
-            dictionary = load_json(filename, gzip)
+            if metadata_only:
+                dictionary = _load_json_metadata(filename, gzip)
+            else:
+                dictionary = load_json(filename, gzip)
             try:
                 return cls(**dictionary)
             except TypeError as e:
@@ -421,6 +753,66 @@ class Result(object):
         else:
             raise IOError("No result '{}' found".format(filename))
 
+    @classmethod
+    def from_columnar(cls, filename=None, outdir=None, label=None,
+                      columns=None, metadata_only=False):
+        """ Read in a saved columnar .h5 data file
+
+        Unless columns is given, the posterior is not read until
+        `Result.posterior` is first accessed, it is then read in full. Use
+        `Result.read_posterior_columns` to read individual columns without
+        reading the full posterior. The other sample arrays are read in full.
+
+        Parameters
+        ----------
+        filename: str
+            If given, try to load from this filename
+        outdir, label: str
+            If given, use the default naming convention for saved results file
+        columns: list, optional
+            If given, only these columns of the posterior are read
+        metadata_only: bool, optional
+            If True, none of the sample arrays are read
+
+        Returns
+        -------
+        result: bilby.core.result.Result
+
+        Raises
+        -------
+        ValueError: If no filename is given and either outdir or label is None
+                    If no bilby.core.result.Result is found in the path
+
+        """
+        import h5py
+        filename = _determine_file_name(filename, outdir, label, 'columnar', False)
+
+        if not os.path.isfile(filename):
+            raise IOError("No result '{}' found".format(filename))
+        with h5py.File(filename, 'r') as ff:
+            if ff.attrs.get('format', None) != _COLUMNAR_FORMAT:
+                raise IOError("{} is not a columnar result file".format(filename))
+            dictionary = json.loads(
+                ff['metadata'].asstr()[()], object_hook=decode_bilby_json)
+            groups = [key for key in ff if isinstance(ff[key], h5py.Group)]
+            if not metadata_only:
+                for key in _COLUMNAR_ARRAY_ATTRS:
+                    if key in ff and key not in groups:
+                        dictionary[key] = ff[key][()]
+        if not metadata_only:
+            for key in groups:
+                if key != 'posterior':
+                    dictionary[key] = _read_columns(filename, key)
+                elif columns is not None:
+                    dictionary[key] = _read_columns(filename, key, list(columns))
+        try:
+            result = cls(**dictionary)
+        except TypeError as e:
+            raise IOError("Unable to load dictionary, error={}".format(e))
+        if not metadata_only and 'posterior' in groups and columns is None:
+            result._posterior_filename = filename
+        return result
+
     def __str__(self):
         """Print a summary """
         if getattr(self, 'posterior', None) is not None:
@@ -529,7 +921,14 @@ class Result(object):
 
     @property
     def posterior(self):
-        """ A pandas data frame of the posterior """
+        """ A pandas data frame of the posterior
+
+        For results read from a columnar file the posterior is read when it
+        is first accessed.
+        """
+        if self._posterior is None and self._posterior_filename is not None:
+            self._posterior = _read_columns(self._posterior_filename, 'posterior')
+            self._posterior_filename = None
         if self._posterior is not None:
             return self._posterior
         else:
@@ -538,6 +937,43 @@ class Result(object):
     @posterior.setter
     def posterior(self, posterior):
         self._posterior = posterior
+        self._posterior_filename = None
+        # Density estimates of a previous posterior no longer apply
+        self._kde = None
+        self._density_estimator_cache = dict()
+        self.density_estimators = None
+
+    def read_posterior_columns(self, keys):
+        """ Get a subset of the columns of the posterior
+
+        For results read from a columnar file whose posterior has not been
+        accessed only these columns are read from disk, the full posterior
+        is not read or stored.
+
+        Parameters
+        ----------
+        keys: list
+            The names of the columns
+
+        Returns
+        -------
+        pandas.DataFrame: the requested columns of the posterior
+        """
+        keys = list(keys)
+        if self._posterior is None and self._posterior_filename is not None:
+            return _read_columns(self._posterior_filename, 'posterior', keys)
+        return self.posterior[keys]
+
+    @property
+    def posterior_keys(self):
+        """ The names of the columns of the posterior
+
+        For results read from a columnar file whose posterior has not been
+        accessed these are read without reading the posterior.
+        """
+        if self._posterior is None and self._posterior_filename is not None:
+            return _read_column_names(self._posterior_filename, 'posterior')
+        return list(self.posterior.keys())
 
     @property
     def log_10_bayes_factor(self):
@@ -584,12 +1020,15 @@ class Result(object):
             except ValueError as e:
                 logger.debug("Unable to save {}, message: {}".format(attr, e))
                 pass
+        # Older versions of bilby fail to read files with this key
+        if self.density_estimators is not None:
+            dictionary['density_estimators'] = self.density_estimators
         return dictionary
 
     def save_to_file(self, filename=None, overwrite=False, outdir=None,
                      extension='json', gzip=False):
         """
-        Writes the Result to a json or deepdish h5 file
+        Writes the Result to a json, deepdish h5 or columnar h5 file
 
         Parameters
         ----------
@@ -600,9 +1039,11 @@ class Result(object):
             default=False
         outdir: str, optional
             Path to the outdir. Default is the one stored in the result object.
-        extension: str, optional {json, hdf5, True}
+        extension: str, optional {json, hdf5, columnar, True}
             Determines the method to use to store the data (if True defaults
-            to json)
+            to json). The columnar format is an HDF5 file storing each column
+            of the posterior in a separate dataset so that individual columns
+            can be read without reading the whole file, see `read_in_result`.
         gzip: bool, optional
             If true, and outputing to a json file, this will gzip the resulting
             file and add '.gz' to the file extension.
@@ -615,11 +1056,11 @@ class Result(object):
         if filename is None:
             filename = result_file_name(outdir, self.label, extension, gzip)
 
-        move_old_file(filename, overwrite)
-
         # Convert the prior to a string representation for saving on disk
         dictionary = self._get_save_data_dictionary()
 
+        move_old_file(filename, overwrite)
+
         # Convert callable sampler_kwargs to strings
         if dictionary.get('sampler_kwargs', None) is not None:
             for key in dictionary['sampler_kwargs']:
@@ -645,12 +1086,39 @@ class Result(object):
                     if isinstance(dictionary[key], pd.DataFrame):
                         dictionary[key] = dictionary[key].to_dict()
                 deepdish.io.save(filename, dictionary)
+            elif extension == 'columnar':
+                self._save_to_columnar(filename, dictionary)
             else:
                 raise ValueError("Extension type {} not understood".format(extension))
         except Exception as e:
             logger.error("\n\n Saving the data has failed with the "
                          "following message:\n {} \n\n".format(e))
 
+    @staticmethod
+    def _save_to_columnar(filename, dictionary):
+        """ Write the data dictionary to a columnar HDF5 file
+
+        DataFrames are written with one dataset per column and the sample
+        arrays as single datasets, everything else is stored as a JSON string
+        in the `metadata` dataset.
+        """
+        import h5py
+        metadata = OrderedDict()
+        with h5py.File(filename, 'w') as ff:
+            ff.attrs['format'] = _COLUMNAR_FORMAT
+            ff.attrs['version'] = _COLUMNAR_FORMAT_VERSION
+            for key, value in dictionary.items():
+                if key in _COLUMNAR_ARRAY_ATTRS and isinstance(value, pd.DataFrame):
+                    _write_columns(ff.create_group(key), value)
+                elif (key in _COLUMNAR_ARRAY_ATTRS and value is not None and
+                        np.asarray(value).dtype.kind not in 'OSU'):
+                    ff.create_dataset(key, data=np.asarray(value))
+                else:
+                    metadata[key] = value
+            ff.create_dataset(
+                'metadata', data=json.dumps(metadata, cls=BilbyJsonEncoder),
+                dtype=h5py.string_dtype())
+
     def save_posterior_samples(self, filename=None, outdir=None, label=None):
         """ Saves posterior samples to a file
 
@@ -1330,9 +1798,16 @@ class Result(object):
         if self.injection_parameters is None:
             raise(TypeError, "Result object has no 'injection_parameters'. "
                              "Cannot compute credible levels.")
-        credible_levels = {key: self.get_injection_credible_level(key)
-                           for key in keys
-                           if isinstance(self.injection_parameters.get(key, None), float)}
+        keys = [key for key in keys
+                if isinstance(self.injection_parameters.get(key, None), float)]
+        available = self.posterior_keys
+        present = [key for key in keys if key in available]
+        credible_levels = {key: np.nan for key in keys}
+        if len(present) > 0:
+            injected = np.array([self.injection_parameters[key] for key in present])
+            levels = np.mean(np.asarray(
+                self.read_posterior_columns(present).values) < injected, axis=0)
+            credible_levels.update(zip(present, levels))
         return credible_levels
 
     def get_injection_credible_level(self, parameter):
@@ -1354,9 +1829,9 @@ class Result(object):
                              "Cannot copmute credible levels.")
         if parameter in self.posterior and\
                 parameter in self.injection_parameters:
-            credible_level =\
-                sum(self.posterior[parameter].values <
-                    self.injection_parameters[parameter]) / len(self.posterior)
+            credible_level = np.mean(
+                np.asarray(self.posterior[parameter].values) <
+                self.injection_parameters[parameter])
             return credible_level
         else:
             return np.nan
@@ -1405,18 +1880,81 @@ class Result(object):
                 self.posterior[self.search_parameter_keys].values.T)
             return self._kde
 
-    def posterior_probability(self, sample):
+    def get_density_estimator(self, method="kde", max_samples=None, **kwargs):
+        """ A density estimate built from the stored posterior
+
+        Estimators are cached, so repeated calls with the same arguments
+        return the same object. Parametric estimators ("gmm") are also stored
+        in `density_estimators` and so are saved with the result and reused
+        when it is read back in.
+
+        Parameters
+        ----------
+        method: str, {"kde", "gmm"}
+            The density estimate to use. "kde" uses `scipy.stats.gaussian_kde`,
+            the cost of evaluating which scales with the number of samples.
+            "gmm" fits a `bilby.core.utils.GaussianMixtureDensity`, which is
+            much cheaper to evaluate for large posteriors.
+        max_samples: int, optional
+            If given, and the posterior has more samples than this, the
+            estimate is built from a random subset of max_samples samples
+        kwargs:
+            Passed to the estimator, e.g., `n_components` for "gmm"
+
+        Returns
+        -------
+        density: callable
+            The density estimate, called with an array of points with shape
+            (ndim, npoints)
+        """
+        if method not in ["kde", "gmm"]:
+            raise ValueError("Density estimation method {} not understood".format(
+                method))
+        if method == "kde" and max_samples is None and len(kwargs) == 0:
+            return self.kde
+        key = json.dumps(
+            dict(method=method, max_samples=max_samples, kwargs=kwargs),
+            sort_keys=True, cls=BilbyJsonEncoder)
+        if key in self._density_estimator_cache:
+            return self._density_estimator_cache[key]
+        for stored in self.density_estimators or list():
+            if stored["key"] == key:
+                density = utils.GaussianMixtureDensity.from_dict(stored["parameters"])
+                self._density_estimator_cache[key] = density
+                return density
+
+        samples = np.asarray(self.posterior[self.search_parameter_keys].values)
+        if max_samples is not None and len(samples) > max_samples:
+            samples = samples[np.random.choice(
+                len(samples), max_samples, replace=False)]
+        if method == "kde":
+            density = scipy.stats.gaussian_kde(samples.T, **kwargs)
+        else:
+            density = utils.GaussianMixtureDensity(samples.T, **kwargs)
+            if self.density_estimators is None:
+                self.density_estimators = list()
+            self.density_estimators.append(
+                dict(key=key, parameters=density.to_dict()))
+        self._density_estimator_cache[key] = density
+        return density
+
+    def posterior_probability(self, sample, method="kde", max_samples=None,
+                              batch_size=10000, **kwargs):
         """ Calculate the posterior probability for a new sample
 
-        This queries a Kernel Density Estimate of the posterior to calculate
+        This queries a density estimate of the posterior to calculate
         the posterior probability density for the new sample.
 
         Parameters
         ----------
-        sample: dict, or list of dictionaries
+        sample: dict, list of dictionaries, or pandas.DataFrame
             A dictionary containing all the keys from
             self.search_parameter_keys and corresponding values at which to
             calculate the posterior probability
+        method, max_samples, kwargs:
+            The density estimate to use, see `get_density_estimator`
+        batch_size: int, optional
+            The number of samples to evaluate at once
 
         Returns
         -------
@@ -1426,9 +1964,16 @@ class Result(object):
         """
         if isinstance(sample, dict):
             sample = [sample]
-        ordered_sample = [[s[key] for key in self.search_parameter_keys]
-                          for s in sample]
-        return self.kde(ordered_sample)
+        if isinstance(sample, pd.DataFrame):
+            ordered_sample = sample[self.search_parameter_keys].values
+        else:
+            ordered_sample = np.array(
+                [[s[key] for key in self.search_parameter_keys] for s in sample])
+        density = self.get_density_estimator(
+            method=method, max_samples=max_samples, **kwargs)
+        return np.concatenate([
+            density(ordered_sample[start:start + batch_size].T)
+            for start in range(0, len(ordered_sample), batch_size)])
 
     def _safe_outdir_creation(self, outdir=None, caller_func=None):
         if outdir is None:
@@ -1554,9 +2099,185 @@ class Result(object):
         return azdata
 
 
+_result_reading_kwargs = dict()
+
+
+def _initialize_result_reader(kwargs):
+    """ Store the read_in_result kwargs in a global variable for multiprocessing """
+    global _result_reading_kwargs
+    _result_reading_kwargs = kwargs
+
+
+def _read_in_result_for_pool(filename):
+    """ Wrapper to read_in_result. Needed for multiprocessing. """
+    return read_in_result(filename=filename, **_result_reading_kwargs)
+
+
+def read_in_results(filenames, npool=1, columns=None, metadata_only=False):
+    """ Read in a list of stored bilby result objects
+
+    Parameters
+    ----------
+    filenames: list
+        The paths of the files to read
+    npool: int, optional
+        The number of processes used to read the files, default is 1
+    columns, metadata_only:
+        Passed to `read_in_result`
+
+    Returns
+    -------
+    results: list
+        A list of bilby.core.result.Result, in the order of filenames
+    """
+    kwargs = dict(columns=columns, metadata_only=metadata_only)
+    _initialize_result_reader(kwargs)
+    if npool > 1 and len(filenames) > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(
+            min(npool, len(filenames)), initializer=_initialize_result_reader,
+            initargs=(kwargs,))
+        try:
+            chunksize = max(1, len(filenames) // (4 * npool))
+            results = pool.map(_read_in_result_for_pool, filenames, chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = list(map(_read_in_result_for_pool, filenames))
+    return results
+
+
+def combine_result_files(filenames, filename=None, outdir=None, label=None,
+                         npool=1, overwrite=False):
+    """ Combine result files into a columnar result file one run at a time
+
+    This is equivalent to `ResultList.combine`, but only the metadata of all
+    the runs are held in memory at once. The posterior of each run is read
+    in turn and the samples kept from it are appended to the output file,
+    the merged posterior is then shuffled in the file one column at a time.
+
+    Parameters
+    ----------
+    filenames: list
+        The result files to combine
+    filename: str, optional
+        The output file, defaults to the columnar file name for outdir and
+        label
+    outdir, label: str, optional
+        The output directory and label of the combined result, by default
+        those of the first result with "_combined" appended to the label
+    npool: int, optional
+        The number of processes used to read the metadata
+    overwrite: bool, optional
+        Whether or not to overwrite an existing output file
+
+    Returns
+    -------
+    result: bilby.core.result.Result
+        The combined result, read from the output file
+    """
+    import h5py
+
+    results = ResultList(filenames, npool=npool, metadata_only=True)
+    if len(results) == 0:
+        raise ResultListError("No results to combine")
+    result = copy(results[0])
+    if label is not None:
+        result.label = label
+    elif result.label is not None and len(results) > 1:
+        result.label += '_combined'
+    if outdir is not None:
+        result.outdir = os.path.abspath(outdir)
+
+    results.check_consistent_sampler()
+    results.check_consistent_data()
+    results.check_consistent_parameters()
+    results.check_consistent_priors()
+
+    fractions = results._combine_evidences(copy(result))
+    nested = None
+    if filename is None:
+        filename = result_file_name(result.outdir, result.label, 'columnar')
+    check_directory_exists_and_if_not_mkdir(os.path.dirname(os.path.abspath(filename)))
+    temporary_filename = filename + '.tmp'
+    columns = None
+    length = 0
+    try:
+        with h5py.File(temporary_filename, 'w') as ff:
+            group = ff.create_group('posterior')
+            for input_filename, fraction in zip(filenames, fractions):
+                run = read_in_result(input_filename)
+                if nested is None:
+                    nested = run._nested_samples is not None
+                elif nested != (run._nested_samples is not None):
+                    raise ResultListError("Not all results contain nested samples")
+                posterior = run.posterior
+                if columns is None:
+                    columns = list(posterior.keys())
+                    group.attrs['columns'] = json.dumps(columns, cls=BilbyJsonEncoder)
+                elif set(posterior.keys()) != set(columns):
+                    raise ResultListError(
+                        "Inconsistent posterior columns between results")
+                if nested:
+                    keep = np.random.uniform(size=len(posterior)) < fraction
+                else:
+                    keep = np.ones(len(posterior), dtype=bool)
+                for ii, key in enumerate(columns):
+                    _append_to_column(
+                        group, 'column_{}'.format(ii), key,
+                        np.asarray(posterior[key])[keep], length)
+                length += int(np.sum(keep))
+                del run, posterior
+                logger.debug("Added {} to the combined posterior".format(input_filename))
+
+            # Shuffle the merged posterior in place
+            order = np.random.permutation(length)
+            for ii in range(len(columns)):
+                dataset = group['column_{}'.format(ii)]
+                dataset[...] = dataset[()][order]
+            group.attrs['length'] = length
+    except Exception:
+        if os.path.isfile(temporary_filename):
+            os.remove(temporary_filename)
+        raise
+
+    if nested:
+        results._combine_evidences(result)
+        result.nested_samples = None
+        result.sampler_kwargs = None
+    result.posterior = None
+    result.save_to_file(
+        filename=filename, overwrite=overwrite, extension='columnar')
+    with h5py.File(filename, 'a') as ff, \
+            h5py.File(temporary_filename, 'r') as tmp:
+        tmp.copy(tmp['posterior'], ff, name='posterior')
+    os.remove(temporary_filename)
+    return read_in_result(filename)
+
+
+def _append_to_column(group, name, key, values, length):
+    """ Append values to a resizable column dataset written by
+    `combine_result_files` """
+    import h5py
+    if name not in group:
+        if values.dtype.kind in 'OSU':
+            dtype = h5py.string_dtype()
+        else:
+            dtype = values.dtype
+        dataset = group.create_dataset(
+            name, shape=(0,), maxshape=(None,), dtype=dtype, chunks=True)
+        dataset.attrs['name'] = json.dumps(key, cls=BilbyJsonEncoder)
+    dataset = group[name]
+    if dataset.dtype.kind == 'O':
+        values = values.astype(str).astype(object)
+    dataset.resize((length + len(values),))
+    dataset[length:] = values
+
+
 class ResultList(list):
 
-    def __init__(self, results=None):
+    def __init__(self, results=None, npool=1, metadata_only=False):
         """ A class to store a list of :class:`bilby.core.result.Result` objects
         from equivalent runs on the same data. This provides methods for
         outputing combined results.
@@ -1564,10 +2285,24 @@ class ResultList(list):
         Parameters
         ----------
         results: list
-            A list of `:class:`bilby.core.result.Result`.
+            A list of `:class:`bilby.core.result.Result` or filenames pointing
+            to result objects.
+        npool: int, optional
+            The number of processes used to read the filenames in results
+        metadata_only: bool, optional
+            If True, only the metadata of the filenames in results is read,
+            e.g., the evidences, labels and sampling time, see `read_in_result`
         """
         super(ResultList, self).__init__()
+        self.metadata_only = metadata_only
+        if results is None:
+            results = list()
+        filenames = [result for result in results if isinstance(result, str)]
+        loaded = iter(read_in_results(
+            filenames, npool=npool, metadata_only=metadata_only))
         for result in results:
+            if isinstance(result, str):
+                result = next(loaded)
             self.append(result)
 
     def append(self, result):
@@ -1584,7 +2319,8 @@ class ResultList(list):
         if isinstance(result, Result):
             super(ResultList, self).append(result)
         elif isinstance(result, str):
-            super(ResultList, self).append(read_in_result(result))
+            super(ResultList, self).append(read_in_result(
+                result, metadata_only=getattr(self, "metadata_only", False)))
         else:
             raise TypeError("Could not append a non-Result type")
 
@@ -1639,6 +2375,31 @@ class ResultList(list):
             The result object with the combined evidences.
         """
         self.check_nested_samples()
+        result_weights = self._combine_evidences(result)
+        posteriors = list()
+        for res, frac in zip(self, result_weights):
+            selected_samples = (np.random.uniform(size=len(res.posterior)) < frac)
+            posteriors.append(res.posterior[selected_samples])
+        # remove original nested_samples
+        result.nested_samples = None
+        result.sampler_kwargs = None
+        return posteriors, result
+
+    def _combine_evidences(self, result):
+        """
+        Store the combined evidence of the runs in result
+
+        Parameters
+        ----------
+        result: bilby.core.result.Result
+            The result object to put the combined evidences in.
+
+        Returns
+        -------
+        result_weights: array_like
+            The relative evidence of each run, the fraction of each run's
+            posterior samples to keep
+        """
         if result.use_ratio:
             log_bayes_factors = np.array([res.log_bayes_factor for res in self])
             result.log_bayes_factor = logsumexp(log_bayes_factors, b=1. / len(self))
@@ -1653,14 +2414,7 @@ class ResultList(list):
             result.log_evidence_err = 0.5 * logsumexp(2 * np.array(log_errs), b=1. / len(self))
         else:
             result.log_evidence_err = np.nan
-        posteriors = list()
-        for res, frac in zip(self, result_weights):
-            selected_samples = (np.random.uniform(size=len(res.posterior)) < frac)
-            posteriors.append(res.posterior[selected_samples])
-        # remove original nested_samples
-        result.nested_samples = None
-        result.sampler_kwargs = None
-        return posteriors, result
+        return result_weights
 
     def check_nested_samples(self):
         for res in self:
@@ -1781,18 +2535,116 @@ def plot_multiple(results, filename=None, labels=None, colours=None,
     return fig
 
 
+_credible_level_keys = None
+
+
+def _initialize_credible_level_keys(keys):
+    """ Store the credible level keys in a global variable for multiprocessing """
+    global _credible_level_keys
+    _credible_level_keys = keys
+
+
+def _credible_levels_for_pool(result):
+    """ Read a result, if needed, and get its credible levels. Needed for
+    multiprocessing.
+
+    The posterior of a columnar file is not read in full, only the columns
+    needed for the credible levels are read.
+    """
+    if isinstance(result, str):
+        result = read_in_result(filename=result)
+    return result.label, result.get_all_injection_credible_levels(
+        _credible_level_keys)
+
+
+def get_injection_credible_levels(results, keys=None, npool=1, filename=None):
+    """ Get the credible levels of the injected parameters of a set of results
+
+    Parameters
+    ----------
+    results: list
+        A list of Result objects or filenames of results, each should have
+        injection_parameters. Results given as filenames are only read while
+        their credible levels are computed and, for columnar files, only the
+        required columns are read.
+    keys: list, optional
+        A list of keys to use, if None defaults to search_parameter_keys of
+        the first result
+    npool: int, optional
+        The number of processes used to read and process results given as
+        filenames
+    filename: str, optional
+        If given, write the table of credible levels to this file
+
+    Returns
+    -------
+    credible_levels: pandas.DataFrame
+        The credible levels, one row per result indexed by the result label
+        and one column per key
+    """
+    if keys is None:
+        if isinstance(results[0], str):
+            keys = read_in_result(results[0], metadata_only=True).search_parameter_keys
+        else:
+            keys = results[0].search_parameter_keys
+    _initialize_credible_level_keys(keys)
+    filenames = [result for result in results if isinstance(result, str)]
+    if npool > 1 and len(filenames) > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(
+            min(npool, len(filenames)), initializer=_initialize_credible_level_keys,
+            initargs=(keys,))
+        try:
+            chunksize = max(1, len(filenames) // (4 * npool))
+            loaded = iter(pool.map(_credible_levels_for_pool, filenames, chunksize))
+        finally:
+            pool.close()
+            pool.join()
+        levels = [next(loaded) if isinstance(result, str)
+                  else _credible_levels_for_pool(result) for result in results]
+    else:
+        levels = [_credible_levels_for_pool(result) for result in results]
+    labels = [label for label, _ in levels]
+    columns = [key for key in keys if any(key in level for _, level in levels)]
+    credible_levels = pd.DataFrame(
+        [[level.get(key, np.nan) for key in columns] for _, level in levels],
+        columns=columns, index=pd.Index(labels, name="label"))
+    if filename is not None:
+        credible_levels.to_csv(filename, header=True, sep=' ')
+    return credible_levels
+
+
+def read_injection_credible_levels(filename):
+    """ Read a table of credible levels written by
+    `get_injection_credible_levels`
+
+    Parameters
+    ----------
+    filename: str
+        The file to read
+
+    Returns
+    -------
+    credible_levels: pandas.DataFrame
+    """
+    return pd.read_csv(filename, sep=' ', index_col='label')
+
+
 @latex_plot_format
 def make_pp_plot(results, filename=None, save=True, confidence_interval=[0.68, 0.95, 0.997],
                  lines=None, legend_fontsize='x-small', keys=None, title=True,
-                 confidence_interval_alpha=0.1,
+                 confidence_interval_alpha=0.1, npool=1,
+                 credible_levels_filename=None,
                  **kwargs):
     """
     Make a P-P plot for a set of runs with injected signals.
 
     Parameters
     ----------
-    results: list
-        A list of Result objects, each of these should have injected_parameters
+    results: list, pandas.DataFrame
+        A list of Result objects, or filenames of results, each of these
+        should have injected_parameters. Alternatively, a table of credible
+        levels as returned by `get_injection_credible_levels`.
     filename: str, optional
         The name of the file to save, the default is "outdir/pp.png"
     save: bool, optional
@@ -1808,6 +2660,11 @@ def make_pp_plot(results, filename=None, save=True, confidence_interval=[0.68, 0
         A list of keys to use, if None defaults to search_parameter_keys
     confidence_interval_alpha: float, list, optional
         The transparency for the background condifence interval
+    npool: int, optional
+        The number of processes used to process results given as filenames
+    credible_levels_filename: str, optional
+        If given, write the table of credible levels to this file, see
+        `get_injection_credible_levels`
     kwargs:
         Additional kwargs to pass to matplotlib.pyplot.plot
 
@@ -1818,13 +2675,15 @@ def make_pp_plot(results, filename=None, save=True, confidence_interval=[0.68, 0
         `pvalues`, and `names`.
     """
 
-    if keys is None:
-        keys = results[0].search_parameter_keys
-
-    credible_levels = pd.DataFrame()
-    for result in results:
-        credible_levels = credible_levels.append(
-            result.get_all_injection_credible_levels(keys), ignore_index=True)
+    if isinstance(results, pd.DataFrame):
+        credible_levels = results
+        if keys is not None:
+            credible_levels = credible_levels[keys]
+        priors = None
+    else:
+        credible_levels = get_injection_credible_levels(
+            results, keys=keys, npool=npool, filename=credible_levels_filename)
+        priors = getattr(results[0], "_priors", None)
 
     if lines is None:
         colors = ["C{}".format(i) for i in range(8)]
@@ -1859,15 +2718,15 @@ def make_pp_plot(results, filename=None, save=True, confidence_interval=[0.68, 0
     pvalues = []
     logger.info("Key: KS-test p-value")
     for ii, key in enumerate(credible_levels):
-        pp = np.array([sum(credible_levels[key].values < xx) /
-                       len(credible_levels) for xx in x_values])
-        pvalue = scipy.stats.kstest(credible_levels[key], 'uniform').pvalue
+        levels = np.sort(credible_levels[key].values)
+        pp = np.searchsorted(levels, x_values, side='left') / N
+        pvalue = scipy.stats.kstest(levels, 'uniform').pvalue
         pvalues.append(pvalue)
         logger.info("{}: {}".format(key, pvalue))
 
         try:
-            name = results[0].priors[key].latex_label
-        except AttributeError:
+            name = priors[key].latex_label
+        except (AttributeError, KeyError, TypeError):
             name = key
         label = "{} ({:2.3f})".format(name, pvalue)
         plt.plot(x_values, pp, lines[ii], label=label, **kwargs)
@@ -1881,7 +2740,7 @@ def make_pp_plot(results, filename=None, save=True, confidence_interval=[0.68, 0
 
     if title:
         ax.set_title("N={}, p-value={:2.4f}".format(
-            len(results), pvals.combined_pvalue))
+            N, pvals.combined_pvalue))
     ax.set_xlabel("C.I.")
     ax.set_ylabel("Fraction of events in C.I.")
     ax.legend(handlelength=2, labelspacing=0.25, fontsize=legend_fontsize)
@@ -1,14 +1,135 @@
 from __future__ import absolute_import
+import copy
 import datetime
+import json
+import os
+import shutil
+import tempfile
+
 import numpy as np
 
 from pandas import DataFrame
 
-from ..utils import logger, command_line_args, Counter
+from ..utils import (
+    logger, command_line_args, Counter, atomic_savez,
+    check_directory_exists_and_if_not_mkdir)
 from ..prior import Prior, PriorDict, DeltaFunction, Constraint
 from ..result import Result, read_in_result
 
 
+class _SamplingContainer(object):
+    """ The likelihood, priors and sampling settings used by the module level
+    wrapper functions.
+
+    These are stored globally so that they only need to be sent to each
+    worker process once when the pool is created.
+    """
+
+    def __init__(self):
+        self.likelihood = None
+        self.priors = None
+        self.search_parameter_keys = None
+        self.use_ratio = False
+
+
+_sampling_convenience_dump = _SamplingContainer()
+
+
+def _initialize_global_variables(
+        likelihood, priors, search_parameter_keys, use_ratio
+):
+    """
+    Store a global copy of the likelihood, priors, and search keys for
+    multiprocessing.
+    """
+    _sampling_convenience_dump.likelihood = likelihood
+    _sampling_convenience_dump.priors = priors
+    _sampling_convenience_dump.search_parameter_keys = search_parameter_keys
+    _sampling_convenience_dump.use_ratio = use_ratio
+
+
+def _prior_transform_wrapper(theta):
+    """Wrapper to the prior transformation. Needed for multiprocessing."""
+    return _sampling_convenience_dump.priors.rescale(
+        _sampling_convenience_dump.search_parameter_keys, theta)
+
+
+def _log_prior_wrapper(theta):
+    """Wrapper to the log prior. Needed for multiprocessing."""
+    params = {key: t for key, t in zip(
+        _sampling_convenience_dump.search_parameter_keys, theta)}
+    return _sampling_convenience_dump.priors.ln_prob(params)
+
+
+def _log_likelihood_wrapper(theta):
+    """Wrapper to the log likelihood. Needed for multiprocessing.
+
+    The prior constraints are checked before evaluating the likelihood.
+    """
+    priors = _sampling_convenience_dump.priors
+    likelihood = _sampling_convenience_dump.likelihood
+    params = {key: t for key, t in zip(
+        _sampling_convenience_dump.search_parameter_keys, theta)}
+    if priors.evaluate_constraints(params):
+        likelihood.parameters.update(params)
+        if _sampling_convenience_dump.use_ratio:
+            return likelihood.log_likelihood_ratio()
+        else:
+            return likelihood.log_likelihood()
+    else:
+        return np.nan_to_num(-np.inf)
+
+
+def _log_likelihood_batch_wrapper(thetas):
+    """Wrapper to the batched log likelihood. Needed for multiprocessing.
+
+    The prior constraints are checked before evaluating the likelihood.
+    """
+    return _log_likelihood_batch(
+        _sampling_convenience_dump.likelihood,
+        _sampling_convenience_dump.priors,
+        _sampling_convenience_dump.search_parameter_keys,
+        _sampling_convenience_dump.use_ratio,
+        thetas)
+
+
+def _log_prior_batch_wrapper(thetas):
+    """Wrapper to the batched log prior. Needed for multiprocessing."""
+    return _log_prior_batch(
+        _sampling_convenience_dump.priors,
+        _sampling_convenience_dump.search_parameter_keys,
+        thetas)
+
+
+def _log_likelihood_batch(likelihood, priors, search_parameter_keys, use_ratio, thetas):
+    thetas = np.atleast_2d(thetas)
+    output = np.full(len(thetas), np.nan_to_num(-np.inf))
+    if len(thetas) == 0:
+        return output
+    params = {key: thetas[:, ii] for ii, key in enumerate(search_parameter_keys)}
+    allowed = np.ones(len(thetas), dtype=bool) & np.asarray(
+        priors.evaluate_constraints(params), dtype=bool)
+    if np.any(allowed):
+        params = {key: value[allowed] for key, value in params.items()}
+        if use_ratio:
+            output[allowed] = likelihood.log_likelihood_ratio_batch(params)
+        else:
+            output[allowed] = likelihood.log_likelihood_batch(params)
+    return output
+
+
+def _log_prior_batch(priors, search_parameter_keys, thetas):
+    thetas = np.atleast_2d(thetas)
+    if len(thetas) == 0:
+        return np.array([])
+    return priors.ln_prob_array(search_parameter_keys, thetas)
+
+
+def _is_finite_value(values):
+    """ Check for finite values, also catching the output of `numpy.nan_to_num` """
+    return np.isfinite(values) & (np.abs(values) != np.nan_to_num(np.inf))
+
+
 class Sampler(object):
     """ A sampler object to aid in setting up an inference run
 
@@ -39,6 +160,10 @@ class Sampler(object):
         The result class to use. By default, `bilby.core.result.Result` is used,
         but objects which inherit from this class can be given providing
         additional methods.
+    npool: int
+        The number of processes to use to evaluate the likelihood and prior,
+        can equivalently be given as one of [queue_size, threads, nthreads].
+        If a `pool` is passed this is used instead.
     soft_init: bool, optional
         Switch to enable a soft initialization that prevents the likelihood
         from being tested before running the sampler. This is relevant when
@@ -131,6 +256,7 @@ class Sampler(object):
         self._log_summary_for_sampler()
 
         self.result = self._initialise_result(result_class)
+        self.pool = None
         self.likelihood_count = None
         if self.likelihood_benchmark:
             self.likelihood_count = Counter()
@@ -163,10 +289,123 @@ class Sampler(object):
     @kwargs.setter
     def kwargs(self, kwargs):
         self._kwargs = self.default_kwargs.copy()
+        self._npool = 1
+        for equiv in self.npool_equiv_kwargs:
+            if kwargs.get(equiv, None) is not None:
+                self._npool = kwargs[equiv]
+                break
         self._translate_kwargs(kwargs)
+        for equiv in self.npool_equiv_kwargs:
+            if equiv not in self.default_kwargs:
+                kwargs.pop(equiv, None)
         self._kwargs.update(kwargs)
         self._verify_kwargs_against_default_kwargs()
 
+    @property
+    def npool(self):
+        """int: The number of processes used to evaluate the likelihood and prior"""
+        return getattr(self, '_npool', 1)
+
+    def _setup_pool(self):
+        """ Set up the pool of worker processes
+
+        If a `pool` was given in the kwargs this is used, otherwise if `npool`
+        is greater than one a multiprocessing pool is created. The likelihood
+        and priors are sent once to each worker when it starts.
+        """
+        if self.kwargs.get("pool", None) is not None:
+            logger.info("Using user defined pool.")
+            self.pool = self.kwargs["pool"]
+        elif self.npool > 1:
+            logger.info(
+                "Setting up multiproccesing pool with {} processes.".format(
+                    self.npool))
+            import multiprocessing
+            self.pool = multiprocessing.Pool(
+                processes=self.npool,
+                initializer=_initialize_global_variables,
+                initargs=(
+                    self.likelihood,
+                    self.priors,
+                    self._search_parameter_keys,
+                    self.use_ratio
+                )
+            )
+        else:
+            self.pool = None
+        _initialize_global_variables(
+            likelihood=self.likelihood,
+            priors=self.priors,
+            search_parameter_keys=self._search_parameter_keys,
+            use_ratio=self.use_ratio
+        )
+        if "pool" in self.kwargs:
+            self.kwargs["pool"] = self.pool
+
+    def _close_pool(self):
+        """ Close the pool of worker processes if one was created """
+        if getattr(self, "pool", None) is not None:
+            logger.info("Starting to close worker pool.")
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+            if "pool" in self.kwargs:
+                self.kwargs["pool"] = self.pool
+            logger.info("Finished closing worker pool.")
+
+    def _map_batches(self, function, thetas, serial_function):
+        thetas = np.atleast_2d(thetas)
+        pool = getattr(self, "pool", None)
+        if pool is None or len(thetas) < 2:
+            return serial_function(thetas)
+        n_batches = min(len(thetas), getattr(pool, "_processes", None) or self.npool)
+        return np.concatenate(
+            list(pool.map(function, np.array_split(thetas, n_batches))))
+
+    def map_log_likelihood(self, thetas):
+        """ Evaluate the log likelihood for many points, using the pool if
+        one has been set up
+
+        The points are split into one batch per process and each batch is
+        evaluated using the `log_likelihood_batch` method of the likelihood.
+        Points which violate the prior constraints are given a log
+        likelihood of `np.nan_to_num(-np.inf)`.
+
+        Parameters
+        ----------
+        thetas: array_like
+            Array of values for the likelihood parameters with shape
+            (n_points, n_parameters)
+
+        Returns
+        -------
+        array_like: Log-likelihood or log-likelihood-ratio for each point
+        """
+        return self._map_batches(
+            _log_likelihood_batch_wrapper, thetas,
+            lambda points: _log_likelihood_batch(
+                self.likelihood, self.priors, self._search_parameter_keys,
+                self.use_ratio, points))
+
+    def map_log_prior(self, thetas):
+        """ Evaluate the log prior for many points, using the pool if one has
+        been set up
+
+        Parameters
+        ----------
+        thetas: array_like
+            Array of values for the parameters with shape
+            (n_points, n_parameters)
+
+        Returns
+        -------
+        array_like: The log prior probability for each point
+        """
+        return self._map_batches(
+            _log_prior_batch_wrapper, thetas,
+            lambda points: _log_prior_batch(
+                self.priors, self._search_parameter_keys, points))
+
     def _translate_kwargs(self, kwargs):
         """ Template for child classes """
         pass
@@ -394,6 +633,34 @@ class Sampler(object):
         else:
             return self.likelihood.log_likelihood()
 
+    def log_likelihood_batch(self, thetas):
+        """
+
+        Parameters
+        ----------
+        thetas: array_like
+            Array of values for the likelihood parameters with shape
+            (n_points, n_parameters)
+
+        Returns
+        -------
+        array_like: Log-likelihood or log-likelihood-ratio for each point
+
+        """
+        thetas = np.atleast_2d(thetas)
+        if self.likelihood_benchmark:
+            try:
+                for _ in range(len(thetas)):
+                    self.likelihood_count.increment()
+            except AttributeError:
+                pass
+        params = {
+            key: thetas[:, ii] for ii, key in enumerate(self._search_parameter_keys)}
+        if self.use_ratio:
+            return self.likelihood.log_likelihood_ratio_batch(params)
+        else:
+            return self.likelihood.log_likelihood_batch(params)
+
     def get_random_draw_from_prior(self):
         """ Get a random draw from the prior distribution
 
@@ -431,18 +698,46 @@ class Sampler(object):
 
         """
         logger.info("Generating initial points from the prior")
-        unit_cube = []
-        parameters = []
-        likelihood = []
+        unit_cube = np.zeros((0, self.ndim))
+        parameters = np.zeros((0, self.ndim))
+        likelihood = np.zeros(0)
         while len(unit_cube) < npoints:
-            unit = np.random.rand(self.ndim)
-            theta = self.prior_transform(unit)
-            if self.check_draw(theta, warning=False):
-                unit_cube.append(unit)
-                parameters.append(theta)
-                likelihood.append(self.log_likelihood(theta))
+            unit = np.random.rand(npoints - len(unit_cube), self.ndim)
+            theta = self.priors.rescale_array(self._search_parameter_keys, unit)
+            keep, log_likelihood = self.check_draws(theta)
+            unit_cube = np.vstack([unit_cube, unit[keep]])
+            parameters = np.vstack([parameters, theta[keep]])
+            likelihood = np.concatenate([likelihood, log_likelihood[keep]])
 
-        return np.array(unit_cube), np.array(parameters), np.array(likelihood)
+        return unit_cube, parameters, likelihood
+
+    def check_draws(self, thetas):
+        """
+        Checks which of an array of draws have a finite prior and likelihood
+
+        Also catches the output of `numpy.nan_to_num`.
+
+        Parameters
+        ----------
+        thetas: array_like
+            Parameter values with shape (n_points, n_parameters)
+
+        Returns
+        -------
+        keep, log_likelihood: tuple of array_like
+            Boolean array which is True where both the prior and the
+            likelihood are finite, and the log-likelihood of each point
+            (-inf where the prior is not finite)
+
+        """
+        thetas = np.atleast_2d(thetas)
+        log_likelihood = np.full(len(thetas), -np.inf)
+        keep = _is_finite_value(
+            self.priors.ln_prob_array(self._search_parameter_keys, thetas))
+        if np.any(keep):
+            log_likelihood[keep] = self.log_likelihood_batch(thetas[keep])
+        keep &= _is_finite_value(log_likelihood)
+        return keep, log_likelihood
 
     def check_draw(self, theta, warning=True):
         """
@@ -639,6 +934,186 @@ class MCMCSampler(Sampler):
             logger.info("Unable to calculate autocorr time: {}".format(e))
 
 
+class IncrementalCheckpoint(object):
+    """ An append-only checkpoint stored in a directory
+
+    Quantities which only grow during a run, e.g., the saved samples, are
+    written in chunks containing only the rows added since the previous
+    checkpoint. The rest of the state is a small set of arrays rewritten at
+    each checkpoint along with a JSON header. The header is written last,
+    atomically, and lists the files making up the checkpoint, so an
+    interrupted write leaves the previous checkpoint intact. Nothing is
+    pickled, the sampler is rebuilt from the likelihood and priors and the
+    stored state is then restored onto it.
+
+    Parameters
+    ----------
+    directory: str
+        The directory to store the checkpoint in
+    """
+
+    version = 1
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.filename = os.path.join(directory, "checkpoint.json")
+        self._manifest = None
+
+    @property
+    def manifest(self):
+        """ The contents of the JSON header describing the checkpoint """
+        if self._manifest is None:
+            if self.exists():
+                with open(self.filename, "r") as ff:
+                    self._manifest = json.load(ff)
+            else:
+                self._manifest = dict(
+                    version=self.version, generation=0, rows=dict(),
+                    chunks=list(), state=None, header=dict())
+        return self._manifest
+
+    def exists(self):
+        return os.path.isfile(self.filename)
+
+    def rows(self, name):
+        """ The number of rows of the named appended quantity written so far """
+        return self.manifest["rows"].get(name, 0)
+
+    def write(self, header, new_rows=None, arrays=None):
+        """ Write a new checkpoint
+
+        Parameters
+        ----------
+        header: dict
+            JSON serializable description of the state
+        new_rows: dict, optional
+            Rows to append to each of the appended quantities, these should
+            only contain the rows added since the last checkpoint
+        arrays: dict, optional
+            Arrays making up the rest of the state, these replace the arrays
+            written at the previous checkpoint
+        """
+        check_directory_exists_and_if_not_mkdir(self.directory)
+        manifest = copy.deepcopy(self.manifest)
+        generation = manifest["generation"] + 1
+        if new_rows is None:
+            new_rows = dict()
+        new_rows = {key: np.asarray(value) for key, value in new_rows.items()
+                    if len(value) > 0}
+        obsolete = list()
+        if len(new_rows) > 0:
+            chunk = "chunk_{}.npz".format(generation)
+            atomic_savez(os.path.join(self.directory, chunk), **new_rows)
+            manifest["chunks"].append([chunk, 0])
+            for key, value in new_rows.items():
+                manifest["rows"][key] = manifest["rows"].get(key, 0) + len(value)
+            obsolete += self._merge_chunks(manifest["chunks"], generation)
+        if arrays is None:
+            arrays = dict()
+        old_state = manifest["state"]
+        manifest["state"] = "state_{}.npz".format(generation)
+        atomic_savez(os.path.join(self.directory, manifest["state"]), **arrays)
+        manifest["generation"] = generation
+        manifest["header"] = header
+
+        with tempfile.NamedTemporaryFile(
+                mode="w", dir=self.directory, suffix=".json", delete=False) as ff:
+            json.dump(manifest, ff)
+        os.replace(ff.name, self.filename)
+        self._manifest = manifest
+        if old_state is not None:
+            obsolete.append(old_state)
+        for filename in obsolete:
+            if os.path.isfile(os.path.join(self.directory, filename)):
+                os.remove(os.path.join(self.directory, filename))
+
+    def _merge_chunks(self, chunks, generation):
+        """ Merge the most recent chunks in place while the last two chunks
+        have the same level
+
+        Each merge increases the level by one, so the number of chunks grows
+        logarithmically with the number of checkpoints and each row is
+        rewritten a logarithmic number of times.
+
+        Returns
+        -------
+        list: the chunk files which are no longer needed
+        """
+        obsolete = list()
+        while len(chunks) > 1 and chunks[-1][1] == chunks[-2][1]:
+            (first, level), (second, _) = chunks[-2:]
+            merged = "chunk_{}_{}.npz".format(generation, level + 1)
+            with np.load(os.path.join(self.directory, first)) as data_1, \
+                    np.load(os.path.join(self.directory, second)) as data_2:
+                arrays = {key: data_1[key] for key in data_1.files}
+                for key in data_2.files:
+                    if key in arrays:
+                        arrays[key] = np.concatenate([arrays[key], data_2[key]])
+                    else:
+                        arrays[key] = data_2[key]
+            atomic_savez(os.path.join(self.directory, merged), **arrays)
+            chunks[-2:] = [[merged, level + 1]]
+            obsolete += [first, second]
+        return obsolete
+
+    def read(self):
+        """ Read the checkpoint
+
+        Returns
+        -------
+        header: dict
+            The JSON header passed to `write`
+        rows: dict
+            The concatenated rows of each appended quantity
+        arrays: dict
+            The arrays most recently passed to `write`
+
+        If there is no checkpoint `None` is returned.
+        """
+        if not self.exists():
+            return None
+        self._manifest = None
+        manifest = self.manifest
+        rows = dict()
+        for chunk, _ in manifest["chunks"]:
+            with np.load(os.path.join(self.directory, chunk)) as data:
+                for key in data.files:
+                    rows.setdefault(key, list()).append(data[key])
+        rows = {key: np.concatenate(value) for key, value in rows.items()}
+        with np.load(os.path.join(self.directory, manifest["state"])) as data:
+            arrays = {key: data[key] for key in data.files}
+        self._remove_unreferenced_files()
+        return manifest["header"], rows, arrays
+
+    def _remove_unreferenced_files(self):
+        """ Remove any files left behind by an interrupted write """
+        referenced = set(
+            [chunk for chunk, _ in self.manifest["chunks"]] + [self.manifest["state"]])
+        for filename in os.listdir(self.directory):
+            if filename == os.path.basename(self.filename) or filename in referenced:
+                continue
+            os.remove(os.path.join(self.directory, filename))
+
+    def remove(self):
+        """ Delete the checkpoint """
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        self._manifest = None
+
+    @staticmethod
+    def pack_random_state(state):
+        """ Split the state of a numpy random number generator into a JSON
+        serializable list and the array of keys """
+        name, keys, pos, has_gauss, cached_gaussian = state
+        return [name, int(pos), int(has_gauss), float(cached_gaussian)], keys
+
+    @staticmethod
+    def unpack_random_state(values, keys):
+        """ Recombine the output of `pack_random_state` """
+        name, pos, has_gauss, cached_gaussian = values
+        return name, keys, pos, has_gauss, cached_gaussian
+
+
 class Error(Exception):
     """ Base class for all exceptions raised by this module """
 
@@ -19,7 +19,13 @@ from ..utils import (
     reflect,
     safe_file_dump,
 )
-from .base_sampler import Sampler, NestedSampler
+from .base_sampler import (
+    IncrementalCheckpoint,
+    Sampler,
+    NestedSampler,
+    _log_likelihood_wrapper,
+    _prior_transform_wrapper,
+)
 from ..result import rejection_sample
 
 from numpy import linalg
@@ -27,49 +33,6 @@ from dynesty.utils import unitcheck
 import warnings
 
 
-_likelihood = None
-_priors = None
-_search_parameter_keys = None
-_use_ratio = False
-
-
-def _initialize_global_variables(
-        likelihood, priors, search_parameter_keys, use_ratio
-):
-    """
-    Store a global copy of the likelihood, priors, and search keys for
-    multiprocessing.
-    """
-    global _likelihood
-    global _priors
-    global _search_parameter_keys
-    global _use_ratio
-    _likelihood = likelihood
-    _priors = priors
-    _search_parameter_keys = search_parameter_keys
-    _use_ratio = use_ratio
-
-
-def _prior_transform_wrapper(theta):
-    """Wrapper to the prior transformation. Needed for multiprocessing."""
-    return _priors.rescale(_search_parameter_keys, theta)
-
-
-def _log_likelihood_wrapper(theta):
-    """Wrapper to the log likelihood. Needed for multiprocessing."""
-    if _priors.evaluate_constraints({
-        key: theta[ii] for ii, key in enumerate(_search_parameter_keys)
-    }):
-        params = {key: t for key, t in zip(_search_parameter_keys, theta)}
-        _likelihood.parameters.update(params)
-        if _use_ratio:
-            return _likelihood.log_likelihood_ratio()
-        else:
-            return _likelihood.log_likelihood()
-    else:
-        return np.nan_to_num(-np.inf)
-
-
 class Dynesty(NestedSampler):
     """
     bilby wrapper of `dynesty.NestedSampler`
@@ -125,6 +88,18 @@ class Dynesty(NestedSampler):
         interrupted, it can be resumed from the last checkpoint.
     n_check_point: int, optional (None)
         The number of steps to take before checking whether to check_point.
+    check_point_format: {'pickle', 'incremental'}, ('pickle')
+        The format of the checkpoint. 'pickle' dumps the whole sampler using
+        `dill`, 'incremental' appends the dead points added since the last
+        checkpoint to a directory and rebuilds the sampler on resume without
+        pickling, see `bilby.core.sampler.base_sampler.IncrementalCheckpoint`.
+        The history of bounds is not stored by the incremental format, the
+        current bound is recomputed from the live points on resume.
+    check_point_samples: bool, optional (None)
+        If true, write the current posterior samples to
+        `{outdir}/{label}_samples.dat` at each checkpoint. This resamples the
+        full set of dead points, so the default (None) only does this for
+        the 'pickle' format.
     resume: bool
         If true, resume run from checkpoint (if available)
     exit_code: int
@@ -149,7 +124,8 @@ class Dynesty(NestedSampler):
     def __init__(self, likelihood, priors, outdir='outdir', label='label',
                  use_ratio=False, plot=False, skip_import_verification=False,
                  check_point=True, check_point_plot=True, n_check_point=None,
-                 check_point_delta_t=600, resume=True, exit_code=130, **kwargs):
+                 check_point_delta_t=600, check_point_format="pickle",
+                 check_point_samples=None, resume=True, exit_code=130, **kwargs):
         super(Dynesty, self).__init__(likelihood=likelihood, priors=priors,
                                       outdir=outdir, label=label, use_ratio=use_ratio,
                                       plot=plot, skip_import_verification=skip_import_verification,
@@ -169,7 +145,19 @@ class Dynesty(NestedSampler):
         logger.info("Checkpoint every check_point_delta_t = {}s"
                     .format(check_point_delta_t))
 
-        self.resume_file = '{}/{}_resume.pickle'.format(self.outdir, self.label)
+        if check_point_format == "pickle":
+            self.resume_file = '{}/{}_resume.pickle'.format(self.outdir, self.label)
+        elif check_point_format == "incremental":
+            self.incremental_checkpoint = IncrementalCheckpoint(
+                '{}/{}_resume'.format(self.outdir, self.label))
+            self.resume_file = self.incremental_checkpoint.filename
+        else:
+            raise DynestySetupError(
+                "Unknown check_point_format {}".format(check_point_format))
+        self.check_point_format = check_point_format
+        if check_point_samples is None:
+            check_point_samples = check_point_format == "pickle"
+        self.check_point_samples = check_point_samples
         self.sampling_time = datetime.timedelta()
 
         try:
@@ -283,46 +271,6 @@ class Dynesty(NestedSampler):
         self.kwargs["periodic"] = self._periodic
         self.kwargs["reflective"] = self._reflective
 
-    def _setup_pool(self):
-        if self.kwargs["pool"] is not None:
-            logger.info("Using user defined pool.")
-            self.pool = self.kwargs["pool"]
-        elif self.kwargs["queue_size"] > 1:
-            logger.info(
-                "Setting up multiproccesing pool with {} processes.".format(
-                    self.kwargs["queue_size"]
-                )
-            )
-            import multiprocessing
-            self.pool = multiprocessing.Pool(
-                processes=self.kwargs["queue_size"],
-                initializer=_initialize_global_variables,
-                initargs=(
-                    self.likelihood,
-                    self.priors,
-                    self._search_parameter_keys,
-                    self.use_ratio
-                )
-            )
-        else:
-            _initialize_global_variables(
-                likelihood=self.likelihood,
-                priors=self.priors,
-                search_parameter_keys=self._search_parameter_keys,
-                use_ratio=self.use_ratio
-            )
-            self.pool = None
-        self.kwargs["pool"] = self.pool
-
-    def _close_pool(self):
-        if getattr(self, "pool", None) is not None:
-            logger.info("Starting to close worker pool.")
-            self.pool.close()
-            self.pool.join()
-            self.pool = None
-            self.kwargs["pool"] = self.pool
-            logger.info("Finished closing worker pool.")
-
     def run_sampler(self):
         import dynesty
         logger.info("Using dynesty version {}".format(dynesty.__version__))
@@ -424,10 +372,13 @@ class Dynesty(NestedSampler):
 
     def _run_external_sampler_with_checkpointing(self):
         logger.debug("Running sampler with checkpointing")
+        resume_file_loaded = False
         if self.resume:
             resume_file_loaded = self.read_saved_state(continuing=True)
             if resume_file_loaded:
                 logger.info('Resume file successfully loaded.')
+        if not resume_file_loaded and self.check_point_format == "incremental":
+            self.incremental_checkpoint.remove()
 
         old_ncall = self.sampler.ncall
         sampler_kwargs = self.sampler_function_kwargs.copy()
@@ -458,7 +409,9 @@ class Dynesty(NestedSampler):
 
     def _remove_checkpoint(self):
         """Remove checkpointed state"""
-        if os.path.isfile(self.resume_file):
+        if self.check_point_format == "incremental":
+            self.incremental_checkpoint.remove()
+        elif os.path.isfile(self.resume_file):
             os.remove(self.resume_file)
 
     def read_saved_state(self, continuing=False):
@@ -478,6 +431,8 @@ class Dynesty(NestedSampler):
             Whether the run is continuing or terminating, if True, the loaded
             state is mostly written back to disk.
         """
+        if self.check_point_format == "incremental":
+            return self._read_incremental_state()
         from ... import __version__ as bilby_version
         from dynesty import __version__ as dynesty_version
         versions = dict(bilby=bilby_version, dynesty=dynesty_version)
@@ -565,6 +520,12 @@ class Dynesty(NestedSampler):
             self.start_time = end_time
             self.sampler.kwargs["sampling_time"] = self.sampling_time
             self.sampler.kwargs["start_time"] = self.start_time
+        if self.check_point_format == "incremental":
+            self._write_incremental_state(
+                versions=dict(bilby=bilby_version, dynesty=dynesty_version))
+            if self.check_point_samples:
+                self.dump_samples_to_dat()
+            return
         self.sampler.versions = dict(
             bilby=bilby_version, dynesty=dynesty_version
         )
@@ -582,7 +543,97 @@ class Dynesty(NestedSampler):
         if self.sampler.pool is not None:
             self.sampler.M = self.sampler.pool.map
 
-        self.dump_samples_to_dat()
+        if self.check_point_samples:
+            self.dump_samples_to_dat()
+
+    def _write_incremental_state(self, versions):
+        """
+        Append the dead points added since the last checkpoint and write the
+        remaining state of the sampler to the incremental checkpoint.
+
+        If the final live points have been added to the dead points they are
+        not written, they are stored as the live points instead.
+        """
+        sampler = self.sampler
+        n_dead = len(sampler.saved_logl)
+        if sampler.added_live:
+            n_dead -= sampler.nlive
+        new_rows = {
+            name: getattr(sampler, "saved_{}".format(name))[
+                self.incremental_checkpoint.rows(name):n_dead]
+            for name in _SAVED_ATTRIBUTES}
+        arrays = {name: getattr(sampler, name) for name in _LIVE_ATTRIBUTES}
+        random_state, arrays["random_state_keys"] = (
+            IncrementalCheckpoint.pack_random_state(np.random.get_state()))
+        header = {name: _to_json(getattr(sampler, name))
+                  for name in _SCALAR_ATTRIBUTES}
+        header["kwargs"] = {
+            key: _to_json(value) for key, value in sampler.kwargs.items()
+            if isinstance(value, (bool, int, float, str, np.number))}
+        header.update(
+            nlive=sampler.nlive, random_state=random_state, versions=versions,
+            sampling_time=self.sampling_time.total_seconds())
+        self.incremental_checkpoint.write(
+            header=header, new_rows=new_rows, arrays=arrays)
+        logger.info("Written checkpoint file {}".format(self.resume_file))
+
+    def _read_incremental_state(self):
+        """
+        Restore the state of the sampler from the incremental checkpoint.
+
+        The sampler is the one created for this run, so no pickled objects
+        are needed. The current bound is recomputed from the live points.
+
+        Returns
+        -------
+        bool: whether the checkpoint was read
+        """
+        from ... import __version__ as bilby_version
+        from dynesty import __version__ as dynesty_version
+        versions = dict(bilby=bilby_version, dynesty=dynesty_version)
+        checkpoint = self.incremental_checkpoint.read()
+        if checkpoint is None:
+            logger.info(
+                "Resume file {} does not exist.".format(self.resume_file))
+            return False
+        logger.info("Reading resume file {}".format(self.resume_file))
+        header, rows, arrays = checkpoint
+        sampler = self.sampler
+        if header["nlive"] != sampler.nlive:
+            logger.warning(
+                "The number of live points has changed between runs. "
+                "The resume file {} will be ignored.".format(self.resume_file))
+            return False
+        for code in versions:
+            if not versions[code] == header["versions"].get(code, None):
+                logger.warning(
+                    "The {code} version has changed between runs. "
+                    "This may cause unpredictable behaviour and/or failure. "
+                    "Old version = {old}, new version = {new}.".format(
+                        code=code, old=header["versions"].get(code, "None"),
+                        new=versions[code]))
+
+        for name in _SAVED_ATTRIBUTES:
+            setattr(sampler, "saved_{}".format(name), list(rows.get(name, [])))
+        for name in _LIVE_ATTRIBUTES:
+            setattr(sampler, name, arrays[name])
+        for name in _SCALAR_ATTRIBUTES:
+            setattr(sampler, name, header[name])
+        sampler.kwargs.update(header["kwargs"])
+        sampler.added_live = False
+        sampler.queue = []
+        sampler.nqueue = 0
+        sampler.rstate = np.random
+        np.random.set_state(IncrementalCheckpoint.unpack_random_state(
+            header["random_state"], arrays["random_state_keys"]))
+        if sampler.logl_first_update is not None:
+            bound = sampler.update(
+                np.exp(sampler.saved_logvol[-1]) / sampler.nlive)
+            if self.kwargs["save_bounds"]:
+                sampler.bound.append(bound)
+        self.start_time = datetime.datetime.now()
+        self.sampling_time = datetime.timedelta(seconds=header["sampling_time"])
+        return True
 
     def dump_samples_to_dat(self):
         sampler = self.sampler
@@ -690,6 +741,22 @@ class Dynesty(NestedSampler):
         return self.priors.rescale(self._search_parameter_keys, theta)
 
 
+_SAVED_ATTRIBUTES = [
+    "id", "u", "v", "logl", "logvol", "logwt", "logz", "logzvar", "h", "nc",
+    "boundidx", "it", "bounditer", "scale"]
+_LIVE_ATTRIBUTES = ["live_u", "live_v", "live_logl", "live_bound", "live_it"]
+_SCALAR_ATTRIBUTES = [
+    "it", "ncall", "since_update", "nbound", "eff", "scale", "unused", "used",
+    "logl_first_update"]
+
+
+def _to_json(value):
+    """ Convert numpy scalars to python types for writing as JSON """
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
 def sample_rwalk_bilby(args):
     """ Modified bilby-implemented version of dynesty.sampling.sample_rwalk """
 
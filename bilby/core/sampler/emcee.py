@@ -14,7 +14,40 @@ import dill as pickle
 
 from ..utils import (
     logger, get_progress_bar, check_directory_exists_and_if_not_mkdir)
-from .base_sampler import MCMCSampler, SamplerError
+from .base_sampler import (
+    MCMCSampler,
+    SamplerError,
+    _log_likelihood_wrapper,
+    _log_prior_wrapper,
+)
+
+
+def _lnpostfn_wrapper(theta):
+    """Wrapper to the log posterior. Needed for multiprocessing."""
+    log_prior = _log_prior_wrapper(theta)
+    if np.isinf(log_prior):
+        return -np.inf, [np.nan, np.nan]
+    else:
+        log_likelihood = _log_likelihood_wrapper(theta)
+        return log_likelihood + log_prior, [log_likelihood, log_prior]
+
+
+class _VectorisedPosterior(object):
+    """ Picklable handle to `Emcee.lnpostfn_array`
+
+    The emcee sampler stores its log posterior function in the checkpoint.
+    The bilby sampler (which may hold a pool) is not pickled, it is set again
+    when resuming.
+    """
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+
+    def __call__(self, thetas):
+        return self.sampler.lnpostfn_array(thetas)
+
+    def __getstate__(self):
+        return dict()
 
 
 class Emcee(MCMCSampler):
@@ -94,14 +127,6 @@ class Emcee(MCMCSampler):
         if 'iterations' not in kwargs:
             if 'nsteps' in kwargs:
                 kwargs['iterations'] = kwargs.pop('nsteps')
-        if 'threads' in kwargs:
-            if kwargs['threads'] != 1:
-                logger.warning("The 'threads' argument cannot be used for "
-                               "parallelisation. This run will proceed "
-                               "without parallelisation, but consider the use "
-                               "of an appropriate Pool object passed to the "
-                               "'pool' keyword.")
-                kwargs['threads'] = 1
 
     @property
     def sampler_function_kwargs(self):
@@ -137,7 +162,17 @@ class Emcee(MCMCSampler):
                        for key, value in self.kwargs.items()
                        if key not in self.sampler_function_kwargs}
 
-        init_kwargs['lnpostfn'] = self.lnpostfn
+        if self.prerelease:
+            # all walkers are evaluated together, using the pool (if any)
+            # to evaluate batches of walkers
+            init_kwargs['lnpostfn'] = _VectorisedPosterior(self)
+            init_kwargs['vectorize'] = True
+            init_kwargs['pool'] = None
+        elif getattr(self, 'pool', None) is not None:
+            init_kwargs['lnpostfn'] = _lnpostfn_wrapper
+            init_kwargs['pool'] = self.pool
+        else:
+            init_kwargs['lnpostfn'] = self.lnpostfn
         init_kwargs['dim'] = self.ndim
 
         # updated init keywords for emcee > v2.2.1
@@ -164,6 +199,34 @@ class Emcee(MCMCSampler):
             log_likelihood = self.log_likelihood(theta)
             return log_likelihood + log_prior, [log_likelihood, log_prior]
 
+    def lnpostfn_array(self, thetas):
+        """ Log posterior of all walkers, used with emcee > v2.2.1
+
+        The prior is evaluated for all walkers using `map_log_prior` and the
+        likelihood for the walkers inside the prior using
+        `map_log_likelihood`.
+
+        Parameters
+        ----------
+        thetas: array_like
+            The walker positions with shape (nwalkers, ndim)
+
+        Returns
+        -------
+        list: The log posterior and the blob of [log_likelihood, log_prior]
+            for each walker
+        """
+        thetas = np.atleast_2d(thetas)
+        log_prior = self.map_log_prior(thetas)
+        log_likelihood = np.full(len(thetas), np.nan)
+        inside = ~np.isinf(log_prior)
+        if np.any(inside):
+            log_likelihood[inside] = self.map_log_likelihood(thetas[inside])
+        log_prior = np.where(inside, log_prior, np.nan)
+        log_posterior = np.where(inside, log_likelihood + log_prior, -np.inf)
+        return [(post, [like, prior]) for post, like, prior in zip(
+            log_posterior, log_likelihood, log_prior)]
+
     @property
     def nburn(self):
         if type(self.__nburn) in [float, int]:
@@ -264,11 +327,20 @@ class Emcee(MCMCSampler):
             # Overwrites the stored sampler chain with one that is truncated
             # to only the completed steps
             self.sampler._chain = self.sampler_chain
+            # The pool can not be pickled
+            pool = getattr(self._sampler, 'pool', None)
+            if pool is not None:
+                self._sampler.pool = None
             pickle.dump(self._sampler, f)
+            if pool is not None:
+                self._sampler.pool = pool
 
     def checkpoint_and_exit(self, signum, frame):
         logger.info("Recieved signal {}".format(signum))
-        self.checkpoint()
+        # Only the parent process has a pool and writes the checkpoint
+        if self.npool == 1 or getattr(self, 'pool', None) is not None:
+            self.checkpoint()
+            self._close_pool()
         sys.exit()
 
     def _initialise_sampler(self):
@@ -291,6 +363,10 @@ class Emcee(MCMCSampler):
                         .format(self.checkpoint_info.sampler_file))
             with open(self.checkpoint_info.sampler_file, 'rb') as f:
                 self._sampler = pickle.load(f)
+            if getattr(self, 'pool', None) is not None:
+                self._sampler.pool = self.pool
+            if getattr(self._sampler, 'vectorize', False):
+                self._sampler.log_prob_fn.f.sampler = self
             self._set_pos0_for_resume()
         else:
             self._initialise_sampler()
@@ -324,8 +400,7 @@ class Emcee(MCMCSampler):
             return 0
 
     def _draw_pos0_from_prior(self):
-        return np.array(
-            [self.get_random_draw_from_prior() for _ in range(self.nwalkers)])
+        return self.get_initial_points_from_prior(self.nwalkers)[1]
 
     @property
     def _pos0_shape(self):
@@ -353,6 +428,7 @@ class Emcee(MCMCSampler):
         self.pos0 = self.sampler.chain[:, -1, :]
 
     def run_sampler(self):
+        self._setup_pool()
         tqdm = get_progress_bar()
         sampler_function_kwargs = self.sampler_function_kwargs
         iterations = sampler_function_kwargs.pop('iterations')
@@ -369,6 +445,7 @@ class Emcee(MCMCSampler):
                 total=iterations):
             self.write_chains_to_file(sample)
         self.checkpoint()
+        self._close_pool()
 
         self.result.sampler_output = np.nan
         self.calculate_autocorrelation(
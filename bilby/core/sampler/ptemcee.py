@@ -14,7 +14,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 
 from ..utils import logger
-from .base_sampler import SamplerError, MCMCSampler
+from .base_sampler import (
+    SamplerError, MCMCSampler, IncrementalCheckpoint, _sampling_convenience_dump)
 
 
 ConvergenceInputs = namedtuple(
@@ -74,6 +75,11 @@ class Ptemcee(MCMCSampler):
         A minimum tau (autocorrelation time) to accept.
     check_point_deltaT: float, (600)
         The period with which to checkpoint (in seconds).
+    check_point_format: {'pickle', 'incremental'}, ('pickle')
+        The format of the checkpoint. 'pickle' pickles the full state at each
+        checkpoint. 'incremental' writes a directory in which only the steps
+        added since the previous checkpoint are appended, so the cost of a
+        checkpoint does not grow with the length of the run.
     threads: int, (1)
         If threads > 1, a MultiPool object is setup and used.
     exit_code: int, (77)
@@ -139,6 +145,8 @@ class Ptemcee(MCMCSampler):
         frac_threshold=0.01,
         min_tau=1,
         check_point_deltaT=600,
+        check_point_format="pickle",
+        check_point_samples=None,
         threads=1,
         exit_code=77,
         plot=False,
@@ -173,9 +181,21 @@ class Ptemcee(MCMCSampler):
         self.resume = resume
         self.check_point_deltaT = check_point_deltaT
         self.check_point_plot = check_point_plot
-        self.resume_file = "{}/{}_checkpoint_resume.pickle".format(
-            self.outdir, self.label
-        )
+        if check_point_format == "pickle":
+            self.incremental_checkpoint = None
+            self.resume_file = "{}/{}_checkpoint_resume.pickle".format(
+                self.outdir, self.label
+            )
+        elif check_point_format == "incremental":
+            self.incremental_checkpoint = IncrementalCheckpoint(
+                "{}/{}_checkpoint_resume".format(self.outdir, self.label))
+            self.resume_file = self.incremental_checkpoint.filename
+        else:
+            raise SamplerError(
+                "check_point_format={} not implemented".format(check_point_format))
+        if check_point_samples is None:
+            check_point_samples = check_point_format == "pickle"
+        self.check_point_samples = check_point_samples
 
         # Store convergence checking inputs in a named tuple
         convergence_inputs_dict = dict(
@@ -201,6 +221,7 @@ class Ptemcee(MCMCSampler):
 
         # Store threads
         self.threads = threads
+        self._npool = threads
 
         # Misc inputs
         self.store_walkers = store_walkers
@@ -233,18 +254,14 @@ class Ptemcee(MCMCSampler):
 
         Returns
         -------
-        pos0: list
+        pos0: array_like
             The initial postitions of the walkers, with shape (ntemps, nwalkers, ndim)
 
         """
         logger.info("Generating pos0 samples")
-        return [
-            [
-                self.get_random_draw_from_prior()
-                for _ in range(self.nwalkers)
-            ]
-            for _ in range(self.kwargs["ntemps"])
-        ]
+        ntemps = self.kwargs["ntemps"]
+        draws = self.get_initial_points_from_prior(ntemps * self.nwalkers)[1]
+        return draws.reshape(ntemps, self.nwalkers, self.ndim)
 
     def get_pos0_from_minimize(self, minimize_list=None):
         """ Draw the initial positions using an initial minimization step
@@ -323,55 +340,42 @@ class Ptemcee(MCMCSampler):
 
     def setup_sampler(self):
         """ Either initialize the sampelr or read in the resume file """
-        import ptemcee
-
         if os.path.isfile(self.resume_file) and self.resume is True:
             logger.info("Resume data {} found".format(self.resume_file))
-            with open(self.resume_file, "rb") as file:
-                data = dill.load(file)
-
-            # Extract the check-point data
-            self.sampler = data["sampler"]
-            self.iteration = data["iteration"]
-            self.chain_array = data["chain_array"]
-            self.log_likelihood_array = data["log_likelihood_array"]
-            self.pos0 = data["pos0"]
-            self.beta_list = data["beta_list"]
-            self.sampler._betas = np.array(self.beta_list[-1])
-            self.tau_list = data["tau_list"]
-            self.tau_list_n = data["tau_list_n"]
-            self.time_per_check = data["time_per_check"]
-
-            # Initialize the pool
-            self.sampler.pool = self.pool
-            self.sampler.threads = self.threads
+            if self.incremental_checkpoint is not None:
+                self.sampler = self._initialize_ptemcee_sampler()
+                self._read_incremental_state()
+            else:
+                with open(self.resume_file, "rb") as file:
+                    data = dill.load(file)
+
+                # Extract the check-point data
+                self.sampler = data["sampler"]
+                self.iteration = data["iteration"]
+                self.chain_array = data["chain_array"]
+                self.log_likelihood_array = data["log_likelihood_array"]
+                self.pos0 = data["pos0"]
+                self.beta_list = data["beta_list"]
+                self.sampler._betas = np.array(self.beta_list[-1])
+                self.tau_list = data["tau_list"]
+                self.tau_list_n = data["tau_list_n"]
+                self.time_per_check = data["time_per_check"]
+
+                # Initialize the pool
+                self.sampler.pool = self.pool
+                self.sampler.threads = self.threads
+                self.sampler._evaluate = WalkerEvaluator(self)
 
             logger.info(
                 "Resuming from previous run with time={}".format(self.iteration)
             )
 
         else:
+            if self.incremental_checkpoint is not None:
+                self.incremental_checkpoint.remove()
+
             # Initialize the PTSampler
-            if self.threads == 1:
-                self.sampler = ptemcee.Sampler(
-                    dim=self.ndim,
-                    logl=self.log_likelihood,
-                    logp=self.log_prior,
-                    **self.sampler_init_kwargs
-                )
-            else:
-                self.sampler = ptemcee.Sampler(
-                    dim=self.ndim,
-                    logl=do_nothing_function,
-                    logp=do_nothing_function,
-                    pool=self.pool,
-                    threads=self.threads,
-                    **self.sampler_init_kwargs
-                )
-
-                self.sampler._likeprior = LikePriorEvaluator(
-                    self.search_parameter_keys, use_ratio=self.use_ratio
-                )
+            self.sampler = self._initialize_ptemcee_sampler()
 
             # Initialize storing results
             self.iteration = 0
@@ -385,6 +389,64 @@ class Ptemcee(MCMCSampler):
 
         return self.sampler
 
+    def _initialize_ptemcee_sampler(self):
+        import ptemcee
+
+        if self.threads == 1:
+            sampler = ptemcee.Sampler(
+                dim=self.ndim,
+                logl=self.log_likelihood,
+                logp=self.log_prior,
+                **self.sampler_init_kwargs
+            )
+        else:
+            sampler = ptemcee.Sampler(
+                dim=self.ndim,
+                logl=do_nothing_function,
+                logp=do_nothing_function,
+                pool=self.pool,
+                threads=self.threads,
+                **self.sampler_init_kwargs
+            )
+
+            sampler._likeprior = LikePriorEvaluator(
+                self.search_parameter_keys, use_ratio=self.use_ratio
+            )
+        sampler._evaluate = WalkerEvaluator(self)
+        return sampler
+
+    def evaluate_walkers(self, ps):
+        """ Evaluate the log likelihood and log prior of all walkers
+
+        This replaces `ptemcee.Sampler._evaluate`, which evaluates each
+        walker separately. The prior is evaluated using `map_log_prior` and
+        the likelihood of the walkers inside the prior using
+        `map_log_likelihood`, so that the pool (if any) evaluates batches of
+        walkers.
+
+        Parameters
+        ----------
+        ps: array_like
+            The walker positions with shape (ntemps, nwalkers, ndim)
+
+        Returns
+        -------
+        logl, logp: array_like
+            The log likelihood and log prior with shape (ntemps, nwalkers)
+        """
+        thetas = ps.reshape((-1, self.ndim))
+        logp = self.map_log_prior(thetas)
+        if np.any(np.isnan(logp)):
+            raise ValueError("Prior function returned NaN.")
+        # Can't return -inf, since this messes with beta=0 behaviour.
+        logl = np.zeros(len(thetas))
+        inside = logp != -np.inf
+        if np.any(inside):
+            logl[inside] = self.map_log_likelihood(thetas[inside])
+            if np.any(np.isnan(logl)):
+                raise ValueError("Log likelihood function returned NaN.")
+        return logl.reshape(ps.shape[:-1]), logp.reshape(ps.shape[:-1])
+
     def get_zero_chain_array(self):
         return np.zeros((self.nwalkers, self.max_steps, self.ndim))
 
@@ -403,16 +465,8 @@ class Ptemcee(MCMCSampler):
             raise SamplerError("pos0={} not implemented".format(self.pos0))
 
     def setup_pool(self):
-        """ If threads > 1, setup a MultiPool, else run in serial mode """
-        if self.threads > 1:
-            import schwimmbad
-
-            logger.info("Creating MultiPool with {} processes".format(self.threads))
-            self.pool = schwimmbad.MultiPool(
-                self.threads, initializer=init, initargs=(self.likelihood, self.priors)
-            )
-        else:
-            self.pool = None
+        """ If threads > 1, setup a multiprocessing pool, else run in serial mode """
+        self._setup_pool()
 
     def run_sampler(self):
         self.setup_pool()
@@ -501,8 +555,7 @@ class Ptemcee(MCMCSampler):
             seconds=np.sum(self.time_per_check)
         )
 
-        if self.pool:
-            self.pool.close()
+        self._close_pool()
 
         return self.result
 
@@ -517,24 +570,35 @@ class Ptemcee(MCMCSampler):
         sys.exit(self.exit_code)
 
     def write_current_state(self, plot=True):
-        checkpoint(
-            self.iteration,
-            self.outdir,
-            self.label,
-            self.nsamples_effective,
-            self.sampler,
-            self.nburn,
-            self.thin,
-            self.search_parameter_keys,
-            self.resume_file,
-            self.log_likelihood_array,
-            self.chain_array,
-            self.pos0,
-            self.beta_list,
-            self.tau_list,
-            self.tau_list_n,
-            self.time_per_check,
-        )
+        if self.incremental_checkpoint is not None:
+            logger.info("Writing checkpoint and diagnostics")
+            if self.check_point_samples:
+                write_samples(
+                    self.iteration, self.outdir, self.label,
+                    self.nsamples_effective, self.nburn, self.thin,
+                    self.search_parameter_keys, self.chain_array)
+            self._write_incremental_state()
+            logger.info("Finished writing checkpoint")
+        else:
+            checkpoint(
+                self.iteration,
+                self.outdir,
+                self.label,
+                self.nsamples_effective,
+                self.sampler,
+                self.nburn,
+                self.thin,
+                self.search_parameter_keys,
+                self.resume_file,
+                self.log_likelihood_array,
+                self.chain_array,
+                self.pos0,
+                self.beta_list,
+                self.tau_list,
+                self.tau_list_n,
+                self.time_per_check,
+                write_samples_file=self.check_point_samples,
+            )
 
         if plot and not np.isnan(self.nburn):
             # Generate the walkers plot diagnostic
@@ -558,6 +622,79 @@ class Ptemcee(MCMCSampler):
                 self.convergence_inputs.autocorr_tau,
             )
 
+    def _write_incremental_state(self):
+        """ Append the steps taken since the last checkpoint to the
+        incremental checkpoint and rewrite the sampler state """
+        ckpt = self.incremental_checkpoint
+        start = ckpt.rows("chain")
+        new_rows = dict(
+            chain=np.moveaxis(self.chain_array[:, start:self.iteration, :], 1, 0),
+            log_likelihood=np.moveaxis(
+                self.log_likelihood_array[:, :, start:self.iteration], 2, 0),
+            time_per_check=self.time_per_check[ckpt.rows("time_per_check"):],
+            beta=self.beta_list[ckpt.rows("beta"):],
+            tau=self.tau_list[ckpt.rows("tau"):],
+            tau_n=self.tau_list_n[ckpt.rows("tau_n"):],
+        )
+        random_state, random_keys = ckpt.pack_random_state(
+            self.sampler._random.get_state())
+        arrays = dict(
+            pos0=self.pos0,
+            betas=self.sampler._betas,
+            nswap=self.sampler.nswap,
+            nswap_accepted=self.sampler.nswap_accepted,
+            nprop=self.sampler.nprop,
+            nprop_accepted=self.sampler.nprop_accepted,
+            random_keys=random_keys,
+        )
+        header = dict(
+            iteration=self.iteration,
+            time=int(self.sampler._time),
+            random_state=random_state,
+            ndim=self.ndim,
+            nwalkers=self.nwalkers,
+            ntemps=self.ntemps,
+        )
+        ckpt.write(header=header, new_rows=new_rows, arrays=arrays)
+
+    def _read_incremental_state(self):
+        """ Restore the run from the incremental checkpoint onto a freshly
+        initialized sampler """
+        ckpt = self.incremental_checkpoint
+        header, rows, arrays = ckpt.read()
+        for key in ["ndim", "nwalkers", "ntemps"]:
+            if header[key] != getattr(self, key):
+                raise SamplerError(
+                    "Checkpoint {}={} does not match the sampler {}={}".format(
+                        key, header[key], key, getattr(self, key)))
+
+        self.iteration = header["iteration"]
+        self.chain_array = self.get_zero_chain_array()
+        self.log_likelihood_array = self.get_zero_log_likelihood_array()
+        while self.chain_array.shape[1] < self.iteration:
+            self.chain_array = np.concatenate((
+                self.chain_array, self.get_zero_chain_array()), axis=1)
+            self.log_likelihood_array = np.concatenate((
+                self.log_likelihood_array, self.get_zero_log_likelihood_array()),
+                axis=2)
+        if self.iteration > 0:
+            self.chain_array[:, :self.iteration, :] = np.moveaxis(
+                rows["chain"], 0, 1)
+            self.log_likelihood_array[:, :, :self.iteration] = np.moveaxis(
+                rows["log_likelihood"], 0, 2)
+        self.time_per_check = list(rows.get("time_per_check", []))
+        self.beta_list = [list(row) for row in rows.get("beta", [])]
+        self.tau_list = [list(row) for row in rows.get("tau", [])]
+        self.tau_list_n = [int(nn) for nn in rows.get("tau_n", [])]
+        self.pos0 = arrays["pos0"]
+
+        self.sampler._betas = arrays["betas"]
+        self.sampler._time = header["time"]
+        for key in ["nswap", "nswap_accepted", "nprop", "nprop_accepted"]:
+            setattr(self.sampler, key, arrays[key])
+        self.sampler._random.set_state(ckpt.unpack_random_state(
+            header["random_state"], arrays["random_keys"]))
+
 
 def check_iteration(
     samples,
@@ -750,18 +887,13 @@ def checkpoint(
     tau_list,
     tau_list_n,
     time_per_check,
+    write_samples_file=True,
 ):
     logger.info("Writing checkpoint and diagnostics")
-    ndim = sampler.dim
-
-    # Store the samples if possible
-    if nsamples_effective > 0:
-        filename = "{}/{}_samples.txt".format(outdir, label)
-        samples = np.array(chain_array)[:, nburn : iteration : thin, :].reshape(
-            (-1, ndim)
-        )
-        df = pd.DataFrame(samples, columns=search_parameter_keys)
-        df.to_csv(filename, index=False, header=True, sep=" ")
+    if write_samples_file:
+        write_samples(
+            iteration, outdir, label, nsamples_effective, nburn, thin,
+            search_parameter_keys, chain_array)
 
     # Pickle the resume artefacts
     sampler_copy = copy.copy(sampler)
@@ -785,6 +917,26 @@ def checkpoint(
     logger.info("Finished writing checkpoint")
 
 
+def write_samples(
+    iteration,
+    outdir,
+    label,
+    nsamples_effective,
+    nburn,
+    thin,
+    search_parameter_keys,
+    chain_array,
+):
+    """ Store the burnt-in and thinned samples if possible """
+    if nsamples_effective > 0:
+        filename = "{}/{}_samples.txt".format(outdir, label)
+        samples = np.array(chain_array)[:, nburn : iteration : thin, :].reshape(
+            (-1, len(search_parameter_keys))
+        )
+        df = pd.DataFrame(samples, columns=search_parameter_keys)
+        df.to_csv(filename, index=False, header=True, sep=" ")
+
+
 def plot_walkers(walkers, nburn, thin, parameter_labels, outdir, label):
     """ Method to plot the trace of the walkers in an ensemble MCMC plot """
     nwalkers, nsteps, ndim = walkers.shape
@@ -885,15 +1037,24 @@ def do_nothing_function():
     pass
 
 
-likelihood = None
-priors = None
+class WalkerEvaluator(object):
+    """
+    Replacement for `ptemcee.Sampler._evaluate` calling
+    `Ptemcee.evaluate_walkers`
+
+    The bilby sampler (which holds the pool) is not pickled with the ptemcee
+    sampler in the checkpoint, it is set again when resuming.
+
+    """
+
+    def __init__(self, sampler):
+        self.sampler = sampler
 
+    def __call__(self, ps):
+        return self.sampler.evaluate_walkers(ps)
 
-def init(likelihood_in, priors_in):
-    global likelihood
-    global priors
-    likelihood = likelihood_in
-    priors = priors_in
+    def __getstate__(self):
+        return dict()
 
 
 class LikePriorEvaluator(object):
@@ -912,6 +1073,8 @@ class LikePriorEvaluator(object):
         self.use_ratio = use_ratio
 
     def logl(self, v_array):
+        likelihood = _sampling_convenience_dump.likelihood
+        priors = _sampling_convenience_dump.priors
         parameters = {key: v for key, v in zip(self.search_parameter_keys, v_array)}
         if priors.evaluate_constraints(parameters) > 0:
             likelihood.parameters.update(parameters)
@@ -924,7 +1087,7 @@ class LikePriorEvaluator(object):
 
     def logp(self, v_array):
         params = {key: t for key, t in zip(self.search_parameter_keys, v_array)}
-        return priors.ln_prob(params)
+        return _sampling_convenience_dump.priors.ln_prob(params)
 
     def __call__(self, x):
         lp = self.logp(x)
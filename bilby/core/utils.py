@@ -1,9 +1,11 @@
 from __future__ import division
 
+import contextlib
 from distutils.spawn import find_executable
 import logging
 import os
 import shutil
+import tempfile
 from math import fmod
 import argparse
 import inspect
@@ -795,6 +797,139 @@ def logtrapzexp(lnf, dx):
     return np.log(dx / 2.) + logsumexp([logsumexp(lnf[:-1]), logsumexp(lnf[1:])])
 
 
+class GaussianMixtureDensity(object):
+    """ A Gaussian mixture model density estimate
+
+    The samples are whitened using their mean and covariance and a mixture
+    of Gaussians with full covariances is fit with the expectation
+    maximization algorithm. Unlike a kernel density estimate, the cost of
+    evaluating the density depends only on the number of components, not
+    on the number of samples.
+
+    The call signature follows `scipy.stats.gaussian_kde`, i.e., points are
+    given with shape (ndim, npoints).
+
+    Parameters
+    ----------
+    samples: array_like
+        The samples to fit, with shape (ndim, nsamples)
+    n_components: int
+        The number of Gaussian components
+    max_iterations: int
+        The maximum number of expectation maximization iterations
+    tolerance: float
+        The fit stops once the mean log likelihood of the samples improves by
+        less than this
+    regularization: float
+        Added to the diagonal of the (whitened) component covariances to
+        keep them positive definite
+    """
+
+    def __init__(self, samples=None, n_components=8, max_iterations=200,
+                 tolerance=1e-4, regularization=1e-6):
+        self.n_components = n_components
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.regularization = regularization
+        if samples is not None:
+            self.fit(samples)
+
+    def fit(self, samples):
+        """ Fit the mixture to samples with shape (ndim, nsamples) """
+        samples = np.atleast_2d(samples).T
+        nsamples, self.d = samples.shape
+        n_components = min(self.n_components, nsamples)
+
+        self.mean = np.mean(samples, axis=0)
+        self.whitening = np.linalg.cholesky(
+            np.atleast_2d(np.cov(samples, rowvar=False)) +
+            self.regularization * np.eye(self.d))
+        whitened = self._whiten(samples)
+
+        # Initialize from randomly chosen samples with unit covariances
+        idxs = np.random.choice(nsamples, n_components, replace=False)
+        self.means = whitened[idxs]
+        self.covariances = np.array([np.eye(self.d)] * n_components)
+        self.weights = np.ones(n_components) / n_components
+
+        previous = -np.inf
+        for _ in range(self.max_iterations):
+            log_resp = self._component_log_pdfs(whitened)
+            log_norm = logsumexp(log_resp, axis=1)
+            mean_log_likelihood = np.mean(log_norm)
+            resp = np.exp(log_resp - log_norm[:, np.newaxis])
+            counts = np.sum(resp, axis=0) + 10 * np.finfo(float).eps
+            self.weights = counts / nsamples
+            self.means = resp.T.dot(whitened) / counts[:, np.newaxis]
+            for kk in range(n_components):
+                diff = whitened - self.means[kk]
+                self.covariances[kk] = (
+                    (resp[:, kk, np.newaxis] * diff).T.dot(diff) / counts[kk] +
+                    self.regularization * np.eye(self.d))
+            if mean_log_likelihood - previous < self.tolerance:
+                break
+            previous = mean_log_likelihood
+        return self
+
+    def _whiten(self, points):
+        from scipy.linalg import solve_triangular
+        return solve_triangular(
+            self.whitening, (points - self.mean).T, lower=True).T
+
+    def _component_log_pdfs(self, whitened):
+        """ The log of the weighted density of each component, with shape
+        (npoints, n_components) """
+        from scipy.linalg import solve_triangular
+        log_pdfs = np.empty((len(whitened), len(self.weights)))
+        for kk, (mean, covariance) in enumerate(zip(self.means, self.covariances)):
+            cholesky = np.linalg.cholesky(covariance)
+            zz = solve_triangular(cholesky, (whitened - mean).T, lower=True)
+            log_pdfs[:, kk] = (
+                np.log(self.weights[kk]) - 0.5 * np.sum(zz ** 2, axis=0) -
+                np.sum(np.log(np.diag(cholesky))) - 0.5 * self.d * np.log(2 * np.pi))
+        return log_pdfs
+
+    def logpdf(self, points):
+        """ The log density at points with shape (ndim, npoints) """
+        points = np.atleast_2d(points)
+        if points.shape[0] != self.d:
+            if points.shape == (1, self.d):
+                points = points.T
+            else:
+                raise ValueError("Points have dimension {}, expected {}".format(
+                    points.shape[0], self.d))
+        whitened = self._whiten(points.T)
+        return (logsumexp(self._component_log_pdfs(whitened), axis=1) -
+                np.sum(np.log(np.diag(self.whitening))))
+
+    def evaluate(self, points):
+        """ The density at points with shape (ndim, npoints) """
+        return np.exp(self.logpdf(points))
+
+    __call__ = evaluate
+
+    def to_dict(self):
+        """ The fitted parameters as a dictionary, see `from_dict` """
+        return dict(
+            n_components=self.n_components, max_iterations=self.max_iterations,
+            tolerance=self.tolerance, regularization=self.regularization,
+            mean=self.mean, whitening=self.whitening, weights=self.weights,
+            means=self.means, covariances=self.covariances)
+
+    @classmethod
+    def from_dict(cls, dictionary):
+        """ Recreate a fitted mixture from the output of `to_dict` """
+        density = cls(
+            n_components=dictionary["n_components"],
+            max_iterations=dictionary["max_iterations"],
+            tolerance=dictionary["tolerance"],
+            regularization=dictionary["regularization"])
+        for key in ["mean", "whitening", "weights", "means", "covariances"]:
+            setattr(density, key, np.asarray(dictionary[key], dtype=float))
+        density.d = len(density.mean)
+        return density
+
+
 class SamplesSummary(object):
     """ Object to store a set of samples and calculate summary statistics
 
@@ -1158,6 +1293,72 @@ def safe_file_dump(data, filename, module):
     shutil.move(temp_filename, filename)
 
 
+@contextlib.contextmanager
+def file_lock(filename):
+    """ Hold an exclusive lock on a lock file while in the context
+
+    Used to stop concurrent processes sharing a directory from building or
+    writing the same cached file at the same time. The lock file is removed
+    when the lock is released. If the lock file can not be created, e.g.,
+    because the directory is read-only, or on platforms without `fcntl` no
+    lock is taken.
+
+    Parameters
+    ----------
+    filename: str
+        The lock file, created if it does not exist
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    while True:
+        try:
+            lock = open(filename, "a")
+        except OSError as e:
+            logger.debug("Unable to create lock file {}: {}".format(filename, e))
+            yield
+            return
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        # the previous holder may have removed the file while we waited
+        try:
+            if os.path.samestat(os.fstat(lock.fileno()), os.stat(filename)):
+                break
+        except OSError:
+            pass
+        lock.close()
+    try:
+        yield
+    finally:
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        lock.close()
+
+
+def atomic_savez(filename, **kwargs):
+    """ Write a `.npz` file atomically
+
+    The arrays are written to a temporary file in the same directory which
+    is then renamed, so readers never see a partially written file.
+
+    Parameters
+    ----------
+    filename: str
+        The file to write to
+    kwargs:
+        The arrays passed to `numpy.savez`
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    with tempfile.NamedTemporaryFile(
+            dir=directory, suffix=".npz", delete=False) as temp_file:
+        np.savez(temp_file, **kwargs)
+    os.replace(temp_file.name, filename)
+
+
 def latex_plot_format(func):
     """
     Wrap a plotting function to set rcParams so that text renders nicely with
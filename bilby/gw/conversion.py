@@ -1156,7 +1156,7 @@ def compute_snrs(sample, likelihood):
 
 
 def generate_posterior_samples_from_marginalized_likelihood(
-        samples, likelihood, npool=1):
+        samples, likelihood, npool=1, block_size=100):
     """
     Reconstruct the distance posterior from a run which used a likelihood which
     explicitly marginalised over time/distance/phase.
@@ -1171,6 +1171,9 @@ def generate_posterior_samples_from_marginalized_likelihood(
         Likelihood used during sampling.
     npool: int, (default=1)
         If given, perform generation (where possible) using a multiprocessing pool
+    block_size: int, (default=100)
+        The number of samples reconstructed together, the blocks are
+        distributed over the pool.
 
     Return
     ------
@@ -1190,6 +1193,55 @@ def generate_posterior_samples_from_marginalized_likelihood(
 
     logger.info('Reconstructing marginalised parameters.')
 
+    if not hasattr(likelihood, 'reconstruct_marginalized_parameters'):
+        return _generate_posterior_samples_from_marginalized_likelihood_per_sample(
+            samples=samples, likelihood=likelihood, npool=npool)
+
+    uniforms = np.random.uniform(0, 1, (len(samples), 3))
+    block_args = [
+        ({key: samples[key].values[ii:ii + block_size] for key in samples},
+         uniforms[ii:ii + block_size])
+        for ii in range(0, len(samples), block_size)]
+    if npool > 1:
+        pool = multiprocessing.Pool(
+            processes=npool,
+            initializer=_initialize_reconstruction_likelihood,
+            initargs=(likelihood,))
+        logger.info(
+            "Using a pool with size {} for nsamples={}"
+            .format(npool, len(samples))
+        )
+        new_samples = pool.map(
+            _reconstruct_block, tqdm(block_args, file=sys.stdout))
+        pool.close()
+        pool.join()
+    else:
+        _initialize_reconstruction_likelihood(likelihood)
+        new_samples = [
+            _reconstruct_block(args) for args in tqdm(block_args, file=sys.stdout)]
+
+    for key in ['geocent_time', 'luminosity_distance', 'phase']:
+        samples[key] = np.concatenate([block[key] for block in new_samples])
+    return samples
+
+
+_reconstruction_likelihood = None
+
+
+def _initialize_reconstruction_likelihood(likelihood):
+    """ Store the likelihood used to reconstruct the marginalised parameters """
+    global _reconstruction_likelihood
+    _reconstruction_likelihood = likelihood
+
+
+def _reconstruct_block(args):
+    samples, uniforms = args
+    return _reconstruction_likelihood.reconstruct_marginalized_parameters(
+        samples=samples, uniforms=uniforms)
+
+
+def _generate_posterior_samples_from_marginalized_likelihood_per_sample(
+        samples, likelihood, npool=1):
     fill_args = [(ii, row, likelihood) for ii, row in samples.iterrows()]
     if npool > 1:
         pool = multiprocessing.Pool(processes=npool)
@@ -1217,12 +1269,8 @@ def generate_sky_frame_parameters(samples, likelihood):
         raise ValueError
 
     logger.info('Generating sky frame parameters.')
-    new_samples = list()
-    for ii in tqdm(range(len(samples)), file=sys.stdout):
-        sample = dict(samples.iloc[ii]).copy()
-        likelihood.parameters.update(sample)
-        new_samples.append(likelihood.get_sky_frame_parameters())
-    new_samples = DataFrame(new_samples)
+    new_samples = likelihood.get_sky_frame_parameters(
+        {key: samples[key].values for key in samples})
     for key in new_samples:
         samples[key] = new_samples[key]
 
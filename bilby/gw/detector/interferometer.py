@@ -92,6 +92,8 @@ class Interferometer(object):
             minimum_frequency=minimum_frequency,
             maximum_frequency=maximum_frequency)
         self.meta_data = dict()
+        self._data_products = dict()
+        self._data_products_key = None
 
     def __eq__(self, other):
         if self.name == other.name and \
@@ -280,7 +282,39 @@ class Interferometer(object):
         polarization_tensor = gwutils.get_polarization_tensor(ra, dec, time, psi, mode)
         return np.einsum('ij,ij->', self.geometry.detector_tensor, polarization_tensor)
 
-    def get_detector_response(self, waveform_polarizations, parameters):
+    def antenna_response_batch(self, ra, dec, time, psi, modes=('plus', 'cross'),
+                               polarization_tensors=None):
+        """
+        Calculate the antenna response functions for many sky locations and
+        times at once
+
+        Parameters
+        -------
+        ra: array_like
+            right ascension in radians
+        dec: array_like
+            declination in radians
+        time: array_like
+            geocentric GPS time
+        psi: array_like
+            binary polarisation angle counter-clockwise about the direction of propagation
+        modes: list
+            polarisation modes (e.g. 'plus', 'cross')
+        polarization_tensors: dict, optional
+            Precomputed output of `bilby.gw.utils.get_polarization_tensors_batch`
+
+        Returns
+        -------
+        dict: The antenna response for each mode
+        """
+        if polarization_tensors is None:
+            polarization_tensors = gwutils.get_polarization_tensors_batch(
+                ra, dec, time, psi, modes)
+        return {mode: np.einsum('ij,...ij->...', self.geometry.detector_tensor,
+                                polarization_tensors[mode])
+                for mode in modes}
+
+    def get_detector_response(self, waveform_polarizations, parameters, frequencies=None):
         """ Get the detector response for a particular waveform
 
         Parameters
@@ -289,11 +323,21 @@ class Interferometer(object):
             polarizations of the waveform
         parameters: dict
             parameters describing position and time of arrival of the signal
+        frequencies: array_like, optional
+            The frequencies at which the polarizations are evaluated. If not
+            given, the polarizations are assumed to be evaluated on the full
+            `frequency_array` and the `frequency_mask` is applied.
 
         Returns
         -------
         array_like: A 3x3 array representation of the detector response (signal observed in the interferometer)
         """
+        if frequencies is None:
+            frequencies = self.strain_data.frequency_array[self.strain_data.frequency_mask]
+            mask = self.strain_data.frequency_mask
+        else:
+            mask = np.ones(len(frequencies), dtype=bool)
+
         signal = {}
         for mode in waveform_polarizations.keys():
             det_response = self.antenna_response(
@@ -305,7 +349,7 @@ class Interferometer(object):
             signal[mode] = waveform_polarizations[mode] * det_response
         signal_ifo = sum(signal.values())
 
-        signal_ifo *= self.strain_data.frequency_mask
+        signal_ifo *= mask
 
         time_shift = self.time_delay_from_geocenter(
             parameters['ra'], parameters['dec'], parameters['geocent_time'])
@@ -315,15 +359,137 @@ class Interferometer(object):
         dt_geocent = parameters['geocent_time'] - self.strain_data.start_time
         dt = dt_geocent + time_shift
 
-        signal_ifo[self.strain_data.frequency_mask] = signal_ifo[self.strain_data.frequency_mask] * np.exp(
-            -1j * 2 * np.pi * dt * self.strain_data.frequency_array[self.strain_data.frequency_mask])
+        signal_ifo[mask] = signal_ifo[mask] * np.exp(-1j * 2 * np.pi * dt * frequencies)
 
-        signal_ifo[self.strain_data.frequency_mask] *= self.calibration_model.get_calibration_factor(
-            self.strain_data.frequency_array[self.strain_data.frequency_mask],
-            prefix='recalib_{}_'.format(self.name), **parameters)
+        signal_ifo[mask] *= self.calibration_model.get_calibration_factor(
+            frequencies, prefix='recalib_{}_'.format(self.name), **parameters)
 
         return signal_ifo
 
+    def get_detector_response_inner_products(self, waveform_polarizations, parameters):
+        """ Calculate the noise-weighted inner products of the detector
+        response with the data and with itself
+
+        This is equivalent to passing the output of `get_detector_response`
+        to `inner_product` and `optimal_snr_squared`, but the response is only
+        evaluated in the analysed frequency band, using preallocated buffers
+        and the cached noise-weighted data.
+
+        Parameters
+        -------
+        waveform_polarizations: dict
+            polarizations of the waveform evaluated on the full `frequency_array`
+        parameters: dict
+            parameters describing position and time of arrival of the signal
+
+        Returns
+        -------
+        d_inner_h: complex
+            The inner product of the detector response and the data
+        optimal_snr_squared: float
+            The inner product of the detector response with itself
+        """
+        cache = self._get_inner_product_cache()
+        band = cache['band']
+        frequencies = cache['frequencies']
+        signal = cache['signal_buffer']
+        work = cache['work_buffer']
+
+        for ii, mode in enumerate(waveform_polarizations):
+            det_response = self.antenna_response(
+                parameters['ra'],
+                parameters['dec'],
+                parameters['geocent_time'],
+                parameters['psi'], mode)
+            if ii == 0:
+                np.multiply(waveform_polarizations[mode][band], det_response, out=signal)
+            else:
+                np.multiply(waveform_polarizations[mode][band], det_response, out=work)
+                signal += work
+
+        time_shift = self.time_delay_from_geocenter(
+            parameters['ra'], parameters['dec'], parameters['geocent_time'])
+        dt_geocent = parameters['geocent_time'] - self.strain_data.start_time
+        dt = dt_geocent + time_shift
+
+        np.multiply(frequencies, -1j * 2 * np.pi * dt, out=work)
+        np.exp(work, out=work)
+        signal *= work
+        signal *= self.calibration_model.get_calibration_factor(
+            frequencies, prefix='recalib_{}_'.format(self.name), **parameters)
+
+        d_inner_h = np.vdot(signal, cache['weighted_data'])
+        np.multiply(signal, cache['root_inverse_psd_weights'], out=work)
+        optimal_snr_squared = np.vdot(work, work).real
+        return d_inner_h, optimal_snr_squared
+
+    def _get_inner_product_cache(self):
+        """ The analysed frequency band, noise-weighted data and buffers used
+        by `get_detector_response_inner_products` """
+        return self._get_data_product('inner_product', self._build_inner_product_cache)
+
+    def _build_inner_product_cache(self):
+        band = self.frequency_band
+        frequencies = self.masked_frequency_array
+        inverse_power_spectral_density = self.inverse_power_spectral_density_array[band]
+        duration = self.strain_data.duration
+        return dict(
+            band=band,
+            frequencies=frequencies,
+            weighted_data=(4 / duration * self.strain_data.frequency_domain_strain[band] *
+                           inverse_power_spectral_density),
+            root_inverse_psd_weights=(4 / duration * inverse_power_spectral_density)**0.5,
+            signal_buffer=np.empty(len(frequencies), dtype=complex),
+            work_buffer=np.empty(len(frequencies), dtype=complex))
+
+    def _get_data_product(self, name, function):
+        """ Get a cached quantity derived from the strain data and power
+        spectral density
+
+        All cached quantities are discarded when the strain data, frequency
+        band, window or power spectral density change, as tracked by
+        `InterferometerStrainData.version` and `PowerSpectralDensity.version`.
+
+        Parameters
+        ----------
+        name: str
+            The name of the quantity
+        function: callable
+            Function without arguments computing the quantity
+
+        Returns
+        -------
+        The cached quantity, arrays are returned read-only as they are shared
+        between callers, public properties which return them are read-only or
+        return a copy
+        """
+        if not hasattr(self, '_data_products'):
+            self._data_products = dict()
+            self._data_products_key = None
+        key = (self.strain_data.version, self.power_spectral_density,
+               self.power_spectral_density.version)
+        if self._data_products_key is None or \
+                key[0] != self._data_products_key[0] or \
+                key[1] is not self._data_products_key[1] or \
+                key[2] != self._data_products_key[2]:
+            # evaluating the frequency mask and strain may update the
+            # strain data version if they are generated lazily
+            try:
+                _ = self.strain_data.frequency_domain_strain
+            except ValueError:
+                pass
+            self._data_products = dict()
+            self._data_products_key = (
+                self.strain_data.version, self.power_spectral_density,
+                self.power_spectral_density.version)
+        if name not in self._data_products:
+            value = function()
+            if isinstance(value, np.ndarray):
+                value = value.view()
+                value.setflags(write=False)
+            self._data_products[name] = value
+        return self._data_products[name]
+
     def inject_signal(self, parameters, injection_polarizations=None,
                       waveform_generator=None):
         """ General signal injection method.
@@ -440,10 +606,16 @@ class Interferometer(object):
         array_like: An array representation of the ASD
 
         """
-        return (
-            self.power_spectral_density.get_amplitude_spectral_density_array(
+        return self._amplitude_spectral_density_array.copy()
+
+    @property
+    def _amplitude_spectral_density_array(self):
+        """ The cached, read-only, amplitude spectral density """
+        return self._get_data_product(
+            'amplitude_spectral_density_array',
+            lambda: (self.power_spectral_density.get_amplitude_spectral_density_array(
                 frequency_array=self.strain_data.frequency_array) *
-            self.strain_data.window_factor**0.5)
+                self.strain_data.window_factor**0.5))
 
     @property
     def power_spectral_density_array(self):
@@ -456,10 +628,75 @@ class Interferometer(object):
         array_like: An array representation of the PSD
 
         """
-        return (
-            self.power_spectral_density.get_power_spectral_density_array(
+        return self._power_spectral_density_array.copy()
+
+    @property
+    def _power_spectral_density_array(self):
+        """ The cached, read-only, power spectral density """
+        return self._get_data_product(
+            'power_spectral_density_array',
+            lambda: (self.power_spectral_density.get_power_spectral_density_array(
                 frequency_array=self.strain_data.frequency_array) *
-            self.strain_data.window_factor)
+                self.strain_data.window_factor))
+
+    @property
+    def inverse_power_spectral_density_array(self):
+        """ Returns the inverse of the power spectral density (PSD)
+
+        This accounts for whether the data in the interferometer has been windowed.
+
+        Returns
+        -------
+        array_like: An array representation of the inverse PSD, cached and read-only
+
+        """
+        return self._get_data_product(
+            'inverse_power_spectral_density_array',
+            lambda: 1 / self._power_spectral_density_array)
+
+    @property
+    def frequency_band(self):
+        """ Index of the frequencies being analysed
+
+        This is a slice if the frequency mask is contiguous, otherwise an
+        array of indices.
+
+        Returns
+        -------
+        slice, array_like: The index of the analysed frequencies
+        """
+        return self._get_data_product('frequency_band', self._calculate_frequency_band)
+
+    def _calculate_frequency_band(self):
+        indices = np.where(self.strain_data.frequency_mask)[0]
+        if len(indices) > 0 and indices[-1] - indices[0] + 1 == len(indices):
+            return slice(indices[0], indices[-1] + 1)
+        return indices
+
+    @property
+    def masked_frequency_array(self):
+        """ The frequencies being analysed
+
+        Returns
+        -------
+        array_like: The frequency array with the frequency mask applied, cached and read-only
+        """
+        return self._get_data_product(
+            'masked_frequency_array',
+            lambda: self.strain_data.frequency_array[self.frequency_band])
+
+    @property
+    def noise_weighted_frequency_domain_strain(self):
+        """ The frequency domain strain divided by the power spectral density
+
+        Returns
+        -------
+        array_like: The noise-weighted data, cached and read-only
+        """
+        return self._get_data_product(
+            'noise_weighted_frequency_domain_strain',
+            lambda: (self.strain_data.frequency_domain_strain *
+                     self.inverse_power_spectral_density_array))
 
     def unit_vector_along_arm(self, arm):
         logger.warning("This method has been moved and will be removed in the future."
@@ -487,6 +724,29 @@ class Interferometer(object):
         """
         return gwutils.time_delay_geocentric(self.geometry.vertex, np.array([0, 0, 0]), ra, dec, time)
 
+    def time_delay_from_geocenter_batch(self, ra, dec, time, gmst=None):
+        """
+        Calculate the time delay from the geocenter for the interferometer for
+        many sky locations and times at once
+
+        Parameters
+        -------
+        ra: array_like
+            right ascension of source in radians
+        dec: array_like
+            declination of source in radians
+        time: array_like
+            GPS time, not used if gmst is given
+        gmst: array_like, optional
+            Precomputed Greenwich mean sidereal time in radians
+
+        Returns
+        -------
+        array_like: The time delay from geocenter in seconds
+        """
+        return gwutils.time_delay_geocentric_batch(
+            self.geometry.vertex, np.array([0, 0, 0]), ra, dec, time, gmst=gmst)
+
     def vertex_position_geocentric(self):
         """
         Calculate the position of the IFO vertex in geocentric coordinates in meters.
@@ -516,7 +776,7 @@ class Interferometer(object):
         """
         return gwutils.optimal_snr_squared(
             signal=signal[self.strain_data.frequency_mask],
-            power_spectral_density=self.power_spectral_density_array[self.strain_data.frequency_mask],
+            power_spectral_density=self._power_spectral_density_array[self.strain_data.frequency_mask],
             duration=self.strain_data.duration)
 
     def inner_product(self, signal):
@@ -534,7 +794,7 @@ class Interferometer(object):
         return gwutils.noise_weighted_inner_product(
             aa=signal[self.strain_data.frequency_mask],
             bb=self.strain_data.frequency_domain_strain[self.strain_data.frequency_mask],
-            power_spectral_density=self.power_spectral_density_array[self.strain_data.frequency_mask],
+            power_spectral_density=self._power_spectral_density_array[self.strain_data.frequency_mask],
             duration=self.strain_data.duration)
 
     def matched_filter_snr(self, signal):
@@ -553,7 +813,7 @@ class Interferometer(object):
         return gwutils.matched_filter_snr(
             signal=signal[self.strain_data.frequency_mask],
             frequency_domain_strain=self.strain_data.frequency_domain_strain[self.strain_data.frequency_mask],
-            power_spectral_density=self.power_spectral_density_array[self.strain_data.frequency_mask],
+            power_spectral_density=self._power_spectral_density_array[self.strain_data.frequency_mask],
             duration=self.strain_data.duration)
 
     @property
@@ -564,7 +824,10 @@ class Interferometer(object):
         -------
         array_like: The whitened data
         """
-        return self.strain_data.frequency_domain_strain / self.amplitude_spectral_density_array
+        return self._get_data_product(
+            'whitened_frequency_domain_strain',
+            lambda: (self.strain_data.frequency_domain_strain /
+                     self._amplitude_spectral_density_array)).copy()
 
     def save_data(self, outdir, label=None):
         """ Creates a save file for the data in plain text format
@@ -592,7 +855,7 @@ class Interferometer(object):
         np.savetxt(filename_psd,
                    np.array(
                        [self.strain_data.frequency_array,
-                        self.amplitude_spectral_density_array]).T,
+                        self._amplitude_spectral_density_array]).T,
                    header='f h(f)')
 
     def plot_data(self, signal=None, outdir='.', label=None):
@@ -608,7 +871,7 @@ class Interferometer(object):
                   asd[self.strain_data.frequency_mask],
                   color='C0', label=self.name)
         ax.loglog(self.strain_data.frequency_array[self.strain_data.frequency_mask],
-                  self.amplitude_spectral_density_array[self.strain_data.frequency_mask],
+                  self._amplitude_spectral_density_array[self.strain_data.frequency_mask],
                   color='C1', lw=1.0, label=self.name + ' ASD')
         if signal is not None:
             signal_asd = gwutils.asd_from_freq_series(
@@ -175,6 +175,47 @@ class InterferometerList(list):
         for interferometer in self:
             interferometer.plot_data(signal=signal, outdir=outdir, label=label)
 
+    def antenna_responses_and_time_delays(self, ra, dec, geocent_time, psi,
+                                          modes=('plus', 'cross')):
+        """ Calculate the antenna responses and time delays from the geocenter
+        of all the interferometers for many samples at once
+
+        The Greenwich mean sidereal time is calculated once for each unique
+        time and the polarization tensors are shared between the
+        interferometers.
+
+        Parameters
+        ----------
+        ra: array_like
+            right ascension in radians
+        dec: array_like
+            declination in radians
+        geocent_time: array_like
+            geocentric GPS time
+        psi: array_like
+            binary polarisation angle counter-clockwise about the direction of propagation
+        modes: list
+            polarisation modes (e.g. 'plus', 'cross')
+
+        Returns
+        -------
+        dict: A dictionary keyed by interferometer name, each containing the
+            antenna response for each mode and the `time_delay` from the
+            geocenter
+        """
+        gmst = gwutils.greenwich_mean_sidereal_time(geocent_time)
+        polarization_tensors = gwutils.get_polarization_tensors_batch(
+            ra, dec, geocent_time, psi, modes, gmst=gmst)
+        output = dict()
+        for interferometer in self:
+            output[interferometer.name] = interferometer.antenna_response_batch(
+                ra, dec, geocent_time, psi, modes,
+                polarization_tensors=polarization_tensors)
+            output[interferometer.name]['time_delay'] = \
+                interferometer.time_delay_from_geocenter_batch(
+                    ra, dec, geocent_time, gmst=gmst)
+        return output
+
     @property
     def number_of_interferometers(self):
         return len(self)
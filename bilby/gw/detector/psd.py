@@ -234,6 +234,13 @@ class PowerSpectralDensity(object):
                                                               bounds_error=False,
                                                               fill_value=np.inf)
         self._update_cache(self.frequency_array)
+        self._version = self.version + 1
+
+    @property
+    def version(self):
+        """ A counter which is incremented whenever the spectral density is
+        changed. """
+        return getattr(self, '_version', 0)
 
     def get_power_spectral_density_array(self, frequency_array):
         if not np.array_equal(frequency_array, self._cache['frequency_array']):
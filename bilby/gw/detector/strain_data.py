@@ -30,6 +30,13 @@ class InterferometerStrainData(object):
     frequency_array = PropertyAccessor('_times_and_frequencies', 'frequency_array')
     time_array = PropertyAccessor('_times_and_frequencies', 'time_array')
 
+    # Setting any of these attributes increments the data version
+    _versioned_attributes = (
+        '_frequency_domain_strain', '_time_domain_strain', '_times_and_frequencies',
+        '_frequency_mask', '_minimum_frequency', '_maximum_frequency',
+        'duration', 'sampling_frequency', 'start_time', 'frequency_array',
+        'window_factor', 'roll_off')
+
     def __init__(self, minimum_frequency=0, maximum_frequency=np.inf,
                  roll_off=0.2):
         """ Initiate an InterferometerStrainData object
@@ -77,6 +84,22 @@ class InterferometerStrainData(object):
             return True
         return False
 
+    def __setattr__(self, name, value):
+        super(InterferometerStrainData, self).__setattr__(name, value)
+        if name in self._versioned_attributes:
+            super(InterferometerStrainData, self).__setattr__(
+                '_version', self.version + 1)
+
+    @property
+    def version(self):
+        """ A counter which is incremented whenever the strain data, the time
+        and frequency arrays, the frequency band or the window are changed.
+
+        This can be used to invalidate quantities derived from the data. Note
+        that in-place modification of the underlying arrays is not tracked.
+        """
+        return self.__dict__.get('_version', 0)
+
     def time_within_data(self, time):
         """ Check if time is within the data span
 
@@ -2,8 +2,7 @@ import os
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import cumtrapz, quad
-from scipy.interpolate import interp1d, CubicSpline
-from scipy.optimize import minimize_scalar
+from scipy.interpolate import CubicSpline
 
 from .tov_solver import IntegrateTOV
 from ...core import utils
@@ -640,12 +639,21 @@ class EOSFamily(object):
         eos (`object`): Supply a `TabularEOS` class (or subclass)
         npts (`float`): Number of points to calculate for mass-radius relation.
                         Default is 500.
+        batch_size (`int`): Number of central energy densities to integrate together.
+                            Default is 50.
+        refinement_points (`int`): Number of central energy densities integrated in each
+                                   refinement of the maximum mass. Default is 8.
+        refinement_iterations (`int`): Number of refinements of the maximum mass. Default is 3.
 
     Note:
         The mass-radius and mass-k2 data should be
         populated here via the TOV solver upon object construction.
+        The TOV equations are integrated in batches of central energy densities
+        until the maximum mass is passed, the maximum mass is then found by
+        repeatedly integrating a batch of stars spanning a shrinking bracket
+        around the turning point.
         """
-    def __init__(self, eos, npts=500):
+    def __init__(self, eos, npts=500, batch_size=50, refinement_points=8, refinement_iterations=3):
         self.eos = eos
 
         # FIXME: starting_energy_density is set somewhat arbitrarily
@@ -658,41 +666,35 @@ class EOSFamily(object):
                                               num=npts)
         energy_density_grid = np.exp(log_energy_density_grid)
 
-        # Generate m, r, and k2 lists
-        mass = []
-        radius = []
-        k2love_number = []
-        for i in range(len(energy_density_grid)):
-            tov_solver = IntegrateTOV(self.eos, energy_density_grid[i])
-            m, r, k2 = tov_solver.integrate_TOV()
-            mass.append(m)
-            radius.append(r)
-            k2love_number.append(k2)
+        # Generate m, r, and k2 arrays, a batch at a time until the maximum mass is passed
+        mass = np.array([])
+        radius = np.array([])
+        k2love_number = np.array([])
+        i = npts - 1
+        for start in range(0, npts, batch_size):
+            m, r, k2 = IntegrateTOV(self.eos, energy_density_grid[start:start + batch_size]).integrate_TOV()
+            mass = np.append(mass, m)
+            radius = np.append(radius, r)
+            k2love_number = np.append(k2love_number, k2)
 
             # Check if maximum mass has been found
-            if i > 0 and mass[i] <= mass[i - 1]:
+            turning_points = np.nonzero(np.diff(mass) <= 0)[0]
+            if len(turning_points) > 0:
+                i = turning_points[0] + 1
                 break
 
+        mass = list(mass[:i + 1])
+        radius = list(radius[:i + 1])
+        k2love_number = list(k2love_number[:i + 1])
+
         # If we're not at the end of the array, determine actual maximum mass. Else, assume
         # last point is the maximum mass and proceed.
         if i < (npts - 1):
-            # Now replace ith point with interpolated maximum mass
-            # This is done by interpolating the last three points and then
-            # minimizing the negative of the interpolated function
-            x = [energy_density_grid[i - 2], energy_density_grid[i - 1], energy_density_grid[i]]
-            y = [mass[i - 2], mass[i - 1], mass[i]]
-
-            f = interp1d(x, y, kind='quadratic', bounds_error=False, fill_value='extrapolate')
-
-            res = minimize_scalar(lambda x: -f(x))
-
-            # Integrate max energy density to get maximum mass
-            tov_solver = IntegrateTOV(self.eos, res.x)
-            mfin, rfin, k2fin = tov_solver.integrate_TOV()
-
-            mass[-1] = mfin
-            radius[-1] = rfin
-            k2love_number[-1] = k2fin
+            # Now replace ith point with the maximum mass, found by integrating
+            # batches of stars across a shrinking bracket around the turning point
+            mass[-1], radius[-1], k2love_number[-1] = self.__refine_maximum_mass(
+                energy_density_grid[i - 2:i + 1], mass[i - 2:], radius[i - 2:], k2love_number[i - 2:],
+                refinement_points, refinement_iterations)
 
         # Currently, everything is in geometerized units.
         # The mass variables have dimensions of length, k2 is dimensionless
@@ -703,9 +705,9 @@ class EOSFamily(object):
         tidal_deformability = [2. / 3. * k2 * r ** 5. / m ** 5. for k2, r, m in
                                zip(k2love_number, radius, mass)]
 
-        # As a last resort, if highest mass is still smaller than second
+        # As a last resort, if highest mass is still not larger than second
         # to last point, remove the last point from each array
-        if mass[-1] < mass[-2]:
+        if mass[-1] <= mass[-2]:
             mass = mass[:-1]
             radius = radius[:-1]
             k2love_number = k2love_number[:-1]
@@ -717,25 +719,50 @@ class EOSFamily(object):
         self.tidal_deformability = np.array(tidal_deformability)
         self.maximum_mass = mass[-1] * conversion_dict['mass']['m_sol']
 
+        self._radius_spline = CubicSpline(self.mass, self.radius, bc_type='natural', extrapolate=True)
+        self._k2_spline = CubicSpline(self.mass, self.k2love_number, bc_type='natural', extrapolate=True)
+
+    def __refine_maximum_mass(self, energy_density, mass, radius, k2love_number, npts, iterations):
+        """
+        Find the star with the maximum mass given three stars bracketing it
+
+        :param energy_density: central energy densities of the bracketing stars
+        :param mass: masses of the bracketing stars, the middle one being the most massive
+        :param radius: radii of the bracketing stars
+        :param k2love_number: k2-love numbers of the bracketing stars
+        :param npts: number of stars to integrate in each iteration
+        :param iterations: number of times to shrink the bracket
+        :return: mass, radius and k2-love number of the most massive star found
+        """
+        energy_density = np.array(energy_density)
+        stars = np.array([mass, radius, k2love_number])
+        for _ in range(iterations):
+            j = np.argmax(stars[0])
+            lower = energy_density[max(j - 1, 0)]
+            upper = energy_density[min(j + 1, len(energy_density) - 1)]
+            trial = np.linspace(lower, upper, npts + 2)[1:-1]
+            energy_density = np.append(energy_density, trial)
+            stars = np.append(stars, np.array(IntegrateTOV(self.eos, trial).integrate_TOV()), axis=1)
+            order = np.argsort(energy_density)
+            energy_density = energy_density[order]
+            stars = stars[:, order]
+        return tuple(stars[:, np.argmax(stars[0])])
+
     def radius_from_mass(self, m):
         """
         :param m: mass of neutron star in solar masses
         :return: radius of neutron star in meters
         """
-        f = CubicSpline(self.mass, self.radius, bc_type='natural', extrapolate=True)
-
         mass_converted_to_geom = m * MSUN_SI * G_SI / C_SI ** 2.
-        return f(mass_converted_to_geom)
+        return self._radius_spline(mass_converted_to_geom)
 
     def k2_from_mass(self, m):
         """
         :param m: mass of neutron star in solar masses.
         :return: dimensionless second tidal love number.
         """
-        f = CubicSpline(self.mass, self.k2love_number, bc_type='natural', extrapolate=True)
-
         m_geom = m * MSUN_SI * G_SI / C_SI ** 2.
-        return f(m_geom)
+        return self._k2_spline(m_geom)
 
     def lambda_from_mass(self, m):
         """
@@ -7,6 +7,9 @@ from scipy.integrate import solve_ivp
 class IntegrateTOV:
     """Class that given an initial pressure a mass radius value and a k2-love number
 
+    If an array of central energy densities is given, all of the corresponding stars are integrated together and
+    arrays of masses, radii and k2-love numbers are returned.
+
     Attributes:
         eos (:obj:): .
         attr2 (:obj:`int`, optional): Description of `attr2`.
@@ -130,21 +133,42 @@ class IntegrateTOV:
 
         return num / denom
 
-    def integrate_TOV(self):
+    def __integrate_batch(self, rel_err, abs_err):
         """
-        Evolves TOV+k2 equations and returns final quantities
+        Evolve the TOV+k2 equations for several central values at once
+
+        Each star is integrated along its own line h = h_0 + t * (1e-16 - h_0) with t running from 0 to 1, so
+        that all of the stars share a single integration with a vectorised right hand side. The relative
+        tolerance is reduced by the square root of the number of equations so that the root-mean-square error
+        estimate used for step size control bounds the error in each individual star.
         """
+        shape = self.y.shape
+        span = 1e-16 - self.pseudo_enthalpy
 
-        # integration settings the same as in lalsimulation
-        rel_err = 1e-4
-        abs_err = 0.0
+        def batch_eqns(t, y):
+            h = self.pseudo_enthalpy + t * span
+            return (self.__tov_eqns(h, y.reshape(shape)) * span).ravel()
 
-        result = solve_ivp(self.__tov_eqns, (self.pseudo_enthalpy, 1e-16), self.y, rtol=rel_err,
+        result = solve_ivp(batch_eqns, (0., 1.), self.y.ravel(), rtol=rel_err / np.sqrt(self.y.size),
                            atol=abs_err)
-        m_fin = result.y[0, -1]
-        r_fin = result.y[1, -1]
-        H_fin = result.y[2, -1]
-        B_fin = result.y[3, -1]
+        return result.y[:, -1].reshape(shape)
+
+    def integrate_TOV(self, rel_err=1e-4, abs_err=0.0):
+        """
+        Evolves TOV+k2 equations and returns final quantities
+
+        The default integration settings are the same as in lalsimulation.
+        """
+
+        if self.y.ndim == 1:
+            result = solve_ivp(self.__tov_eqns, (self.pseudo_enthalpy, 1e-16), self.y, rtol=rel_err,
+                               atol=abs_err)
+            m_fin = result.y[0, -1]
+            r_fin = result.y[1, -1]
+            H_fin = result.y[2, -1]
+            B_fin = result.y[3, -1]
+        else:
+            m_fin, r_fin, H_fin, B_fin = self.__integrate_batch(rel_err, abs_err)
 
         k_2 = self.__calc_k2(r_fin, B_fin, H_fin, m_fin / r_fin)
 
@@ -1,34 +1,366 @@
 from __future__ import division
 
-import gc
+import hashlib
 import os
 import json
 import copy
+import shutil
+import tempfile
 
 import numpy as np
 import scipy.integrate as integrate
-from scipy.interpolate import interp1d
 
 try:
     from scipy.special import logsumexp
 except ImportError:
     from scipy.misc import logsumexp
-from scipy.special import i0e
 
 from ..core.likelihood import Likelihood
 from ..core.utils import BilbyJsonEncoder, decode_bilby_json
 from ..core.utils import (
-    logger, UnsortedInterp2d, create_frequency_series, create_time_series,
-    speed_of_light, radius_of_earth)
+    logger, UnsortedInterp2d, create_frequency_series,
+    speed_of_light, radius_of_earth, solar_mass, gravitational_constant,
+    atomic_savez, file_lock)
 from ..core.prior import Interped, Prior, Uniform
 from .detector import InterferometerList, get_empty_interferometer
 from .prior import BBHPriorDict, CBCPriorDict, Cosmological
 from .source import lal_binary_black_hole
 from .utils import (
-    noise_weighted_inner_product, build_roq_weights, blockwise_dot_product,
-    zenith_azimuth_to_ra_dec)
+    noise_weighted_inner_product, zenith_azimuth_to_ra_dec, ln_i0,
+    greenwich_mean_sidereal_time, get_polarization_tensors_batch)
 from .waveform_generator import WaveformGenerator
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+
+_lookup_table_dump = dict()
+
+
+def _cache_directory():
+    """ The shared directory used to cache lookup tables and ROQ weights
+
+    This is given by the BILBY_CACHE_DIR environment variable, defaulting to
+    ~/.cache/bilby. If the directory cannot be created the current directory
+    is used.
+    """
+    directory = os.environ.get(
+        'BILBY_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'bilby'))
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        logger.debug('Unable to create cache directory {}'.format(directory))
+        directory = '.'
+    return directory
+
+
+_ROQ_WEIGHTS_CACHE_VERSION = 1
+
+
+def _hash_array(array):
+    """ A hash of the dtype, shape and contents of an array """
+    array = np.ascontiguousarray(array)
+    sha = hashlib.sha256()
+    sha.update(str((array.dtype.str, array.shape)).encode())
+    sha.update(array.tobytes())
+    return sha.hexdigest()
+
+
+def _basis_identifier(matrix):
+    """ Identify an ROQ basis without reading it if it is stored in a file
+
+    Files are identified by their absolute path, size and modification time,
+    arrays by a hash of their contents.
+    """
+    if isinstance(matrix, str):
+        stat = os.stat(matrix)
+        return '{}:{}:{}'.format(
+            os.path.abspath(matrix), stat.st_size, stat.st_mtime_ns)
+    elif matrix is None:
+        return None
+    return _hash_array(matrix)
+
+
+def _write_weights_directory(directory, weights, manifest):
+    """ Write ROQ weights as a directory of uncompressed `.npy` files
+
+    The files are written to a temporary directory which is then renamed,
+    so readers never see partially written weights.
+
+    Parameters
+    ----------
+    directory: str
+        The directory to write to, replaced if it exists
+    weights: dict
+        The weights
+    manifest: dict
+        Information stored alongside the weights in `manifest.json`
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    temp_directory = tempfile.mkdtemp(dir=parent)
+    for key, value in weights.items():
+        np.save(os.path.join(temp_directory, '{}.npy'.format(key)), value)
+    manifest = dict(manifest, keys=sorted(weights.keys()))
+    with open(os.path.join(temp_directory, 'manifest.json'), 'w') as file:
+        json.dump(manifest, file, indent=2)
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.replace(temp_directory, directory)
+
+
+def _read_weights_directory(directory):
+    """ Read ROQ weights written by `_write_weights_directory`
+
+    The arrays are opened read-only and memory-mapped, so processes using
+    the same weights share them through the page cache.
+
+    Returns
+    -------
+    weights: dict
+        The weights
+    manifest: dict
+        The manifest stored with the weights
+    """
+    with open(os.path.join(directory, 'manifest.json'), 'r') as file:
+        manifest = json.load(file)
+    weights = {
+        key: np.load(os.path.join(directory, '{}.npy'.format(key)), mmap_mode='r')
+        for key in manifest['keys']}
+    return weights, manifest
+
+
+def _initialize_lookup_table_globals(d_inner_h_array, distance_factor, prior_weights):
+    """ Store the arrays shared by all rows of the lookup table, this is
+    passed to the multiprocessing pool initializer. """
+    _lookup_table_dump['d_inner_h_array'] = d_inner_h_array
+    _lookup_table_dump['distance_factor'] = distance_factor
+    _lookup_table_dump['prior_weights'] = prior_weights
+
+
+def _lookup_table_rows(optimal_snr_squared_refs):
+    """ Compute the rows of the lookup table for the given reference optimal
+    SNRs squared using the globally stored arrays. """
+    d_inner_h_array = _lookup_table_dump['d_inner_h_array']
+    distance_factor = _lookup_table_dump['distance_factor']
+    prior_weights = _lookup_table_dump['prior_weights']
+    rows = np.empty((len(optimal_snr_squared_refs), len(d_inner_h_array)))
+    work = np.empty(d_inner_h_array.shape)
+    with np.errstate(invalid='ignore'):
+        for ii, optimal_snr_squared_ref in enumerate(optimal_snr_squared_refs):
+            # logsumexp over the distance axis using a preallocated buffer
+            np.multiply(distance_factor, -optimal_snr_squared_ref, out=work[0])
+            np.add(d_inner_h_array, work[0], out=work)
+            max_values = np.max(work, axis=-1)
+            np.subtract(work, max_values[:, np.newaxis], out=work)
+            np.exp(work, out=work)
+            with np.errstate(divide='ignore'):
+                rows[ii] = np.log(np.dot(work, prior_weights)) + max_values
+    return rows
+
+
+def _build_distance_lookup_table(
+        optimal_snr_squared_ref_array, d_inner_h_ref_array, distance_array,
+        prior_array, bessel_function=None, npool=1):
+    """ Build the distance marginalised log-likelihood lookup table
+
+    The matched filter SNR (and phase marginalisation) term is evaluated
+    once for the whole grid, each row then needs a single vectorised
+    logsumexp over the distance array. Rows are shared between processes
+    when npool > 1.
+
+    Parameters
+    ----------
+    optimal_snr_squared_ref_array, d_inner_h_ref_array: array_like
+        The optimal SNR squared and matched filter SNR at the reference
+        (smallest) distance, defining the rows and columns of the table
+    distance_array, prior_array: array_like
+        The (uniformly spaced) distances and the distance prior
+    bessel_function: callable, optional
+        If given, the log of the phase marginalised likelihood as a function
+        of the absolute matched filter SNR
+    npool: int
+        The number of processes to use
+
+    Returns
+    -------
+    lookup_table: array_like
+        The normalised distance marginalised log-likelihood with shape
+        (len(optimal_snr_squared_ref_array), len(d_inner_h_ref_array))
+    """
+    reference_distance = distance_array[0]
+    delta_distance = distance_array[1] - distance_array[0]
+    prior_weights = prior_array * delta_distance
+    d_inner_h_array = np.outer(d_inner_h_ref_array, reference_distance / distance_array)
+    if bessel_function is not None:
+        d_inner_h_array = bessel_function(abs(d_inner_h_array))
+    distance_factor = reference_distance ** 2. / distance_array ** 2 / 2
+    initargs = (d_inner_h_array, distance_factor, prior_weights)
+    chunks = np.array_split(
+        optimal_snr_squared_ref_array,
+        min(len(optimal_snr_squared_ref_array), max(npool, 1) * 4))
+    if npool > 1:
+        import multiprocessing
+        with multiprocessing.Pool(
+                npool, initializer=_initialize_lookup_table_globals,
+                initargs=initargs) as pool:
+            rows = pool.map(_lookup_table_rows, chunks)
+    else:
+        _initialize_lookup_table_globals(*initargs)
+        rows = [_lookup_table_rows(chunk) for chunk in chunks]
+    _lookup_table_dump.clear()
+    log_norm = logsumexp(0. / distance_array, b=prior_weights)
+    return np.vstack(rows) - log_norm
+
+
+def _setup_pruned_fft(n_values, n_window):
+    """
+    Precompute the twiddle factors for an output-pruned FFT
+
+    The input is split into `n_values / length` interleaved sub-sequences of
+    length `length`, each of which is transformed with a `length`-point FFT.
+    The outputs in the window are then recombined using the twiddle factors.
+    This is cheaper than the full FFT when the window is much shorter than
+    the input.
+
+    Parameters
+    ----------
+    n_values: int
+        The length of the input to the FFT
+    n_window: int
+        The number of consecutive outputs required
+
+    Returns
+    -------
+    length: int
+        The length of the sub-sequence FFTs, None if the full FFT should be
+        used.
+    twiddle: array_like
+        The twiddle factors for the outputs `0, ..., n_window - 1`, None if
+        the full FFT should be used.
+    """
+    if n_window >= n_values:
+        return None, None
+    length = 2 ** int(np.ceil(np.log2(2 * n_window)))
+    if n_values % length != 0 or length > n_values // 4:
+        return None, None
+    twiddle = np.exp(-2j * np.pi * np.outer(
+        np.arange(n_values // length), np.arange(n_window)) / n_values)
+    return length, twiddle
+
+
+def _pruned_fft(values, start, n_window, length=None, twiddle=None):
+    """
+    Evaluate the FFT of `values` at `n_window` consecutive indices
+
+    Parameters
+    ----------
+    values: array_like
+        The input to the FFT
+    start: int
+        The first output index, indices past the end of the output wrap
+        around.
+    n_window: int
+        The number of outputs
+    length, twiddle:
+        The output of `_setup_pruned_fft`, if None the full FFT is used.
+
+    Returns
+    -------
+    array_like: The FFT of `values` at indices `start, ..., start + n_window - 1`
+    """
+    n_values = len(values)
+    indices = (start + np.arange(n_window)) % n_values
+    if length is None:
+        return np.fft.fft(values)[indices]
+    n_sub = n_values // length
+    sub_ffts = np.fft.fft(values.reshape(length, n_sub).T, axis=1)
+    shift = np.exp(-2j * np.pi * np.arange(n_sub) * start / n_values)
+    return np.einsum(
+        'ij,ij,i->j', sub_ffts[:, indices % length], twiddle, shift)
+
+
+def _draw_from_gridded_posteriors(grid, posteriors, uniforms, keep=None):
+    """
+    Draw one sample from each of a set of posteriors tabulated on a grid
+
+    The posteriors are linearly interpolated between the grid points and
+    sampled by inverting the cumulative distribution, as for
+    `bilby.core.prior.Interped`.
+
+    Parameters
+    ----------
+    grid: array_like
+        The sorted grid of parameter values, shape `(n_grid,)`
+    posteriors: array_like
+        The unnormalised posteriors, shape `(n_samples, n_grid)`
+    uniforms: array_like
+        Uniform random numbers, shape `(n_samples,)`
+    keep: array_like, optional
+        Boolean array with the same shape as `posteriors`, intervals with
+        either end not kept are given no weight.
+
+    Returns
+    -------
+    array_like: The samples, shape `(n_samples,)`
+    """
+    posteriors = np.atleast_2d(posteriors)
+    widths = np.diff(grid)
+    weights = (posteriors[:, 1:] + posteriors[:, :-1]) / 2 * widths
+    if keep is not None:
+        keep = np.atleast_2d(keep)
+        weights *= keep[:, 1:] & keep[:, :-1]
+    cumulative = np.cumsum(weights, axis=1)
+    targets = np.asarray(uniforms) * cumulative[:, -1]
+    idxs = np.minimum(
+        np.sum(cumulative < targets[:, np.newaxis], axis=1), len(widths) - 1)
+    rows = np.arange(len(idxs))
+    interval_weights = weights[rows, idxs]
+    fractions = np.zeros(len(idxs))
+    nonzero = interval_weights > 0
+    fractions[nonzero] = (
+        targets[nonzero] - cumulative[rows, idxs][nonzero] +
+        interval_weights[nonzero]) / interval_weights[nonzero]
+    return grid[idxs] + fractions * widths[idxs]
+
+
+# Coefficients of the cubic polynomials in the offset from the left end of
+# the interval giving the weights of the not-a-knot cubic spline through five
+# equally spaced points, for the intervals either side of the central point
+_FIVE_POINT_SPLINE_COEFFICIENTS = np.array([
+    [[-5 / 24, 1 / 2, -7 / 24, 0],
+     [2 / 3, -1, -2 / 3, 1],
+     [-3 / 4, 1 / 2, 5 / 4, 0],
+     [1 / 3, 0, -1 / 3, 0],
+     [-1 / 24, 0, 1 / 24, 0]],
+    [[1 / 24, -1 / 8, 1 / 12, 0],
+     [-1 / 3, 1, -2 / 3, 0],
+     [3 / 4, -7 / 4, 0, 1],
+     [-2 / 3, 1, 2 / 3, 0],
+     [5 / 24, -1 / 8, -1 / 12, 0]]])
+
+
+def _five_point_spline_weights(offset):
+    """
+    The weights of the values at five equally spaced points in the
+    not-a-knot cubic spline through them, as used by
+    `scipy.interpolate.interp1d(kind='cubic')`
+
+    Parameters
+    ----------
+    offset: float
+        The point at which to evaluate the spline in units of the spacing
+        relative to the central point, between -1 and 1
+
+    Returns
+    -------
+    array_like: The five weights
+    """
+    if offset < 0:
+        coefficients = _FIVE_POINT_SPLINE_COEFFICIENTS[0]
+        offset += 1
+    else:
+        coefficients = _FIVE_POINT_SPLINE_COEFFICIENTS[1]
+    return np.dot(coefficients, [offset ** 3, offset ** 2, offset, 1])
 
 
 class GravitationalWaveTransient(Likelihood):
@@ -56,7 +388,7 @@ class GravitationalWaveTransient(Likelihood):
     time_marginalization: bool, optional
         If true, marginalize over time in the likelihood.
         This uses a FFT to calculate the likelihood over a regularly spaced
-        grid.
+        grid, restricted to the support of the `geocent_time` prior.
         In order to cover the whole space the prior is set to be uniform over
         the spacing of the array of times.
         If using time marginalisation and jitter_time is True a "jitter"
@@ -74,8 +406,15 @@ class GravitationalWaveTransient(Likelihood):
         the table.
         If a string the name of a file containing these quantities.
         The lookup table is stored after construction in either the
-        provided string or a default location:
-        '.distance_marginalization_lookup_dmin{}_dmax{}_n{}.npz'
+        provided string or a shared cache directory (given by the
+        BILBY_CACHE_DIR environment variable, default ~/.cache/bilby) with
+        a file name containing a hash of the distance and prior arrays.
+    lookup_table_shape: tuple, optional
+        The number of optimal SNR and matched filter SNR points in the
+        distance marginalisation lookup table, default=(400, 800).
+    npool: int, optional
+        The number of processes used to build the distance marginalisation
+        lookup table, default=1.
     jitter_time: bool, optional
         Whether to introduce a `time_jitter` parameter. This avoids either
         missing the likelihood peak, or introducing biases in the
@@ -112,7 +451,8 @@ class GravitationalWaveTransient(Likelihood):
         self, interferometers, waveform_generator, time_marginalization=False,
         distance_marginalization=False, phase_marginalization=False, priors=None,
         distance_marginalization_lookup_table=None, jitter_time=True,
-        reference_frame="sky", time_reference="geocenter"
+        reference_frame="sky", time_reference="geocenter",
+        lookup_table_shape=(400, 800), npool=1
     ):
 
         self.waveform_generator = waveform_generator
@@ -124,6 +464,7 @@ class GravitationalWaveTransient(Likelihood):
         self.priors = priors
         self._check_set_duration_and_sampling_frequency_of_waveform_generator()
         self.jitter_time = jitter_time
+        self._time_reconstruction = None
         self.reference_frame = reference_frame
         if "geocent" not in time_reference:
             self.time_reference = time_reference
@@ -153,13 +494,13 @@ class GravitationalWaveTransient(Likelihood):
 
         if self.phase_marginalization:
             self._check_marginalized_prior_is_set(key='phase')
-            self._bessel_function_interped = None
-            self._setup_phase_marginalization()
             priors['phase'] = float(0)
             self._marginalized_parameters.append('phase')
 
         if self.distance_marginalization:
             self._lookup_table_filename = None
+            self._lookup_table_shape = tuple(lookup_table_shape)
+            self._lookup_table_npool = npool
             self._check_marginalized_prior_is_set(key='luminosity_distance')
             self._distance_array = np.linspace(
                 self.priors['luminosity_distance'].minimum,
@@ -214,20 +555,21 @@ class GravitationalWaveTransient(Likelihood):
             The bilby interferometer object
 
         """
-        signal = interferometer.get_detector_response(
-            waveform_polarizations, self.parameters)
-        d_inner_h = interferometer.inner_product(signal=signal)
-        optimal_snr_squared = interferometer.optimal_snr_squared(signal=signal)
-        complex_matched_filter_snr = d_inner_h / (optimal_snr_squared**0.5)
-
         if self.time_marginalization:
+            signal = interferometer.get_detector_response(
+                waveform_polarizations, self.parameters)
+            d_inner_h = interferometer.inner_product(signal=signal)
+            optimal_snr_squared = interferometer.optimal_snr_squared(signal=signal)
             d_inner_h_squared_tc_array =\
-                4 / self.waveform_generator.duration * np.fft.fft(
+                4 / self.waveform_generator.duration * self._windowed_fft(
                     signal[0:-1] *
-                    interferometer.frequency_domain_strain.conjugate()[0:-1] /
-                    interferometer.power_spectral_density_array[0:-1])
+                    interferometer.noise_weighted_frequency_domain_strain.conjugate()[0:-1])
         else:
+            d_inner_h, optimal_snr_squared = \
+                interferometer.get_detector_response_inner_products(
+                    waveform_polarizations, self.parameters)
             d_inner_h_squared_tc_array = None
+        complex_matched_filter_snr = d_inner_h / (optimal_snr_squared**0.5)
 
         return self._CalculatedSNRs(
             d_inner_h=d_inner_h, optimal_snr_squared=optimal_snr_squared,
@@ -303,8 +645,7 @@ class GravitationalWaveTransient(Likelihood):
             if self.jitter_time:
                 self.parameters['geocent_time'] += self.parameters['time_jitter']
             d_inner_h_tc_array = np.zeros(
-                self.interferometers.frequency_array[0:-1].shape,
-                dtype=np.complex128)
+                self._times[self._time_window].shape, dtype=np.complex128)
 
         for interferometer in self.interferometers:
             per_detector_snr = self.calculate_snrs(
@@ -376,6 +717,95 @@ class GravitationalWaveTransient(Likelihood):
             self.parameters['phase'] = new_phase
         return self.parameters.copy()
 
+    def reconstruct_marginalized_parameters(self, samples, uniforms=None):
+        """
+        Reconstruct the marginalised parameters for a block of samples
+
+        The time posterior is computed per sample on a grid covering the
+        time prior. The distance and phase posteriors are then computed for
+        the whole block at once and sampled by inverting their cumulative
+        distributions.
+
+        See Eq. (C29-C32) of https://arxiv.org/abs/1809.02293
+
+        Parameters
+        ----------
+        samples: dict
+            Dictionary of arrays of posterior samples from a run with a
+            marginalised likelihood.
+        uniforms: array_like, optional
+            Uniform random numbers with shape `(n_samples, 3)` used to draw
+            the time, distance and phase. If not given, these are drawn.
+
+        Returns
+        -------
+        new_samples: dict
+            Dictionary containing arrays of the `geocent_time`,
+            `luminosity_distance` and `phase` samples.
+        """
+        keys = list(samples.keys())
+        n_samples = len(samples[keys[0]])
+        if uniforms is None:
+            uniforms = np.random.uniform(0, 1, (n_samples, 3))
+        new_samples = dict(
+            geocent_time=np.zeros(n_samples),
+            luminosity_distance=np.zeros(n_samples),
+            phase=np.zeros(n_samples))
+        d_inner_h = np.zeros(n_samples, dtype=complex)
+        h_inner_h = np.zeros(n_samples)
+
+        for ii in range(n_samples):
+            self.parameters.update({key: samples[key][ii] for key in keys})
+            self.parameters.update(self.get_sky_frame_parameters())
+            signal_polarizations = \
+                self.waveform_generator.frequency_domain_strain(self.parameters)
+            if self.time_marginalization:
+                if self.jitter_time:
+                    self.parameters['geocent_time'] += self.parameters['time_jitter']
+                self.parameters['geocent_time'] = \
+                    self._draw_time_from_marginalized_likelihood(
+                        signal_polarizations=signal_polarizations,
+                        uniform=uniforms[ii, 0])
+            for key in new_samples:
+                new_samples[key][ii] = self.parameters[key]
+            if self.distance_marginalization or self.phase_marginalization:
+                d_inner_h[ii], optimal_snr_squared = \
+                    self._calculate_inner_products(signal_polarizations)
+                h_inner_h[ii] = np.real(optimal_snr_squared)
+
+        if self.distance_marginalization:
+            distance_ratios = (
+                new_samples['luminosity_distance'][:, np.newaxis] /
+                self._distance_array)
+            d_inner_h_dist = d_inner_h[:, np.newaxis] * distance_ratios
+            h_inner_h_dist = h_inner_h[:, np.newaxis] * distance_ratios ** 2
+            if self.phase_marginalization:
+                distance_log_like = (
+                    ln_i0(abs(d_inner_h_dist)) - h_inner_h_dist / 2)
+            else:
+                distance_log_like = d_inner_h_dist.real - h_inner_h_dist / 2
+            distance_post = np.exp(
+                distance_log_like -
+                np.max(distance_log_like, axis=1)[:, np.newaxis])
+            distance_post *= self.distance_prior_array
+            new_distances = _draw_from_gridded_posteriors(
+                self._distance_array, distance_post, uniforms[:, 1])
+            distance_ratios = new_samples['luminosity_distance'] / new_distances
+            d_inner_h *= distance_ratios
+            h_inner_h *= distance_ratios ** 2
+            new_samples['luminosity_distance'] = new_distances
+
+        if self.phase_marginalization:
+            phases = np.linspace(0, 2 * np.pi, 101)
+            phase_log_post = np.real(
+                d_inner_h[:, np.newaxis] * np.exp(-2j * phases))
+            phase_post = np.exp(
+                phase_log_post - np.max(phase_log_post, axis=1)[:, np.newaxis])
+            new_samples['phase'] = _draw_from_gridded_posteriors(
+                phases, phase_post, uniforms[:, 2])
+
+        return new_samples
+
     def generate_time_sample_from_marginalized_likelihood(
             self, signal_polarizations=None):
         """
@@ -402,56 +832,110 @@ class GravitationalWaveTransient(Likelihood):
         if signal_polarizations is None:
             signal_polarizations = \
                 self.waveform_generator.frequency_domain_strain(self.parameters)
+        return self._draw_time_from_marginalized_likelihood(
+            signal_polarizations=signal_polarizations,
+            uniform=np.random.uniform(0, 1))
+
+    def _setup_time_reconstruction(self):
+        """
+        Precompute the quantities needed to reconstruct the time posterior
+
+        The time posterior is evaluated on a grid upsampled to 16384 Hz
+        which only covers the `geocent_time` prior, the zero-padded
+        noise-weighted data for each interferometer is stored to avoid
+        recomputing it for every sample.
+        """
+        sampling_frequency = 16384
+        duration = self.waveform_generator.duration
+        n_time_steps = int(duration * sampling_frequency)
+        prior = self.priors['geocent_time']
+        n_window = min(int(np.ceil(
+            min(prior.maximum - prior.minimum, duration) * sampling_frequency)) + 2,
+            n_time_steps)
+        length, twiddle = _setup_pruned_fft(
+            n_values=n_time_steps, n_window=n_window)
+        weighted_data = dict()
+        for ifo in self.interferometers:
+            mask = ifo.frequency_mask
+            data = np.zeros(len(mask), dtype=complex)
+            data[mask] = (
+                4 / duration * np.conj(ifo.frequency_domain_strain[mask]) /
+                ifo.power_spectral_density_array[mask])
+            weighted_data[ifo.name] = data
+        self._time_reconstruction = dict(
+            sampling_frequency=sampling_frequency, n_window=n_window,
+            length=length, twiddle=twiddle, weighted_data=weighted_data,
+            buffer=np.zeros(n_time_steps, dtype=complex))
+
+    def _draw_time_from_marginalized_likelihood(self, signal_polarizations, uniform):
+        """
+        Draw a time sample on the upsampled grid covering the time prior
+
+        Parameters
+        ----------
+        signal_polarizations: dict
+            Polarizations modes of the template.
+        uniform: float
+            A uniform random number used to draw the sample.
 
-        times = create_time_series(
-            sampling_frequency=16384,
-            starting_time=self.parameters['geocent_time'] - self.waveform_generator.start_time,
-            duration=self.waveform_generator.duration)
-        times = times % self.waveform_generator.duration
-        times += self.waveform_generator.start_time
+        Returns
+        -------
+        new_time: float
+            Sample from the time posterior.
+        """
+        if self._time_reconstruction is None:
+            self._setup_time_reconstruction()
+        setup = self._time_reconstruction
+        sampling_frequency = setup['sampling_frequency']
+        n_window = setup['n_window']
+        buffer = setup['buffer']
+        start_time = self.waveform_generator.start_time
+        duration = self.waveform_generator.duration
+        offset = self.parameters['geocent_time'] - start_time
 
         prior = self.priors["geocent_time"]
+        start = 0
+        if np.isfinite(prior.minimum):
+            start = int(np.ceil(
+                ((prior.minimum - start_time - offset) % duration) *
+                sampling_frequency)) - 1
+        time_shifts = offset + (start + np.arange(n_window)) / sampling_frequency
+        times = time_shifts % duration + start_time
         in_prior = (times >= prior.minimum) & (times < prior.maximum)
-        times = times[in_prior]
-
-        n_time_steps = int(self.waveform_generator.duration * 16384)
-        d_inner_h = np.zeros(len(times), dtype=np.complex)
-        psd = np.ones(n_time_steps)
-        signal_long = np.zeros(n_time_steps, dtype=np.complex)
-        data = np.zeros(n_time_steps, dtype=np.complex)
-        h_inner_h = np.zeros(1)
+
+        d_inner_h = np.zeros(n_window, dtype=complex)
+        h_inner_h = 0.
         for ifo in self.interferometers:
-            ifo_length = len(ifo.frequency_domain_strain)
-            mask = ifo.frequency_mask
             signal = ifo.get_detector_response(
                 signal_polarizations, self.parameters)
-            signal_long[:ifo_length] = signal
-            data[:ifo_length] = np.conj(ifo.frequency_domain_strain)
-            psd[:ifo_length][mask] = ifo.power_spectral_density_array[mask]
-            d_inner_h += np.fft.fft(signal_long * data / psd)[in_prior]
+            ifo_length = len(signal)
+            np.multiply(
+                signal, setup['weighted_data'][ifo.name], out=buffer[:ifo_length])
+            d_inner_h += _pruned_fft(
+                buffer, start=start, n_window=n_window,
+                length=setup['length'], twiddle=setup['twiddle'])
             h_inner_h += ifo.optimal_snr_squared(signal=signal).real
 
         if self.distance_marginalization:
             time_log_like = self.distance_marginalized_likelihood(
                 d_inner_h, h_inner_h)
         elif self.phase_marginalization:
-            time_log_like = (self._bessel_function_interped(abs(d_inner_h)) -
-                             h_inner_h.real / 2)
+            time_log_like = (ln_i0(abs(d_inner_h)) - h_inner_h / 2)
         else:
-            time_log_like = (d_inner_h.real - h_inner_h.real / 2)
+            time_log_like = (d_inner_h.real - h_inner_h / 2)
 
-        time_prior_array = self.priors['geocent_time'].prob(times)
+        time_prior_array = self.priors['geocent_time'].prob(times) * in_prior
         time_post = (
-            np.exp(time_log_like - max(time_log_like)) * time_prior_array)
+            np.exp(time_log_like - np.max(time_log_like[in_prior])) *
+            time_prior_array)
 
-        keep = (time_post > max(time_post) / 1000)
-        if sum(keep) < 3:
+        keep = (time_post > np.max(time_post) / 1000)
+        if np.sum(keep) < 3:
             keep[1:-1] = keep[1:-1] | keep[2:] | keep[:-2]
-        time_post = time_post[keep]
-        times = times[keep]
 
-        new_time = Interped(times, time_post).sample()
-        return new_time
+        new_time_shift = _draw_from_gridded_posteriors(
+            time_shifts, time_post, [uniform], keep=keep)[0]
+        return new_time_shift % duration + start_time
 
     def generate_distance_sample_from_marginalized_likelihood(
             self, signal_polarizations=None):
@@ -490,7 +974,7 @@ class GravitationalWaveTransient(Likelihood):
 
         if self.phase_marginalization:
             distance_log_like = (
-                self._bessel_function_interped(abs(d_inner_h_dist)) -
+                ln_i0(abs(d_inner_h_dist)) -
                 h_inner_h_dist.real / 2)
         else:
             distance_log_like = (d_inner_h_dist.real - h_inner_h_dist.real / 2)
@@ -561,7 +1045,7 @@ class GravitationalWaveTransient(Likelihood):
             d_inner_h_ref, h_inner_h_ref)
 
     def phase_marginalized_likelihood(self, d_inner_h, h_inner_h):
-        d_inner_h = self._bessel_function_interped(abs(d_inner_h))
+        d_inner_h = ln_i0(abs(d_inner_h))
         return d_inner_h - h_inner_h / 2
 
     def time_marginalized_likelihood(self, d_inner_h_tc_array, h_inner_h):
@@ -574,9 +1058,9 @@ class GravitationalWaveTransient(Likelihood):
                 h_inner_h=h_inner_h)
         else:
             log_l_tc_array = np.real(d_inner_h_tc_array) - h_inner_h / 2
-        times = self._times
+        times = self._times[self._time_window]
         if self.jitter_time:
-            times = self._times + self.parameters['time_jitter']
+            times = times + self.parameters['time_jitter']
         time_prior_array = self.priors['geocent_time'].prob(times) * self._delta_tc
         return logsumexp(log_l_tc_array, b=time_prior_array)
 
@@ -620,16 +1104,19 @@ class GravitationalWaveTransient(Likelihood):
     def _setup_distance_marginalization(self, lookup_table=None):
         if isinstance(lookup_table, str) or lookup_table is None:
             self.cached_lookup_table_filename = lookup_table
-            lookup_table = self.load_lookup_table(
-                self.cached_lookup_table_filename)
+            # hold the lock while loading or building so that concurrent
+            # jobs sharing the cache build the table only once
+            with file_lock(self.cached_lookup_table_filename + '.lock'):
+                lookup_table = self.load_lookup_table(
+                    self.cached_lookup_table_filename)
+                if lookup_table is None:
+                    self._create_lookup_table()
         if isinstance(lookup_table, dict):
-            if self._test_cached_lookup_table(lookup_table):
+            if self._test_cached_lookup_table(lookup_table)[0]:
                 self._dist_margd_loglikelihood_array = lookup_table[
                     'lookup_table']
             else:
                 self._create_lookup_table()
-        else:
-            self._create_lookup_table()
         self._interp_dist_margd_loglikelihood = UnsortedInterp2d(
             self._d_inner_h_ref_array, self._optimal_snr_squared_ref_array,
             self._dist_margd_loglikelihood_array, kind='cubic')
@@ -637,8 +1124,10 @@ class GravitationalWaveTransient(Likelihood):
     @property
     def cached_lookup_table_filename(self):
         if self._lookup_table_filename is None:
-            self._lookup_table_filename = (
-                '.distance_marginalization_lookup.npz')
+            self._lookup_table_filename = os.path.join(
+                _cache_directory(),
+                'distance_marginalization_lookup_{}.npz'.format(
+                    self._lookup_table_hash))
         return self._lookup_table_filename
 
     @cached_lookup_table_filename.setter
@@ -648,13 +1137,22 @@ class GravitationalWaveTransient(Likelihood):
                 filename += '.npz'
         self._lookup_table_filename = filename
 
+    @property
+    def _lookup_table_hash(self):
+        """ A hash of the quantities used to construct the lookup table """
+        sha = hashlib.sha256()
+        sha.update(np.ascontiguousarray(self._distance_array, dtype=float).tobytes())
+        sha.update(np.ascontiguousarray(self.distance_prior_array, dtype=float).tobytes())
+        sha.update(str((bool(self.phase_marginalization),
+                        self._lookup_table_shape)).encode())
+        return sha.hexdigest()[:32]
+
     def load_lookup_table(self, filename):
         if os.path.exists(filename):
             try:
                 loaded_file = dict(np.load(filename))
-            except AttributeError as e:
+            except (AttributeError, OSError, ValueError) as e:
                 logger.warning(e)
-                self._create_lookup_table()
                 return None
             match, failure = self._test_cached_lookup_table(loaded_file)
             if match:
@@ -670,12 +1168,17 @@ class GravitationalWaveTransient(Likelihood):
         return None
 
     def cache_lookup_table(self):
-        np.savez(self.cached_lookup_table_filename,
-                 distance_array=self._distance_array,
-                 prior_array=self.distance_prior_array,
-                 lookup_table=self._dist_margd_loglikelihood_array,
-                 reference_distance=self._ref_dist,
-                 phase_marginalization=self.phase_marginalization)
+        try:
+            atomic_savez(self.cached_lookup_table_filename,
+                         distance_array=self._distance_array,
+                         prior_array=self.distance_prior_array,
+                         lookup_table=self._dist_margd_loglikelihood_array,
+                         reference_distance=self._ref_dist,
+                         phase_marginalization=self.phase_marginalization)
+        except OSError as e:
+            logger.warning(
+                "Unable to cache the distance marginalisation lookup table "
+                "in {}: {}".format(self.cached_lookup_table_filename, e))
 
     def _test_cached_lookup_table(self, loaded_file):
         pairs = dict(
@@ -689,37 +1192,24 @@ class GravitationalWaveTransient(Likelihood):
             elif not np.array_equal(np.atleast_1d(loaded_file[key]),
                                     np.atleast_1d(pairs[key])):
                 return False, key
+        if np.shape(loaded_file.get('lookup_table')) != self._lookup_table_shape:
+            return False, 'lookup_table_shape'
         return True, None
 
     def _create_lookup_table(self):
         """ Make the lookup table """
         logger.info('Building lookup table for distance marginalisation.')
 
-        self._dist_margd_loglikelihood_array = np.zeros((400, 800))
-        for ii, optimal_snr_squared_ref in enumerate(self._optimal_snr_squared_ref_array):
-            optimal_snr_squared_array = (
-                optimal_snr_squared_ref * self._ref_dist ** 2. /
-                self._distance_array ** 2)
-            for jj, d_inner_h_ref in enumerate(self._d_inner_h_ref_array):
-                d_inner_h_array = (
-                    d_inner_h_ref * self._ref_dist / self._distance_array)
-                if self.phase_marginalization:
-                    d_inner_h_array =\
-                        self._bessel_function_interped(abs(d_inner_h_array))
-                self._dist_margd_loglikelihood_array[ii][jj] = \
-                    logsumexp(d_inner_h_array - optimal_snr_squared_array / 2,
-                              b=self.distance_prior_array * self._delta_distance)
-        log_norm = logsumexp(0. / self._distance_array,
-                             b=self.distance_prior_array * self._delta_distance)
-        self._dist_margd_loglikelihood_array -= log_norm
+        self._dist_margd_loglikelihood_array = np.zeros(self._lookup_table_shape)
+        self._dist_margd_loglikelihood_array = _build_distance_lookup_table(
+            optimal_snr_squared_ref_array=self._optimal_snr_squared_ref_array,
+            d_inner_h_ref_array=self._d_inner_h_ref_array,
+            distance_array=self._distance_array,
+            prior_array=self.distance_prior_array,
+            bessel_function=ln_i0 if self.phase_marginalization else None,
+            npool=self._lookup_table_npool)
         self.cache_lookup_table()
 
-    def _setup_phase_marginalization(self):
-        self._bessel_function_interped = interp1d(
-            np.logspace(-5, 10, int(1e6)), np.logspace(-5, 10, int(1e6)) +
-            np.log([i0e(snr) for snr in np.logspace(-5, 10, int(1e6))]),
-            bounds_error=False, fill_value=(0, np.nan))
-
     def _setup_time_marginalization(self):
         self._delta_tc = 2 / self.waveform_generator.sampling_frequency
         self._times =\
@@ -729,6 +1219,48 @@ class GravitationalWaveTransient(Likelihood):
                     self.waveform_generator.sampling_frequency + 1))[1:]
         self.time_prior_array = \
             self.priors['geocent_time'].prob(self._times) * self._delta_tc
+        self._setup_time_window()
+        self._time_reconstruction = None
+
+    def _setup_time_window(self):
+        """
+        Restrict the time marginalisation to the support of the time prior
+
+        The window covers the `geocent_time` prior padded by the time jitter
+        and the light travel time across the Earth. If the window is much
+        shorter than the segment, `d_inner_h(t_c)` is evaluated with an
+        output-pruned FFT, see `_pruned_fft`.
+        """
+        n_times = len(self._times)
+        prior = self.priors['geocent_time']
+        padding = self._delta_tc + radius_of_earth / speed_of_light
+        start = np.searchsorted(self._times, prior.minimum - padding)
+        stop = np.searchsorted(self._times, prior.maximum + padding, side='right')
+        self._time_window = slice(int(start), int(max(stop, start + 1)))
+        n_window = self._time_window.stop - self._time_window.start
+        self._pruned_fft_length, self._pruned_fft_twiddle = _setup_pruned_fft(
+            n_values=n_times, n_window=n_window)
+        logger.debug(
+            "Evaluating time-marginalised likelihood on {} of {} times."
+            .format(n_window, n_times))
+
+    def _windowed_fft(self, values):
+        """
+        The FFT of `values` evaluated at the times in the time window
+
+        Parameters
+        ----------
+        values: array_like
+            The input to the FFT, with the same length as `self._times`
+
+        Returns
+        -------
+        array_like: The FFT of `values` at the indices in `self._time_window`
+        """
+        return _pruned_fft(
+            values, start=self._time_window.start,
+            n_window=self._time_window.stop - self._time_window.start,
+            length=self._pruned_fft_length, twiddle=self._pruned_fft_twiddle)
 
     @property
     def interferometers(self):
@@ -766,23 +1298,40 @@ class GravitationalWaveTransient(Likelihood):
         else:
             raise ValueError("Unable to parse reference frame {}".format(frame))
 
-    def get_sky_frame_parameters(self):
-        time = self.parameters['{}_time'.format(self.time_reference)]
+    def get_sky_frame_parameters(self, parameters=None):
+        """ Convert the sky location and time to the sky frame and geocenter
+
+        Parameters
+        ----------
+        parameters: dict, optional
+            Parameters to convert, the values may be arrays. If not given
+            `self.parameters` is used.
+
+        Returns
+        -------
+        dict: The `ra`, `dec`, and `geocent_time`
+        """
+        if parameters is None:
+            parameters = self.parameters
+            time_delay_from_geocenter = "time_delay_from_geocenter"
+        else:
+            time_delay_from_geocenter = "time_delay_from_geocenter_batch"
+        time = parameters['{}_time'.format(self.time_reference)]
         if not self.reference_frame == "sky":
             ra, dec = zenith_azimuth_to_ra_dec(
-                self.parameters['zenith'], self.parameters['azimuth'],
+                parameters['zenith'], parameters['azimuth'],
                 time, self.reference_frame)
         else:
-            ra = self.parameters["ra"]
-            dec = self.parameters["dec"]
+            ra = parameters["ra"]
+            dec = parameters["dec"]
         if "geocent" not in self.time_reference:
             geocent_time = (
-                time - self.reference_ifo.time_delay_from_geocenter(
+                time - getattr(self.reference_ifo, time_delay_from_geocenter)(
                     ra=ra, dec=dec, time=time
                 )
             )
         else:
-            geocent_time = self.parameters["geocent_time"]
+            geocent_time = parameters["geocent_time"]
         return dict(ra=ra, dec=dec, geocent_time=geocent_time)
 
     @property
@@ -925,6 +1474,12 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
     quadratic_matrix: str, array_like
         Either a string point to the file from which to load the
         quadratic_matrix array, or the array itself.
+    weights: dict, str, optional
+        Precomputed weights, or a file written by `save_weights`, used instead
+        of building the weights from the bases. A warning is logged if the
+        time samples of the weights do not match the time prior. Weights
+        saved in the "npy" format are also compared against the data, power
+        spectral densities and roq_scale_factor.
     roq_params: str, array_like
         Parameters describing the domain of validity of the ROQ basis.
     roq_params_check: bool
@@ -940,8 +1495,25 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
         the table.
         If a string the name of a file containing these quantities.
         The lookup table is stored after construction in either the
-        provided string or a default location:
-        '.distance_marginalization_lookup_dmin{}_dmax{}_n{}.npz'
+        provided string or a shared cache directory.
+    lookup_table_shape, npool: optional
+        Options for building the distance marginalisation lookup table, see
+        `GravitationalWaveTransient`.
+    max_block_gigabytes: float, optional
+        The approximate maximum memory used for the blocks of time-shifted
+        data and basis while building the weights, default=4.
+    nthreads: int, optional
+        The number of threads used to build the weights, the interferometers
+        are distributed over the threads, default=1.
+    cache_weights: bool, optional
+        Whether to store the weights in the shared cache directory (given by
+        the BILBY_CACHE_DIR environment variable, default ~/.cache/bilby).
+        The cache is keyed by hashes of the data, power spectral densities,
+        bases, time samples and ROQ parameters, and matching weights are
+        reused instead of being rebuilt, default=False.
+        The weights for a full basis can take several gigabytes per
+        interferometer and cached weights are never removed automatically,
+        stale `roq_weights_*` directories should be deleted by hand.
     reference_frame: (str, bilby.gw.detector.InterferometerList, list), optional
         Definition of the reference frame for the sky location.
         - "sky": sample in RA/dec, this is the default
@@ -962,8 +1534,9 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
         roq_params=None, roq_params_check=True, roq_scale_factor=1,
         distance_marginalization=False, phase_marginalization=False,
         distance_marginalization_lookup_table=None,
-        reference_frame="sky", time_reference="geocenter"
-
+        reference_frame="sky", time_reference="geocenter",
+        lookup_table_shape=(400, 800), npool=1, max_block_gigabytes=4,
+        nthreads=1, cache_weights=False
     ):
         super(ROQGravitationalWaveTransient, self).__init__(
             interferometers=interferometers,
@@ -974,11 +1547,17 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
             distance_marginalization_lookup_table=distance_marginalization_lookup_table,
             jitter_time=False,
             reference_frame=reference_frame,
-            time_reference=time_reference
+            time_reference=time_reference,
+            lookup_table_shape=lookup_table_shape,
+            npool=npool
         )
 
         self.roq_params_check = roq_params_check
         self.roq_scale_factor = roq_scale_factor
+        self._polarization_tensor_cache = (None, None, None)
+        self.max_block_gigabytes = max_block_gigabytes
+        self.nthreads = nthreads
+        self.cache_weights = cache_weights
         if isinstance(roq_params, np.ndarray) or roq_params is None:
             self.roq_params = roq_params
         elif isinstance(roq_params, str):
@@ -988,18 +1567,23 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
             raise TypeError("roq_params should be array or str")
         if isinstance(weights, dict):
             self.weights = weights
+            self._check_loaded_weights()
         elif isinstance(weights, str):
-            self.weights = self.load_weights(weights)
+            self.weights, inputs = self._load_weights_and_inputs(weights)
+            self._check_loaded_weights(inputs)
         else:
             self.weights = dict()
+            self._basis_identifiers = dict(
+                linear=_basis_identifier(linear_matrix),
+                quadratic=_basis_identifier(quadratic_matrix))
             if isinstance(linear_matrix, str):
                 logger.info(
                     "Loading linear matrix from {}".format(linear_matrix))
-                linear_matrix = np.load(linear_matrix).T
+                linear_matrix = np.load(linear_matrix, mmap_mode='r').T
             if isinstance(quadratic_matrix, str):
                 logger.info(
                     "Loading quadratic_matrix from {}".format(quadratic_matrix))
-                quadratic_matrix = np.load(quadratic_matrix).T
+                quadratic_matrix = np.load(quadratic_matrix, mmap_mode='r').T
             self._set_weights(linear_matrix=linear_matrix,
                               quadratic_matrix=quadratic_matrix)
         self.frequency_nodes_linear =\
@@ -1018,16 +1602,17 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
 
         """
 
-        f_plus = interferometer.antenna_response(
-            self.parameters['ra'], self.parameters['dec'],
-            self.parameters['geocent_time'], self.parameters['psi'], 'plus')
-        f_cross = interferometer.antenna_response(
+        polarization_tensors, gmst = self._get_polarization_tensors()
+        antenna_response = interferometer.antenna_response_batch(
             self.parameters['ra'], self.parameters['dec'],
-            self.parameters['geocent_time'], self.parameters['psi'], 'cross')
+            self.parameters['geocent_time'], self.parameters['psi'],
+            polarization_tensors=polarization_tensors)
+        f_plus = float(antenna_response['plus'])
+        f_cross = float(antenna_response['cross'])
 
-        dt = interferometer.time_delay_from_geocenter(
+        dt = float(interferometer.time_delay_from_geocenter_batch(
             self.parameters['ra'], self.parameters['dec'],
-            self.parameters['geocent_time'])
+            self.parameters['geocent_time'], gmst=gmst))
         dt_geocent = self.parameters['geocent_time'] - interferometer.strain_data.start_time
         ifo_time = dt_geocent + dt
 
@@ -1054,13 +1639,15 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
                 complex_matched_filter_snr=np.nan_to_num(-np.inf),
                 d_inner_h_squared_tc_array=None)
 
-        d_inner_h_tc_array = np.einsum(
-            'i,ji->j', np.conjugate(h_plus_linear + h_cross_linear),
-            self.weights[interferometer.name + '_linear'][indices])
-
-        d_inner_h = interp1d(
-            self.weights['time_samples'][indices],
-            d_inner_h_tc_array, kind='cubic', assume_sorted=True)(ifo_time)
+        time_samples = self.weights['time_samples']
+        interpolation_weights = _five_point_spline_weights(
+            (ifo_time - time_samples[indices[2]]) /
+            (time_samples[1] - time_samples[0]))
+        d_inner_h = np.vdot(
+            h_plus_linear + h_cross_linear, np.dot(
+                interpolation_weights,
+                self.weights[interferometer.name + '_linear'][
+                    indices[0]:indices[-1] + 1]))
 
         optimal_snr_squared = \
             np.vdot(np.abs(h_plus_quadratic + h_cross_quadratic)**2,
@@ -1074,11 +1661,38 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
             complex_matched_filter_snr=complex_matched_filter_snr,
             d_inner_h_squared_tc_array=d_inner_h_squared_tc_array)
 
+    def _get_polarization_tensors(self):
+        """
+        The plus and cross polarization tensors and the Greenwich mean
+        sidereal time for the current parameters
+
+        These are shared by all of the interferometers and only recomputed
+        when the sky location, time or polarization angle changes.
+
+        Returns
+        -------
+        polarization_tensors: dict
+            The plus and cross polarization tensors
+        gmst: float
+            The Greenwich mean sidereal time
+        """
+        key = tuple(float(self.parameters[key])
+                    for key in ['ra', 'dec', 'geocent_time', 'psi'])
+        if self._polarization_tensor_cache[0] != key:
+            ra, dec, time, psi = key
+            gmst = greenwich_mean_sidereal_time(time)
+            polarization_tensors = get_polarization_tensors_batch(
+                ra, dec, time, psi, ['plus', 'cross'], gmst=gmst)
+            self._polarization_tensor_cache = (key, polarization_tensors, gmst)
+        return self._polarization_tensor_cache[1:]
+
     @staticmethod
     def _closest_time_indices(time, samples):
         """
         Get the closest five times
 
+        The samples must be uniformly spaced.
+
         Parameters
         ----------
         time: float
@@ -1093,7 +1707,7 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
         in_bounds: bool
             Whether the indices are for valid times
         """
-        closest = np.argmin(abs(samples - time))
+        closest = int(np.round((time - samples[0]) / (samples[1] - samples[0])))
         indices = [closest + ii for ii in [-2, -1, 0, 1, 2]]
         in_bounds = (indices[0] >= 0) & (indices[-1] < samples.size)
         return indices, in_bounds
@@ -1177,6 +1791,44 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
 
         """
 
+        self.weights['time_samples'] = self._get_time_samples()
+        logger.info("Using {} ROQ time samples".format(
+            len(self.weights['time_samples'])))
+        if self.roq_params is not None:
+            for ifo in self.interferometers:
+                self.perform_roq_params_check(ifo)
+        frequency_indices = self._get_frequency_indices(linear_matrix)
+
+        if self.cache_weights:
+            inputs = self._weights_cache_inputs(
+                self.weights['time_samples'], frequency_indices)
+            directory = os.path.join(
+                _cache_directory(), 'roq_weights_{}'.format(
+                    hashlib.sha256(json.dumps(inputs, sort_keys=True).encode())
+                    .hexdigest()[:32]))
+            # hold the lock while loading or building so that concurrent
+            # jobs sharing the cache build the weights only once
+            with file_lock(directory + '.lock'):
+                weights = self._load_cached_weights(directory, inputs)
+                if weights is not None:
+                    self.weights = weights
+                    return
+                self._build_weights(
+                    linear_matrix, quadratic_matrix, frequency_indices)
+                try:
+                    _write_weights_directory(
+                        directory, self.weights, dict(inputs=inputs))
+                    logger.info("Cached ROQ weights in {}".format(directory))
+                except OSError as e:
+                    logger.warning(
+                        "Unable to cache ROQ weights in {}: {}".format(directory, e))
+        else:
+            self._build_weights(
+                linear_matrix, quadratic_matrix, frequency_indices)
+
+    def _get_time_samples(self):
+        """ The times relative to the start of the data at which the ROQ
+        weights are evaluated, covering the time prior """
         time_space = self._get_time_resolution()
         # Maximum delay time to geocentre + 5 steps
         earth_light_crossing_time = radius_of_earth / speed_of_light + 5 * time_space
@@ -1184,13 +1836,27 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
             self.priors['{}_time'.format(self.time_reference)].minimum - earth_light_crossing_time,
             self.priors['{}_time'.format(self.time_reference)].maximum + earth_light_crossing_time,
             time_space)
-        time_samples = delta_times - self.interferometers.start_time
-        self.weights['time_samples'] = time_samples
-        logger.info("Using {} ROQ time samples".format(len(time_samples)))
+        return delta_times - self.interferometers.start_time
+
+    def _get_frequency_indices(self, linear_matrix=None):
+        """ The indices of the frequencies shared by each interferometer and
+        the ROQ basis
 
+        Parameters
+        ----------
+        linear_matrix: array_like, optional
+            The linear basis, used to check the number of frequencies when
+            roq_params are not given
+
+        Returns
+        -------
+        frequency_indices: list
+            Tuples of the indices into the masked frequency array of each
+            interferometer and into the basis
+        """
+        frequency_indices = list()
         for ifo in self.interferometers:
             if self.roq_params is not None:
-                self.perform_roq_params_check(ifo)
                 # Get scaled ROQ quantities
                 roq_scaled_minimum_frequency = self.roq_params['flow'] * self.roq_scale_factor
                 roq_scaled_maximum_frequency = self.roq_params['fhigh'] * self.roq_scale_factor
@@ -1201,61 +1867,185 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
                     duration=roq_scaled_segment_length)
                 roq_mask = roq_frequencies >= roq_scaled_minimum_frequency
                 roq_frequencies = roq_frequencies[roq_mask]
-                overlap_frequencies, ifo_idxs, roq_idxs = np.intersect1d(
+                _, ifo_idxs, roq_idxs = np.intersect1d(
                     ifo.frequency_array[ifo.frequency_mask], roq_frequencies,
                     return_indices=True)
             else:
-                overlap_frequencies = ifo.frequency_array[ifo.frequency_mask]
-                roq_idxs = np.arange(linear_matrix.shape[0], dtype=int)
-                ifo_idxs = [True] * sum(ifo.frequency_mask)
-                if sum(ifo_idxs) != len(roq_idxs):
+                ifo_idxs = np.arange(sum(ifo.frequency_mask), dtype=int)
+                if linear_matrix is None:
+                    roq_idxs = ifo_idxs
+                else:
+                    roq_idxs = np.arange(linear_matrix.shape[0], dtype=int)
+                if len(ifo_idxs) != len(roq_idxs):
                     raise ValueError(
                         "Mismatch between ROQ basis and frequency array for "
                         "{}".format(ifo.name))
-            logger.info(
-                "Building ROQ weights for {} with {} frequencies between {} "
-                "and {}.".format(
-                    ifo.name, len(overlap_frequencies),
-                    min(overlap_frequencies), max(overlap_frequencies)))
-
-            logger.debug("Preallocate array")
-            tc_shifted_data = np.zeros((
-                len(self.weights['time_samples']), len(overlap_frequencies)),
-                dtype=complex)
-
-            logger.debug("Calculate shifted data")
-            data = ifo.frequency_domain_strain[ifo.frequency_mask][ifo_idxs]
-            prefactor = (
-                data /
-                ifo.power_spectral_density_array[ifo.frequency_mask][ifo_idxs]
-            )
-            for j in range(len(self.weights['time_samples'])):
-                tc_shifted_data[j] = prefactor * np.exp(
-                    2j * np.pi * overlap_frequencies * time_samples[j])
+            frequency_indices.append((ifo_idxs, roq_idxs))
+        return frequency_indices
 
-            # to not kill all computers this minimises the memory usage of the
-            # required inner products
-            max_block_gigabytes = 4
-            max_elements = int((max_block_gigabytes * 2 ** 30) / 8)
+    def _check_loaded_weights(self, inputs=None):
+        """ Warn if loaded weights do not match this likelihood
 
-            logger.debug("Apply dot product")
-            self.weights[ifo.name + '_linear'] = blockwise_dot_product(
-                tc_shifted_data,
-                linear_matrix[roq_idxs],
-                max_elements) * 4 / ifo.strain_data.duration
+        Parameters
+        ----------
+        inputs: dict, optional
+            The `_weights_cache_inputs` stored with the weights. If given,
+            the data, power spectral densities, ROQ scale factor and time
+            samples are compared, otherwise only the time samples are.
+        """
+        time_samples = self._get_time_samples()
+        if inputs is not None:
+            current = self._weights_cache_inputs(
+                time_samples, self._get_frequency_indices())
+            # the basis is not known when loading weights
+            mismatched = sorted(
+                key for key in current
+                if key != 'basis' and inputs.get(key) != current[key])
+        else:
+            loaded = np.asarray(self.weights.get('time_samples', []))
+            if loaded.shape == time_samples.shape and np.allclose(loaded, time_samples):
+                mismatched = []
+            else:
+                mismatched = ['time_samples']
+        if len(mismatched) > 0:
+            logger.warning(
+                "The loaded ROQ weights do not match the current {}, the "
+                "weights should be rebuilt".format(", ".join(mismatched)))
+
+    def _weights_cache_inputs(self, time_samples, frequency_indices):
+        """ Hashes of the quantities used to build the ROQ weights """
+        inputs = dict(
+            version=_ROQ_WEIGHTS_CACHE_VERSION,
+            time_samples=_hash_array(time_samples),
+            roq_scale_factor=float(self.roq_scale_factor),
+            roq_params=(None if self.roq_params is None
+                        else _hash_array(self.roq_params)),
+            basis=getattr(self, '_basis_identifiers', None))
+        for ifo, (ifo_idxs, roq_idxs) in zip(
+                self.interferometers, frequency_indices):
+            mask = ifo.frequency_mask
+            inputs[ifo.name] = dict(
+                frequency_domain_strain=_hash_array(
+                    ifo.frequency_domain_strain[mask][ifo_idxs]),
+                power_spectral_density=_hash_array(
+                    ifo.power_spectral_density_array[mask][ifo_idxs]),
+                frequencies=_hash_array(ifo.frequency_array[mask][ifo_idxs]),
+                basis_indices=_hash_array(roq_idxs),
+                duration=float(ifo.strain_data.duration))
+        return inputs
 
-            del tc_shifted_data, overlap_frequencies
-            gc.collect()
+    @staticmethod
+    def _load_cached_weights(directory, inputs):
+        if not os.path.isdir(directory):
+            return None
+        try:
+            weights, manifest = _read_weights_directory(directory)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(e)
+            return None
+        if manifest.get('inputs') != inputs:
+            logger.info("Cached ROQ weights in {} do not match".format(directory))
+            return None
+        logger.info("Loaded cached ROQ weights from {}".format(directory))
+        return weights
 
-            self.weights[ifo.name + '_quadratic'] = build_roq_weights(
-                1 /
-                ifo.power_spectral_density_array[ifo.frequency_mask][ifo_idxs],
-                quadratic_matrix[roq_idxs].real,
-                1 / ifo.strain_data.duration)
+    def _build_weights(self, linear_matrix, quadratic_matrix, frequency_indices):
+        def build_weights(args):
+            ifo, (ifo_idxs, roq_idxs) = args
+            return self._build_weights_for_interferometer(
+                ifo=ifo, ifo_idxs=ifo_idxs, roq_idxs=roq_idxs,
+                linear_matrix=linear_matrix, quadratic_matrix=quadratic_matrix,
+                max_block_gigabytes=self.max_block_gigabytes / self.nthreads)
+
+        if self.nthreads > 1:
+            with ThreadPoolExecutor(max_workers=self.nthreads) as executor:
+                all_weights = list(executor.map(
+                    build_weights, zip(self.interferometers, frequency_indices)))
+        else:
+            all_weights = [
+                build_weights(args)
+                for args in zip(self.interferometers, frequency_indices)]
+
+        for ifo, (linear_weights, quadratic_weights) in zip(
+                self.interferometers, all_weights):
+            self.weights[ifo.name + '_linear'] = linear_weights
+            self.weights[ifo.name + '_quadratic'] = quadratic_weights
+
+    def _build_weights_for_interferometer(
+            self, ifo, ifo_idxs, roq_idxs, linear_matrix, quadratic_matrix,
+            max_block_gigabytes):
+        """ Build the ROQ weights for a single interferometer.
 
-            logger.info("Finished building weights for {}".format(ifo.name))
+        The time-shifted data is formed for blocks of frequencies and
+        accumulated directly into the linear weights, so only a block of the
+        time-shifted data and of the (possibly memory-mapped) bases is in
+        memory at any time.
+
+        Parameters
+        ----------
+        ifo: bilby.gw.detector.Interferometer
+            The interferometer
+        ifo_idxs, roq_idxs: array_like
+            The indices of the overlapping frequencies in the masked frequency
+            array of the interferometer and in the bases.
+        linear_matrix, quadratic_matrix: array_like
+            Arrays of the linear and quadratic basis
+        max_block_gigabytes: float
+            The approximate maximum memory used for each block.
+
+        Returns
+        -------
+        linear_weights, quadratic_weights: array_like
+            The linear and quadratic weights.
+        """
+        time_samples = self.weights['time_samples']
+        overlap_frequencies = ifo.frequency_array[ifo.frequency_mask][ifo_idxs]
+        logger.info(
+            "Building ROQ weights for {} with {} frequencies between {} "
+            "and {}.".format(
+                ifo.name, len(overlap_frequencies),
+                min(overlap_frequencies), max(overlap_frequencies)))
+
+        data = ifo.frequency_domain_strain[ifo.frequency_mask][ifo_idxs]
+        inverse_psd = (
+            1 / ifo.power_spectral_density_array[ifo.frequency_mask][ifo_idxs])
+        prefactor = data * inverse_psd
+
+        # to not kill all computers this limits the memory usage of the
+        # time-shifted data and the basis blocks
+        n_linear = linear_matrix.shape[1]
+        block_size = max(1, int(
+            max_block_gigabytes * 2 ** 30 / 16 /
+            (len(time_samples) + n_linear + quadratic_matrix.shape[1])))
+
+        linear_weights = np.zeros((len(time_samples), n_linear), dtype=complex)
+        quadratic_weights = np.zeros(quadratic_matrix.shape[1])
+        for start in range(0, len(overlap_frequencies), block_size):
+            block = slice(start, start + block_size)
+            tc_shifted_data = prefactor[block] * np.exp(
+                2j * np.pi * np.outer(time_samples, overlap_frequencies[block]))
+            linear_weights += np.dot(
+                tc_shifted_data, np.conjugate(linear_matrix[roq_idxs[block]]))
+            quadratic_weights += np.dot(
+                inverse_psd[block], quadratic_matrix[roq_idxs[block]].real)
+        linear_weights *= 4 / ifo.strain_data.duration
+        quadratic_weights *= 4 / ifo.strain_data.duration
+
+        logger.info("Finished building weights for {}".format(ifo.name))
+        return linear_weights, quadratic_weights
 
     def save_weights(self, filename, format='npz'):
+        """ Save the ROQ weights
+
+        Parameters
+        ----------
+        filename: str
+            The file to save to, the format is appended if not present
+        format: str, optional
+            One of "npz", "json" or "npy". With "npy" the weights are stored
+            as a directory of uncompressed arrays which are memory-mapped
+            when loaded.
+        """
         if format not in filename:
             filename += "." + format
         logger.info("Saving ROQ weights to {}".format(filename))
@@ -1264,21 +2054,37 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
                 json.dump(self.weights, file, indent=2, cls=BilbyJsonEncoder)
         elif format == 'npz':
             np.savez(filename, **self.weights)
+        elif format == 'npy':
+            inputs = self._weights_cache_inputs(
+                self.weights['time_samples'], self._get_frequency_indices())
+            _write_weights_directory(filename, self.weights, dict(inputs=inputs))
 
     @staticmethod
     def load_weights(filename, format=None):
+        weights, _ = ROQGravitationalWaveTransient._load_weights_and_inputs(
+            filename, format=format)
+        return weights
+
+    @staticmethod
+    def _load_weights_and_inputs(filename, format=None):
+        """ Load ROQ weights and, for the "npy" format, the inputs they
+        were built from (otherwise None) """
         if format is None:
-            format = filename.split(".")[-1]
-        if format not in ["json", "npz"]:
+            format = filename.rstrip(os.path.sep).split(".")[-1]
+        if format not in ["json", "npz", "npy"]:
             raise IOError("Format {} not recongized.".format(format))
         logger.info("Loading ROQ weights from {}".format(filename))
+        inputs = None
         if format == "json":
             with open(filename, 'r') as file:
                 weights = json.load(file, object_hook=decode_bilby_json)
         elif format == "npz":
             # Wrap in dict to load data into memory
             weights = dict(np.load(filename))
-        return weights
+        elif format == "npy":
+            weights, manifest = _read_weights_directory(filename)
+            inputs = manifest.get('inputs', None)
+        return weights, inputs
 
     def _get_time_resolution(self):
         """
@@ -1347,6 +2153,588 @@ class ROQGravitationalWaveTransient(GravitationalWaveTransient):
                 signal[kind][mode] *= self._ref_dist / new_distance
 
 
+class RelativeBinningGravitationalWaveTransient(GravitationalWaveTransient):
+    """A gravitational-wave transient likelihood object using relative binning
+    (also known as heterodyning)
+
+    This uses the method described in Zackay, Dai & Venumadhav (2018),
+    arxiv.org/abs/1806.08792 and Cornish (2010), arxiv.org/abs/1007.4820.
+    The ratio of the template to a fiducial waveform close to the maximum
+    likelihood is assumed to be linear across a set of frequency bins. Summary
+    data for each bin are computed once from the fiducial waveform and the
+    likelihood is then evaluated using the template at the bin edges only.
+
+    The waveform generator should use a source model which evaluates the
+    waveform at the `frequency_bin_edges` waveform argument, e.g.,
+    `bilby.gw.source.lal_binary_black_hole_relative_binning`.
+
+    Parameters
+    ----------
+    interferometers: list, bilby.gw.detector.InterferometerList
+        A list of `bilby.detector.Interferometer` instances - contains the
+        detector data and power spectral densities
+    waveform_generator: `bilby.waveform_generator.WaveformGenerator`
+        An object which computes the frequency-domain strain of the signal,
+        given some set of parameters
+    fiducial_parameters: dict
+        Parameters of the fiducial waveform, these should be close to the
+        maximum likelihood point and must include the sky location, time and
+        polarisation (`ra`, `dec`, `geocent_time`, `psi`).
+    epsilon: float, optional
+        The maximum allowed change in the phase of the waveform relative to the
+        fiducial waveform across a single bin, default=0.5.
+    chi: float, optional
+        Tunable parameter in the phase bound, default=1.
+    distance_marginalization: bool, optional
+        If true, marginalize over distance in the likelihood.
+        This uses a look up table calculated at run time.
+        The distance prior is set to be a delta function at the minimum
+        distance allowed in the prior being marginalised over.
+    phase_marginalization: bool, optional
+        If true, marginalize over phase in the likelihood.
+        This is done analytically using a Bessel function.
+        The phase prior is set to be a delta function at phase=0.
+    priors: dict, optional
+        If given, used in the distance and phase marginalization.
+    distance_marginalization_lookup_table: (dict, str), optional
+        If a dict, dictionary containing the lookup_table, distance_array,
+        (distance) prior_array, and reference_distance used to construct
+        the table.
+        If a string the name of a file containing these quantities.
+        The lookup table is stored after construction in either the
+        provided string or a shared cache directory.
+    lookup_table_shape, npool: optional
+        Options for building the distance marginalisation lookup table, see
+        `GravitationalWaveTransient`.
+    reference_frame: (str, bilby.gw.detector.InterferometerList, list), optional
+        Definition of the reference frame for the sky location.
+    time_reference: str, optional
+        Name of the reference for the sampled time parameter.
+
+    Notes
+    -----
+    Time marginalization is not supported with this likelihood.
+
+    """
+
+    # The powers of frequency appearing in the post-Newtonian phase
+    _gamma = np.array([-5 / 3, -2 / 3, 1, 5 / 3, 7 / 3])
+
+    def __init__(
+        self, interferometers, waveform_generator, fiducial_parameters,
+        epsilon=0.5, chi=1, distance_marginalization=False,
+        phase_marginalization=False, priors=None,
+        distance_marginalization_lookup_table=None,
+        reference_frame="sky", time_reference="geocenter",
+        lookup_table_shape=(400, 800), npool=1
+    ):
+        super(RelativeBinningGravitationalWaveTransient, self).__init__(
+            interferometers=interferometers,
+            waveform_generator=waveform_generator, priors=priors,
+            distance_marginalization=distance_marginalization,
+            phase_marginalization=phase_marginalization,
+            time_marginalization=False,
+            distance_marginalization_lookup_table=distance_marginalization_lookup_table,
+            jitter_time=False,
+            reference_frame=reference_frame,
+            time_reference=time_reference,
+            lookup_table_shape=lookup_table_shape,
+            npool=npool
+        )
+        self.fiducial_parameters = fiducial_parameters.copy()
+        self.epsilon = epsilon
+        self.chi = chi
+        self.bin_inds = None
+        self.bin_freqs = None
+        self.summary_data = dict()
+        self.per_detector_fiducial_waveform_points = dict()
+        self.setup_bins()
+        self.set_fiducial_waveforms(self.fiducial_parameters)
+
+    def __repr__(self):
+        return self.__class__.__name__ + '(interferometers={},\n\twaveform_generator={},\n\t' \
+                                         'fiducial_parameters={}, epsilon={}, chi={}, ' \
+                                         'distance_marginalization={}, phase_marginalization={}, priors={})'\
+            .format(self.interferometers, self.waveform_generator, self.fiducial_parameters,
+                    self.epsilon, self.chi, self.distance_marginalization,
+                    self.phase_marginalization, self.priors)
+
+    @property
+    def number_of_bins(self):
+        return len(self.bin_freqs) - 1
+
+    def setup_bins(self):
+        """ Choose the frequency bins such that the maximum possible phase
+        difference to the fiducial waveform across any bin is `epsilon`.
+
+        See Eq. (9-11) of arxiv.org/abs/1806.08792.
+        """
+        frequency_array = self.waveform_generator.frequency_array
+        minimum_frequency = min(ifo.minimum_frequency for ifo in self.interferometers)
+        maximum_frequency = max(ifo.maximum_frequency for ifo in self.interferometers)
+        frequency_array_useful = frequency_array[
+            (frequency_array >= minimum_frequency) &
+            (frequency_array <= maximum_frequency)]
+
+        gamma = self._gamma[:, np.newaxis]
+        d_alpha = self.chi * 2 * np.pi / np.abs(
+            minimum_frequency ** gamma * np.heaviside(-gamma, 1) -
+            maximum_frequency ** gamma * np.heaviside(gamma, 1))
+        d_phi = np.sum(
+            np.sign(gamma) * d_alpha * frequency_array_useful ** gamma, axis=0)
+        d_phi_from_start = d_phi - d_phi[0]
+
+        number_of_bins = max(int(d_phi_from_start[-1] // self.epsilon), 1)
+        targets = np.arange(number_of_bins + 1) / number_of_bins * d_phi_from_start[-1]
+        useful_inds = np.unique(np.minimum(
+            np.searchsorted(d_phi_from_start, targets),
+            len(frequency_array_useful) - 1))
+        self.bin_freqs = frequency_array_useful[useful_inds]
+        self.bin_inds = np.searchsorted(frequency_array, self.bin_freqs)
+        logger.info("Set up {} bins between {} Hz and {} Hz".format(
+            self.number_of_bins, self.bin_freqs[0], self.bin_freqs[-1]))
+        self.waveform_generator.waveform_arguments['frequency_bin_edges'] = self.bin_freqs
+
+    def set_fiducial_waveforms(self, parameters):
+        """ Compute the fiducial waveform in each interferometer and the
+        associated summary data.
+
+        Parameters
+        ----------
+        parameters: dict
+            The parameters of the fiducial waveform.
+        """
+        self.fiducial_parameters = parameters.copy()
+        frequency_bin_edges = self.waveform_generator.waveform_arguments.pop(
+            'frequency_bin_edges', None)
+        try:
+            fiducial_polarizations = self.waveform_generator.frequency_domain_strain(
+                self.fiducial_parameters)
+        finally:
+            self.waveform_generator.waveform_arguments['frequency_bin_edges'] = frequency_bin_edges
+        if fiducial_polarizations is None:
+            raise ValueError(
+                "Unable to generate the fiducial waveform for parameters {}"
+                .format(self.fiducial_parameters))
+        binned_polarizations = self.waveform_generator.frequency_domain_strain(
+            self.fiducial_parameters)
+
+        for interferometer in self.interferometers:
+            fiducial_waveform = interferometer.get_detector_response(
+                fiducial_polarizations, self.fiducial_parameters)
+            self.per_detector_fiducial_waveform_points[interferometer.name] = \
+                interferometer.get_detector_response(
+                    binned_polarizations, self.fiducial_parameters,
+                    frequencies=self.bin_freqs)
+            self.summary_data[interferometer.name] = self.compute_summary_data(
+                interferometer, fiducial_waveform)
+
+    def compute_summary_data(self, interferometer, fiducial_waveform):
+        """ Compute the summary data for an interferometer
+
+        See Eq. (15) of arxiv.org/abs/1806.08792.
+
+        Parameters
+        ----------
+        interferometer: bilby.gw.detector.Interferometer
+            The interferometer
+        fiducial_waveform: array_like
+            The fiducial detector response on the full frequency array
+
+        Returns
+        -------
+        summary_data: tuple
+            The four arrays of summary data (a0, a1, b0, b1) for each bin.
+        """
+        mask = interferometer.frequency_mask
+        frequencies = interferometer.frequency_array[mask]
+        in_bins = (frequencies >= self.bin_freqs[0]) & (frequencies <= self.bin_freqs[-1])
+        frequencies = frequencies[in_bins]
+        data = interferometer.frequency_domain_strain[mask][in_bins]
+        psd = interferometer.power_spectral_density_array[mask][in_bins]
+        fiducial_waveform = fiducial_waveform[mask][in_bins]
+
+        bin_index = np.minimum(
+            np.searchsorted(self.bin_freqs, frequencies, side='right') - 1,
+            self.number_of_bins - 1)
+        bin_centers = (self.bin_freqs[1:] + self.bin_freqs[:-1]) / 2
+        frequency_offset = frequencies - bin_centers[bin_index]
+
+        prefactor = 4 / interferometer.strain_data.duration
+        d_inner_h0 = prefactor * np.conj(fiducial_waveform) * data / psd
+        h0_inner_h0 = prefactor * np.abs(fiducial_waveform) ** 2 / psd
+
+        def _bin_sum(values):
+            if np.iscomplexobj(values):
+                return _bin_sum(values.real) + 1j * _bin_sum(values.imag)
+            return np.bincount(bin_index, weights=values, minlength=self.number_of_bins)
+
+        a0 = _bin_sum(d_inner_h0)
+        a1 = _bin_sum(d_inner_h0 * frequency_offset)
+        b0 = _bin_sum(h0_inner_h0)
+        b1 = _bin_sum(h0_inner_h0 * frequency_offset)
+        return a0, a1, b0, b1
+
+    def compute_waveform_ratio_per_interferometer(self, waveform_polarizations, interferometer):
+        """ Compute the linear approximation to the ratio of the template to
+        the fiducial waveform in each bin.
+
+        Parameters
+        ----------
+        waveform_polarizations: dict
+            The waveform polarizations evaluated at the bin edges
+        interferometer: bilby.gw.detector.Interferometer
+            The interferometer
+
+        Returns
+        -------
+        r0, r1: array_like
+            The value of the ratio at the bin centres and its slope in each
+            bin.
+        """
+        strain = interferometer.get_detector_response(
+            waveform_polarizations, self.parameters, frequencies=self.bin_freqs)
+        fiducial_strain = self.per_detector_fiducial_waveform_points[interferometer.name]
+        waveform_ratio = np.zeros_like(strain)
+        np.divide(strain, fiducial_strain, out=waveform_ratio,
+                  where=fiducial_strain != 0)
+
+        r0 = (waveform_ratio[1:] + waveform_ratio[:-1]) / 2
+        r1 = (waveform_ratio[1:] - waveform_ratio[:-1]) / (
+            self.bin_freqs[1:] - self.bin_freqs[:-1])
+        return r0, r1
+
+    def calculate_snrs(self, waveform_polarizations, interferometer):
+        """
+        Compute the snrs for relative binning
+
+        Parameters
+        ----------
+        waveform_polarizations: dict
+            A dictionary of waveform polarizations evaluated at the bin edges
+        interferometer: bilby.gw.detector.Interferometer
+            The bilby interferometer object
+
+        """
+        r0, r1 = self.compute_waveform_ratio_per_interferometer(
+            waveform_polarizations=waveform_polarizations,
+            interferometer=interferometer)
+        a0, a1, b0, b1 = self.summary_data[interferometer.name]
+
+        d_inner_h = np.sum(a0 * np.conjugate(r0) + a1 * np.conjugate(r1))
+        optimal_snr_squared = np.sum(
+            b0 * np.abs(r0) ** 2 + 2 * b1 * np.real(r0 * np.conjugate(r1)))
+        complex_matched_filter_snr = d_inner_h / (optimal_snr_squared ** 0.5)
+
+        return self._CalculatedSNRs(
+            d_inner_h=d_inner_h, optimal_snr_squared=optimal_snr_squared,
+            complex_matched_filter_snr=complex_matched_filter_snr,
+            d_inner_h_squared_tc_array=None)
+
+    @property
+    def meta_data(self):
+        meta_data = super(RelativeBinningGravitationalWaveTransient, self).meta_data
+        meta_data['fiducial_parameters'] = self.fiducial_parameters
+        meta_data['epsilon'] = self.epsilon
+        meta_data['chi'] = self.chi
+        meta_data['number_of_bins'] = self.number_of_bins
+        return meta_data
+
+
+class MBGravitationalWaveTransient(GravitationalWaveTransient):
+    """A gravitational-wave transient likelihood object using multi-banding
+
+    The frequency range is split into bands with increasing frequency. In each
+    band the signal is shorter than in the previous one, and so the waveform
+    only needs to be evaluated on a coarser, duration-adapted, frequency grid.
+    The inner products are computed from the waveform at these nodes using
+    weights precomputed from the data and the power spectral density. See
+    Vinciguerra et al. (2017), arxiv.org/abs/1703.02062 and Morisaki (2021),
+    arxiv.org/abs/2104.07813.
+
+    The bands are constructed using the leading-order post-Newtonian time to
+    merger for the minimum chirp mass allowed by the prior. The waveform
+    generator must use a source model which evaluates the waveform at the
+    `frequencies` waveform argument, e.g.,
+    `bilby.gw.source.binary_black_hole_frequency_sequence` or
+    `bilby.gw.source.binary_neutron_star_frequency_sequence`.
+
+    Parameters
+    ----------
+    interferometers: list, bilby.gw.detector.InterferometerList
+        A list of `bilby.detector.Interferometer` instances - contains the
+        detector data and power spectral densities
+    waveform_generator: `bilby.waveform_generator.WaveformGenerator`
+        An object which computes the frequency-domain strain of the signal,
+        given some set of parameters
+    priors: dict, bilby.prior.PriorDict
+        A dictionary of priors containing at least the geocent_time prior and
+        the information required to compute the minimum chirp mass, unless
+        `reference_chirp_mass` is given.
+    reference_chirp_mass: float, optional
+        The chirp mass used to construct the bands, this should be the minimum
+        chirp mass being considered. By default, the minimum chirp mass of the
+        prior is used.
+    highest_mode: int, optional
+        The maximum magnetic number of the modes included in the waveform,
+        default=2.
+    accuracy_factor: float, optional
+        The number of inverse frequency-window widths allowed in the time
+        domain margin of each band, larger values give more accurate results
+        at a higher computational cost, default=5.
+    distance_marginalization: bool, optional
+        If true, marginalize over distance in the likelihood.
+    phase_marginalization: bool, optional
+        If true, marginalize over phase in the likelihood.
+    distance_marginalization_lookup_table: (dict, str), optional
+        If a dict, dictionary containing the lookup_table, distance_array,
+        (distance) prior_array, and reference_distance used to construct
+        the table.
+        If a string the name of a file containing these quantities.
+    lookup_table_shape, npool: optional
+        Options for building the distance marginalisation lookup table, see
+        `GravitationalWaveTransient`.
+    reference_frame: (str, bilby.gw.detector.InterferometerList, list), optional
+        Definition of the reference frame for the sky location.
+    time_reference: str, optional
+        Name of the reference for the sampled time parameter.
+
+    Notes
+    -----
+    Time marginalization is not supported with this likelihood.
+
+    """
+
+    def __init__(
+        self, interferometers, waveform_generator, priors,
+        reference_chirp_mass=None, highest_mode=2, accuracy_factor=5,
+        distance_marginalization=False, phase_marginalization=False,
+        distance_marginalization_lookup_table=None,
+        reference_frame="sky", time_reference="geocenter",
+        lookup_table_shape=(400, 800), npool=1
+    ):
+        super(MBGravitationalWaveTransient, self).__init__(
+            interferometers=interferometers,
+            waveform_generator=waveform_generator, priors=priors,
+            distance_marginalization=distance_marginalization,
+            phase_marginalization=phase_marginalization,
+            time_marginalization=False,
+            distance_marginalization_lookup_table=distance_marginalization_lookup_table,
+            jitter_time=False,
+            reference_frame=reference_frame,
+            time_reference=time_reference,
+            lookup_table_shape=lookup_table_shape,
+            npool=npool
+        )
+        if reference_chirp_mass is None:
+            if isinstance(self.priors, CBCPriorDict):
+                reference_chirp_mass = self.priors.minimum_chirp_mass
+            if reference_chirp_mass is None:
+                raise ValueError(
+                    "Unable to determine the minimum chirp mass, please "
+                    "provide reference_chirp_mass.")
+        self.reference_chirp_mass = reference_chirp_mass
+        self.highest_mode = highest_mode
+        self.accuracy_factor = accuracy_factor
+        self.linear_weights = dict()
+        self.quadratic_weights = dict()
+        self.setup_frequency_bands()
+        self.setup_weights()
+
+    def __repr__(self):
+        return self.__class__.__name__ + '(interferometers={},\n\twaveform_generator={},\n\t' \
+                                         'reference_chirp_mass={}, highest_mode={}, accuracy_factor={}, ' \
+                                         'distance_marginalization={}, phase_marginalization={}, priors={})'\
+            .format(self.interferometers, self.waveform_generator, self.reference_chirp_mass,
+                    self.highest_mode, self.accuracy_factor, self.distance_marginalization,
+                    self.phase_marginalization, self.priors)
+
+    def _time_to_merger(self, frequency):
+        """ Leading-order post-Newtonian time to merger from `frequency` for
+        the highest mode at the reference chirp mass """
+        chirp_time = (self.reference_chirp_mass * solar_mass *
+                      gravitational_constant / speed_of_light ** 3)
+        orbital_frequency = 2 * frequency / self.highest_mode
+        return 5 / 256 * (np.pi * orbital_frequency) ** (-8 / 3) * chirp_time ** (-5 / 3)
+
+    def _frequency_from_time_to_merger(self, time):
+        """ Inverse of `_time_to_merger` """
+        chirp_time = (self.reference_chirp_mass * solar_mass *
+                      gravitational_constant / speed_of_light ** 3)
+        orbital_frequency = (
+            (256 * time / 5) ** (-3 / 8) * chirp_time ** (-5 / 8) / np.pi)
+        return self.highest_mode * orbital_frequency / 2
+
+    def setup_frequency_bands(self):
+        """ Construct the frequency bands
+
+        Band `k` has duration `duration / 2 ** k` and starts at the frequency
+        above which the signal (including the time-domain leakage of the
+        frequency window) fits within the last `duration / 2 ** k` seconds of
+        the segment for any merger time allowed by the prior.
+        """
+        duration = self.interferometers.duration
+        end_time = self.interferometers.start_time + duration
+        earth_light_crossing_time = radius_of_earth / speed_of_light
+        time_prior = self.priors['{}_time'.format(self.time_reference)]
+        if isinstance(time_prior, Prior):
+            latest_merger = time_prior.maximum + earth_light_crossing_time
+            earliest_merger = time_prior.minimum - earth_light_crossing_time
+        else:
+            latest_merger = time_prior + earth_light_crossing_time
+            earliest_merger = time_prior - earth_light_crossing_time
+        # time after the latest merger which may be used for window leakage
+        # leaving a small buffer for the ringdown
+        leakage_time = (end_time - latest_merger) / 2
+        if leakage_time <= 0:
+            raise ValueError(
+                "The time prior extends beyond the end of the data segment.")
+        earliest_offset = end_time - earliest_merger
+
+        self.minimum_frequency = min(
+            ifo.minimum_frequency for ifo in self.interferometers)
+        self.maximum_frequency = max(
+            ifo.maximum_frequency for ifo in self.interferometers)
+
+        window_width = self.accuracy_factor / leakage_time
+        band_durations = [duration]
+        band_starts = [self.minimum_frequency]
+        while True:
+            band_duration = band_durations[-1] / 2
+            time_budget = band_duration - earliest_offset - leakage_time
+            if time_budget <= 0:
+                break
+            start_frequency = self._frequency_from_time_to_merger(time_budget)
+            if start_frequency < band_starts[-1] + window_width:
+                start_frequency = band_starts[-1] + window_width
+            if start_frequency + window_width >= self.maximum_frequency:
+                break
+            band_durations.append(band_duration)
+            band_starts.append(start_frequency)
+        self.band_durations = np.array(band_durations)
+        self.band_starts = np.array(band_starts)
+        self.window_width = window_width
+        logger.info("Set up {} frequency bands starting at {} Hz with durations {} s".format(
+            len(self.band_durations), self.band_starts, self.band_durations))
+
+        sampling_frequency = self.interferometers.sampling_frequency
+        node_frequencies = list()
+        node_band = list()
+        for band, band_duration in enumerate(self.band_durations):
+            lower = self.band_starts[band]
+            if band + 1 < len(self.band_starts):
+                upper = self.band_starts[band + 1] + window_width
+            else:
+                upper = self.maximum_frequency
+            first = int(np.floor(lower * band_duration))
+            last = min(int(np.ceil(upper * band_duration)) + 1,
+                       int(band_duration * sampling_frequency) // 2)
+            node_frequencies.append(np.arange(first, last + 1) / band_duration)
+            node_band.append(np.full(last + 1 - first, band))
+        self.node_frequencies = np.concatenate(node_frequencies)
+        self.node_band = np.concatenate(node_band)
+        self.unique_frequencies, self._unique_to_nodes = np.unique(
+            self.node_frequencies, return_inverse=True)
+        logger.info("The waveform will be evaluated at {} frequencies".format(
+            len(self.unique_frequencies)))
+        self.waveform_generator.waveform_arguments['frequencies'] = self.unique_frequencies
+
+    def _window(self, frequencies, band):
+        """ Smooth frequency window for a band, the windows of all bands sum
+        to one over the analysed frequency range """
+        window = np.ones(len(frequencies))
+        if band > 0:
+            rise = np.clip(
+                (frequencies - self.band_starts[band]) / self.window_width, 0, 1)
+            window *= (1 - np.cos(np.pi * rise)) / 2
+        if band + 1 < len(self.band_starts):
+            fall = np.clip(
+                (frequencies - self.band_starts[band + 1]) / self.window_width, 0, 1)
+            window *= (1 + np.cos(np.pi * fall)) / 2
+        return window
+
+    def setup_weights(self):
+        """ Compute the weights for the linear and quadratic terms of the
+        likelihood for each interferometer.
+
+        The linear weights are obtained by projecting the noise-weighted data
+        onto the band-limited time window of each band, the quadratic weights
+        by linearly interpolating the squared waveform between the nodes.
+        """
+        for ifo in self.interferometers:
+            duration = ifo.strain_data.duration
+            number_of_samples = int(np.round(duration * ifo.strain_data.sampling_frequency))
+            mask = ifo.frequency_mask
+            weighted_data = np.zeros(number_of_samples, dtype=complex)
+            weighted_data[:len(mask)][mask] = (
+                4 / duration * ifo.frequency_domain_strain[mask] /
+                ifo.power_spectral_density_array[mask])
+            time_series = number_of_samples * np.fft.ifft(weighted_data)
+            inverse_psd = np.zeros(len(mask))
+            inverse_psd[mask] = 4 / duration / ifo.power_spectral_density_array[mask]
+
+            linear_weights = np.zeros(len(self.node_frequencies), dtype=complex)
+            quadratic_weights = np.zeros(len(self.node_frequencies))
+            for band, band_duration in enumerate(self.band_durations):
+                in_band = self.node_band == band
+                nodes = self.node_frequencies[in_band]
+                node_indices = np.round(nodes * band_duration).astype(int)
+                band_samples = int(np.round(band_duration * ifo.strain_data.sampling_frequency))
+                downsampled = np.fft.fft(time_series[-band_samples:]) / band_samples
+                linear_weights[in_band] = (
+                    downsampled[node_indices] * self._window(nodes, band))
+
+                frequencies = ifo.frequency_array
+                band_weights = inverse_psd * self._window(frequencies, band)
+                in_range = (band_weights > 0) & (frequencies >= nodes[0]) & (frequencies < nodes[-1])
+                position = frequencies[in_range] * band_duration - node_indices[0]
+                lower = np.floor(position).astype(int)
+                fraction = position - lower
+                quadratic_weights[np.where(in_band)[0]] += (
+                    np.bincount(lower, weights=band_weights[in_range] * (1 - fraction),
+                                minlength=len(nodes)) +
+                    np.bincount(lower + 1, weights=band_weights[in_range] * fraction,
+                                minlength=len(nodes))[:len(nodes)])
+            self.linear_weights[ifo.name] = linear_weights
+            self.quadratic_weights[ifo.name] = quadratic_weights
+
+    def calculate_snrs(self, waveform_polarizations, interferometer):
+        """
+        Compute the snrs for multi-banding
+
+        Parameters
+        ----------
+        waveform_polarizations: dict
+            A dictionary of waveform polarizations evaluated at
+            `unique_frequencies`
+        interferometer: bilby.gw.detector.Interferometer
+            The bilby interferometer object
+
+        """
+        strain = interferometer.get_detector_response(
+            waveform_polarizations, self.parameters,
+            frequencies=self.unique_frequencies)[self._unique_to_nodes]
+        d_inner_h = np.vdot(strain, self.linear_weights[interferometer.name])
+        optimal_snr_squared = np.dot(
+            np.abs(strain) ** 2, self.quadratic_weights[interferometer.name])
+        complex_matched_filter_snr = d_inner_h / (optimal_snr_squared ** 0.5)
+
+        return self._CalculatedSNRs(
+            d_inner_h=d_inner_h, optimal_snr_squared=optimal_snr_squared,
+            complex_matched_filter_snr=complex_matched_filter_snr,
+            d_inner_h_squared_tc_array=None)
+
+    @property
+    def meta_data(self):
+        meta_data = super(MBGravitationalWaveTransient, self).meta_data
+        meta_data['reference_chirp_mass'] = self.reference_chirp_mass
+        meta_data['highest_mode'] = self.highest_mode
+        meta_data['accuracy_factor'] = self.accuracy_factor
+        meta_data['band_durations'] = self.band_durations
+        meta_data['band_starts'] = self.band_starts
+        return meta_data
+
+
 def get_binary_black_hole_likelihood(interferometers):
     """ A rapper to quickly set up a likelihood for BBH parameter estimation
 
@@ -3,7 +3,6 @@ import copy
 
 import numpy as np
 from scipy.interpolate import InterpolatedUnivariateSpline, interp1d
-from scipy.integrate import cumtrapz
 from scipy.stats import norm
 
 from ..core.prior import (PriorDict, Uniform, Prior, DeltaFunction, Gaussian,
@@ -27,6 +26,8 @@ except ImportError:
 
 DEFAULT_PRIOR_DIR = os.path.join(os.path.dirname(__file__), 'prior_files')
 
+_HEALPIX_MAX_ORDER = 29
+
 
 class BilbyPriorConversionError(Exception):
     pass
@@ -817,6 +818,10 @@ class HealPixMapPriorDist(BaseJointPriorDist):
     normal LALInference type skymaps where each pixel has a DISTMU, DISTSIGMA, and DISTNORM defining the conditional
     distance distribution along a given line of sight.
 
+    Both single resolution maps and multi-order (NUNIQ ordered) maps are supported. Multi-order maps are used at
+    their native resolution, pixels are drawn from the cumulative pixel probability and positions are drawn
+    uniformly within the chosen pixel by picking one of its nested sub-pixels at the highest HealPix order.
+
     Parameters
     ----------
 
@@ -852,22 +857,29 @@ class HealPixMapPriorDist(BaseJointPriorDist):
             if len(bounds) == 2:
                 bounds.append([0, np.inf])
             self.distance = True
+        else:
+            self.distance = False
+        self.multiorder = self._is_multiorder(hp_file)
+        if self.multiorder:
+            self._read_multiorder_map(hp_file)
+        elif self.distance:
             self.prob, self.distmu, self.distsigma, self.distnorm = self.hp.read_map(
                 hp_file, verbose=False, field=range(4)
             )
         else:
-            self.distance = False
             self.prob = self.hp.read_map(hp_file, verbose=False)
 
         super(HealPixMapPriorDist, self).__init__(names=names, bounds=bounds)
         self.distname = "hpmap"
         self.npix = len(self.prob)
-        self.nside = self.hp.npix2nside(self.npix)
+        if self.multiorder:
+            self.nside = 2 ** int(np.max(self.pixel_orders))
+        else:
+            self.nside = self.hp.npix2nside(self.npix)
         self.pixel_area = self.hp.nside2pixarea(self.nside)
         self.pixel_length = self.pixel_area ** (1 / 2.0)
         self.pix_xx = np.arange(self.npix)
-        self._all_interped = interp1d(x=self.pix_xx, y=self.prob, bounds_error=False, fill_value=0)
-        self.inverse_cdf = None
+        self.cdf = None
         self.distance_pdf = None
         self.distance_dist = None
         self.distance_icdf = None
@@ -878,15 +890,45 @@ class HealPixMapPriorDist(BaseJointPriorDist):
         else:
             self.rs = np.linspace(0, 5000, 1000)
 
+    @staticmethod
+    def _is_multiorder(hp_file):
+        """
+        Check whether the given file contains a multi-order (NUNIQ ordered) map
+        """
+        from astropy.io import fits
+        try:
+            header = fits.getheader(hp_file, 1)
+        except (OSError, IndexError):
+            return False
+        return header.get("ORDERING", "").upper() == "NUNIQ"
+
+    def _read_multiorder_map(self, hp_file):
+        """
+        Read a multi-order map, storing the probability contained in each pixel along with the order and nested index
+        of each pixel
+        """
+        from astropy.io import fits
+        data = fits.getdata(hp_file, 1)
+        uniq = np.asarray(data["UNIQ"], dtype=np.int64)
+        self.pixel_orders = np.searchsorted(
+            4 * 4 ** np.arange(_HEALPIX_MAX_ORDER + 1, dtype=np.int64), uniq, side="right") - 1
+        self.nested_pixels = uniq - 4 * 4 ** self.pixel_orders
+        self.pixel_areas = 4 * np.pi / (12 * 4 ** self.pixel_orders.astype(float))
+        self.prob = np.asarray(data["PROBDENSITY"], dtype=float) * self.pixel_areas
+        if self.distance:
+            self.distmu = np.asarray(data["DISTMU"], dtype=float)
+            self.distsigma = np.asarray(data["DISTSIGMA"], dtype=float)
+            self.distnorm = np.asarray(data["DISTNORM"], dtype=float)
+        starts = self.nested_pixels * 4 ** (_HEALPIX_MAX_ORDER - self.pixel_orders)
+        self._sorted_pixels = np.argsort(starts)
+        self._sorted_starts = starts[self._sorted_pixels]
+
     def _build_attributes(self):
         """
-        Method that builds the inverse cdf of the P(pixel) distribution for rescaling
+        Method that builds the cdf of the P(pixel) distribution for rescaling
         """
-        yy = self._all_interped(self.pix_xx)
-        yy /= np.trapz(yy, self.pix_xx)
-        YY = cumtrapz(yy, self.pix_xx, initial=0)
-        YY[-1] = 1
-        self.inverse_cdf = interp1d(x=YY, y=self.pix_xx, bounds_error=True)
+        self.cdf = np.cumsum(self.prob)
+        self.cdf /= self.cdf[-1]
 
     @staticmethod
     def _check_imports():
@@ -916,25 +958,123 @@ class HealPixMapPriorDist(BaseJointPriorDist):
         rescaled_sample : array_like
             sample to rescale onto the prior
         """
+        pixels = self._pixels_from_unit(samp[:, 0])
+        ra, dec = self._draw_from_pixels(pixels)
         if self.distance:
-            dist_samp = samp[:, -1]
-            samp = samp[:, 0]
+            distances = self._distances_from_unit(pixels, samp[:, -1])
+            sample = np.column_stack([ra, dec, distances])
         else:
-            samp = samp[:, 0]
-        pix_rescale = self.inverse_cdf(samp)
-        sample = np.empty((len(pix_rescale), 2))
-        dist_samples = np.empty((len(pix_rescale)))
-        for i, val in enumerate(pix_rescale):
-            theta, ra = self.hp.pix2ang(self.nside, int(round(val)))
-            dec = 0.5 * np.pi - theta
-            sample[i, :] = self.draw_from_pixel(ra, dec, int(round(val)))
-            if self.distance:
-                self.update_distance(int(round(val)))
-                dist_samples[i] = self.distance_icdf(dist_samp[i])
-        if self.distance:
-            sample = np.row_stack([sample[:, 0], sample[:, 1], dist_samples])
+            sample = np.column_stack([ra, dec])
         return sample.reshape((-1, self.num_vars))
 
+    def _pixels_from_unit(self, samp):
+        """
+        Map values on the unit interval onto pixel indices using the cumulative pixel probability
+        """
+        return np.minimum(np.searchsorted(self.cdf, samp, side="right"), self.npix - 1)
+
+    def _draw_from_pixels(self, pixels):
+        """
+        Uniformly draw ra and dec values within each of the given pixels
+
+        Each pixel is split into its nested sub-pixels at the highest HealPix order and one of these is chosen at
+        random, the sub-pixels all have equal area so the centre of the chosen sub-pixel is a uniform draw from the
+        pixel up to a resolution of a fraction of a milliarcsecond.
+
+        Parameters
+        ----------
+        pixels : array_like
+            indices of the pixels to draw from
+
+        Returns
+        -------
+        ra, dec : array_like
+            right ascension and declination values inside the given pixels
+        """
+        pixels = np.asarray(pixels, dtype=int)
+        if self.multiorder:
+            orders = self.pixel_orders[pixels]
+            nested = self.nested_pixels[pixels]
+        else:
+            orders = np.full(len(pixels), int(np.log2(self.nside)))
+            nested = self.hp.ring2nest(self.nside, pixels)
+        n_sub = 4 ** (_HEALPIX_MAX_ORDER - orders.astype(np.int64))
+        sub_pixels = nested * n_sub + np.random.randint(0, n_sub, dtype=np.int64)
+        theta, ra = self.hp.pix2ang(2 ** _HEALPIX_MAX_ORDER, sub_pixels, nest=True)
+        return ra, 0.5 * np.pi - theta
+
+    def _pixels_from_angles(self, ra, dec):
+        """
+        Find the indices of the pixels containing the given ra and dec values
+        """
+        theta = 0.5 * np.pi - np.asarray(dec)
+        if self.multiorder:
+            nested = self.hp.ang2pix(2 ** _HEALPIX_MAX_ORDER, theta, ra, nest=True)
+            idxs = np.searchsorted(self._sorted_starts, nested, side="right") - 1
+            return self._sorted_pixels[idxs]
+        return self.hp.ang2pix(self.nside, theta, ra)
+
+    def _distances_from_unit(self, pixels, samp, n_grid=1000, block_size=1000):
+        """
+        Map values on the unit interval onto distances using the conditional distance distribution along the line of
+        sight of each pixel
+
+        The inverse cdf of :math:`r^2 \\mathcal{N}(r; \\mu, \\sigma)` is computed on a grid spanning the region with
+        support inside the prior bounds for each distinct pixel, in blocks of at most `block_size` pixels.
+
+        Parameters
+        ----------
+        pixels : array_like
+            pixel index for each sample
+        samp : array_like
+            values on the unit interval
+        n_grid : int
+            number of distance grid points per pixel
+        block_size : int
+            maximum number of distinct pixels to evaluate at once
+
+        Returns
+        -------
+        distances : array_like
+            the distance for each sample, samples in pixels without a valid distance estimate are set to 0
+        """
+        pixels = np.asarray(pixels, dtype=int)
+        samp = np.asarray(samp, dtype=float)
+        distances = np.zeros(len(pixels))
+        valid = np.isfinite(self.distmu[pixels]) & (self.distmu[pixels] > 0)
+        unique, inverse = np.unique(pixels[valid], return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        valid_idxs = np.where(valid)[0][order]
+        inverse = inverse[order]
+        lower, upper = self.bounds[self.names[-1]]
+        xx = np.linspace(0, 1, n_grid)
+        for start in range(0, len(unique), block_size):
+            block = unique[start:start + block_size]
+            mu = self.distmu[block][:, None]
+            sigma = self.distsigma[block][:, None]
+            low = np.maximum(max(lower, 0), mu - 10 * sigma)
+            high = np.maximum(np.minimum(upper, mu + 10 * sigma), low)
+            rs = low + (high - low) * xx
+            pdfs = rs ** 2 * np.exp(-(rs - mu) ** 2 / (2 * sigma ** 2))
+            cdfs = np.zeros_like(rs)
+            cdfs[:, 1:] = np.cumsum((pdfs[:, 1:] + pdfs[:, :-1]) * np.diff(rs, axis=1), axis=1)
+            totals = cdfs[:, -1:]
+            cdfs = np.divide(cdfs, totals, out=np.tile(xx, (len(block), 1)), where=totals > 0)
+
+            first, last = np.searchsorted(inverse, [start, start + len(block)])
+            rows = inverse[first:last] - start
+            idxs = valid_idxs[first:last]
+            flat = np.searchsorted((cdfs + 2 * np.arange(len(block))[:, None]).ravel(),
+                                   samp[idxs] + 2 * rows, side="right")
+            cols = np.clip(flat - rows * n_grid, 1, n_grid - 1)
+            cdf_low = cdfs[rows, cols - 1]
+            cdf_high = cdfs[rows, cols]
+            weight = np.divide(samp[idxs] - cdf_low, cdf_high - cdf_low,
+                               out=np.zeros(len(rows)), where=cdf_high > cdf_low)
+            weight = np.clip(weight, 0, 1)
+            distances[idxs] = rs[rows, cols - 1] + weight * (rs[rows, cols] - rs[rows, cols - 1])
+        return distances
+
     def update_distance(self, pix_idx):
         """
         Method to update the conditional distance distributions at given pixel used for distance handling in the
@@ -958,10 +1098,7 @@ class HealPixMapPriorDist(BaseJointPriorDist):
         cdfs = np.cumsum(pdfs) / np.sum(pdfs)
 
         def sample_distance(n):
-            gaussian = norm(loc=self.distmu[pix_idx], scale=self.distsigma[pix_idx]).rvs(size=100 * n)
-            probs = self._check_norm(gaussian[gaussian > 0] ** 2)
-            ds = np.random.choice(gaussian[gaussian > 0], p=probs, size=n, replace=True)
-            return ds
+            return self._distances_from_unit(np.full(n, pix_idx), np.random.uniform(0, 1, n))
 
         self.distance_dist = sample_distance
         self.distance_icdf = interp1d(cdfs, self.rs)
@@ -990,8 +1127,7 @@ class HealPixMapPriorDist(BaseJointPriorDist):
         """
         Overwrites the _sample method of BaseJoint Prior. Picks a pixel value according to their probabilities, then
         uniformly samples ra, and decs that are contained in chosen pixel. If the PriorDist includes distance it then
-        updates the distance distributions and will sample according to the conditional distance distribution along a
-        given line of sight
+        samples according to the conditional distance distribution along the line of sight of the chosen pixel
 
         Parameters
         ----------
@@ -1005,26 +1141,12 @@ class HealPixMapPriorDist(BaseJointPriorDist):
         sample : array_like
             sample of ra, and dec (and distance if 3D=True)
         """
-        pixel_choices = np.arange(self.npix)
-        pixel_probs = self._check_norm(self.prob)
-        sample_pix = np.random.choice(pixel_choices, size=size, p=pixel_probs, replace=True)
-        sample = np.empty((size, self.num_vars))
-        for samp in range(size):
-            theta, ra = self.hp.pix2ang(self.nside, sample_pix[samp])
-            dec = 0.5 * np.pi - theta
-            if self.distance:
-                self.update_distance(sample_pix[samp])
-                dist = self.draw_distance(sample_pix[samp])
-                ra_dec = self.draw_from_pixel(ra, dec, sample_pix[samp])
-                sample[samp, :] = [ra_dec[0], ra_dec[1], dist]
-            else:
-                sample[samp, :] = self.draw_from_pixel(ra, dec, sample_pix[samp])
-        return sample.reshape((-1, self.num_vars))
+        return self._rescale(np.random.uniform(0, 1, (size, self.num_vars)))
 
     def draw_distance(self, pix):
         """
-        Method to recursively draw a distance value from the given set distance distribution and check that it is in
-        the bounds
+        Method to draw a distance value from the conditional distance distribution at the given pixel within the
+        bounds
 
         Parameters
         ----------
@@ -1037,18 +1159,11 @@ class HealPixMapPriorDist(BaseJointPriorDist):
         dist : float
             sample drawn from the distance distribution at set pixel index
         """
-        if self.distmu[pix] == np.inf or self.distmu[pix] <= 0:
-            return 0
-        dist = self.distance_dist(1)
-        name = self.names[-1]
-        if (dist > self.bounds[name][1]) | (dist < self.bounds[name][0]):
-            self.draw_distance(pix)
-        else:
-            return dist
+        return self._distances_from_unit(np.array([pix]), np.random.uniform(0, 1, 1))[0]
 
     def draw_from_pixel(self, ra, dec, pix):
         """
-        Recursive function to uniformly draw ra, and dec values that are located in the given pixel
+        Function to uniformly draw ra, and dec values that are located in the given pixel
 
         Parameters
         ----------
@@ -1064,14 +1179,8 @@ class HealPixMapPriorDist(BaseJointPriorDist):
         ra_dec : tuple
             this returns a tuple of ra, and dec sampled uniformly that are in the pixel given
         """
-        if not self.check_in_pixel(ra, dec, pix):
-            self.draw_from_pixel(ra, dec, pix)
-        return np.array(
-            [
-                np.random.uniform(ra - self.pixel_length, ra + self.pixel_length),
-                np.random.uniform(dec - self.pixel_length, dec + self.pixel_length),
-            ]
-        )
+        ras, decs = self._draw_from_pixels(np.array([pix]))
+        return np.array([ras[0], decs[0]])
 
     def check_in_pixel(self, ra, dec, pix):
         """
@@ -1094,9 +1203,7 @@ class HealPixMapPriorDist(BaseJointPriorDist):
         for val, name in zip([ra, dec], self.names):
             if (val < self.bounds[name][0]) or (val > self.bounds[name][1]):
                 return False
-        phi, theta = ra, 0.5 * np.pi - dec
-        pixel = self.hp.ang2pix(self.nside, theta, phi)
-        return pix == pixel
+        return pix == self._pixels_from_angles(ra, dec)
 
     def _ln_prob(self, samp, lnprob, outbounds):
         """
@@ -1116,23 +1223,27 @@ class HealPixMapPriorDist(BaseJointPriorDist):
         lnprob : array_like
             lnprob values at each sample
         """
-        for i in range(samp.shape[0]):
-            if not outbounds[i]:
-                if self.distance:
-                    phi, dec, dist = samp[0]
-                else:
-                    phi, dec = samp[0]
-                theta = 0.5 * np.pi - dec
-                pixel = self.hp.ang2pix(self.nside, theta, phi)
-                lnprob[i] = np.log(self.prob[pixel] / self.pixel_area)
-                if self.distance:
-                    self.update_distance(pixel)
-                    lnprob[i] += np.log(self.distance_pdf(dist) * dist ** 2)
-        lnprob[outbounds] = -np.inf
+        inbounds = ~np.asarray(outbounds, dtype=bool)
+        samp = samp[inbounds]
+        pixels = self._pixels_from_angles(samp[:, 0], samp[:, 1])
+        if self.multiorder:
+            areas = self.pixel_areas[pixels]
+        else:
+            areas = self.pixel_area
+        with np.errstate(divide="ignore"):
+            values = np.log(self.prob[pixels] / areas)
+            if self.distance:
+                dist = samp[:, 2]
+                values += np.log(
+                    self.distnorm[pixels] * dist ** 2
+                    * norm.pdf(dist, loc=self.distmu[pixels], scale=self.distsigma[pixels])
+                )
+        lnprob[inbounds] = values
+        lnprob[~inbounds] = -np.inf
         return lnprob
 
     def __eq__(self, other):
-        skip_keys = ["_all_interped", "inverse_cdf", "distance_pdf", "distance_dist", "distance_icdf"]
+        skip_keys = ["distance_pdf", "distance_dist", "distance_icdf"]
         if self.__class__ != other.__class__:
             return False
         if sorted(self.__dict__.keys()) != sorted(other.__dict__.keys()):
@@ -5,6 +5,7 @@ from math import fmod
 
 import numpy as np
 from scipy.interpolate import interp1d
+from scipy.special import i0e
 import matplotlib.pyplot as plt
 
 from ..core.utils import (ra_dec_to_theta_phi,
@@ -147,6 +148,125 @@ def get_polarization_tensor(ra, dec, time, psi, mode):
         raise ValueError("{} not a polarization mode!".format(mode))
 
 
+def greenwich_mean_sidereal_time(time):
+    """
+    Calculate the Greenwich mean sidereal time for an array of GPS times
+
+    `lal.GreenwichMeanSiderealTime` is called once for each unique time.
+
+    Parameters
+    -------
+    time: float, array_like
+        GPS time(s) in the geocentric frame
+
+    Returns
+    -------
+    float, array_like: The Greenwich mean sidereal time(s) in radians modulo
+        2 pi
+    """
+    time = np.asarray(time, dtype=float)
+    unique_times, inverse = np.unique(time, return_inverse=True)
+    gmst = np.array([fmod(lal.GreenwichMeanSiderealTime(float(tt)), 2 * np.pi)
+                     for tt in unique_times])
+    gmst = gmst[inverse].reshape(time.shape)
+    if gmst.ndim == 0:
+        return float(gmst)
+    return gmst
+
+
+def time_delay_geocentric_batch(detector1, detector2, ra, dec, time=None, gmst=None):
+    """
+    Calculate time delay between two detectors in geocentric coordinates for
+    many sky positions and times at once, see `time_delay_geocentric`.
+
+    Parameters
+    -------
+    detector1: array_like
+        Cartesian coordinate vector for the first detector in the geocentric frame
+    detector2: array_like
+        Cartesian coordinate vector for the second detector in the geocentric frame
+    ra: array_like
+        Right ascension of the source in radians
+    dec: array_like
+        Declination of the source in radians
+    time: array_like, optional
+        GPS time in the geocentric frame, only required if gmst is not given
+    gmst: array_like, optional
+        Precomputed Greenwich mean sidereal time in radians
+
+    Returns
+    -------
+    array_like: Time delay between the two detectors in the geocentric frame
+    """
+    if gmst is None:
+        gmst = greenwich_mean_sidereal_time(time)
+    theta, phi = ra_dec_to_theta_phi(np.asarray(ra), np.asarray(dec), gmst)
+    omega = np.array([np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)])
+    delta_d = np.asarray(detector2) - np.asarray(detector1)
+    return np.einsum('i...,i->...', omega, delta_d) / speed_of_light
+
+
+def get_polarization_tensors_batch(ra, dec, time, psi, modes, gmst=None):
+    """
+    Calculate the polarization tensors for many sky locations and times at
+    once, see `get_polarization_tensor`.
+
+    Parameters
+    -------
+    ra: array_like
+        right ascension in radians
+    dec: array_like
+        declination in radians
+    time: array_like
+        geocentric GPS time, not used if gmst is given
+    psi: array_like
+        binary polarisation angle counter-clockwise about the direction of propagation
+    modes: list
+        polarisation modes
+    gmst: array_like, optional
+        Precomputed Greenwich mean sidereal time in radians
+
+    Returns
+    -------
+    dict: The polarization tensors for each mode with shape (..., 3, 3)
+    """
+    if gmst is None:
+        gmst = greenwich_mean_sidereal_time(time)
+    ra, dec, gmst, psi = np.broadcast_arrays(ra, dec, gmst, psi)
+    theta, phi = ra_dec_to_theta_phi(ra, dec, gmst)
+    u = np.stack([np.cos(phi) * np.cos(theta), np.cos(theta) * np.sin(phi), -np.sin(theta)], axis=-1)
+    v = np.stack([-np.sin(phi), np.cos(phi), np.zeros_like(phi)], axis=-1)
+    sin_psi = np.sin(psi)[..., np.newaxis]
+    cos_psi = np.cos(psi)[..., np.newaxis]
+    m = -u * sin_psi - v * cos_psi
+    n = -u * cos_psi + v * sin_psi
+
+    def outer(aa, bb):
+        return aa[..., :, np.newaxis] * bb[..., np.newaxis, :]
+
+    tensors = dict()
+    omega = None
+    for mode in modes:
+        if mode.lower() == 'plus':
+            tensors[mode] = outer(m, m) - outer(n, n)
+        elif mode.lower() == 'cross':
+            tensors[mode] = outer(m, n) + outer(n, m)
+        elif mode.lower() == 'breathing':
+            tensors[mode] = outer(m, m) + outer(n, n)
+        elif mode.lower() in ['longitudinal', 'x', 'y']:
+            if omega is None:
+                omega = np.cross(m, n)
+            if mode.lower() == 'longitudinal':
+                tensors[mode] = outer(omega, omega)
+            elif mode.lower() == 'x':
+                tensors[mode] = outer(m, omega) + outer(omega, m)
+            else:
+                tensors[mode] = outer(n, omega) + outer(omega, n)
+        else:
+            raise ValueError("{} not a polarization mode!".format(mode))
+    return tensors
+
+
 def get_vertex_position_geocentric(latitude, longitude, elevation):
     """
     Calculate the position of the IFO vertex in geocentric coordinates in meters.
@@ -279,6 +399,28 @@ def optimal_snr_squared(signal, power_spectral_density, duration):
     return noise_weighted_inner_product(signal, signal, power_spectral_density, duration)
 
 
+def ln_i0(value):
+    """
+    A numerically stable method to evaluate ln(I_0) a modified Bessel function
+    of order 0 used in the phase-marginalized likelihood.
+
+    Uses the exponentially scaled Bessel function so that large arguments
+    do not overflow.
+
+    Parameters
+    ----------
+    value: array_like
+        Value(s) at which to evaluate the function
+
+    Returns
+    -------
+    array_like:
+        The natural logarithm of the bessel function
+    """
+    value = np.abs(value)
+    return np.log(i0e(value)) + value
+
+
 __cached_euler_matrix = None
 __cached_delta_x = None
 
@@ -378,7 +520,7 @@ def zenith_azimuth_to_ra_dec(zenith, azimuth, geocent_time, ifos):
         The zenith and azimuthal angles in the sky frame.
     """
     theta, phi = zenith_azimuth_to_theta_phi(zenith, azimuth, ifos)
-    gmst = lal.GreenwichMeanSiderealTime(geocent_time)
+    gmst = greenwich_mean_sidereal_time(geocent_time)
     ra, dec = theta_phi_to_ra_dec(theta, phi, gmst)
     ra = ra % (2 * np.pi)
     return ra, dec
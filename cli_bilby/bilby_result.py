@@ -20,6 +20,18 @@ To generate a corner plot for all the files in outdir
 This is effectively calling `plot_corner()` on each of the result files
 individually. Note that passing extra commands in is not yet implemented.
 
+To print the Bayes factors of many results, reading them with 8 processes:
+
+    $ bilby_result -r outdir/*json -b --npool 8
+
+To merge many runs one at a time, writing the merged posterior directly to a
+columnar result file, so that only one run is held in memory:
+
+    $ bilby_result -r outdir/*json --merge -e columnar
+
+When only the metadata are required (e.g., for `--bayes` or `--print` of
+non-sample attributes) the posteriors are not decoded.
+
 """
 import argparse
 import pandas as pd
@@ -37,11 +49,11 @@ def setup_command_line_args():
     parser.add_argument(
         "-r", "--results", nargs='+', dest="option_results", default=list(),
         help="List of results files (alternative to passing results as a positional argument).")
-    parser.add_argument("-c", "--convert", type=str, choices=['json', 'hdf5'],
+    parser.add_argument("-c", "--convert", type=str, choices=['json', 'hdf5', 'columnar'],
                         help="Convert all results.", default=False)
     parser.add_argument("-m", "--merge", action='store_true',
                         help="Merge the set of runs, output saved using the outdir and label")
-    parser.add_argument("-e", "--extension", type=str, choices=["json", "hdf5"],
+    parser.add_argument("-e", "--extension", type=str, choices=["json", "hdf5", "columnar"],
                         default=True, help="Use given extension for the merged output file.")
     parser.add_argument("-g", "--gzip", action="store_true",
                         help="Gzip the merged output results file if using JSON format.")
@@ -55,6 +67,8 @@ def setup_command_line_args():
                         help="Result dictionary keys to print.")
     parser.add_argument("--call", nargs='+', default=None,
                         help="Result dictionary methods to call (no argument passing available).")
+    parser.add_argument("-n", "--npool", type=int, default=1,
+                        help="Number of processes used to read in the results.")
     parser.add_argument("--ipython", action='store_true',
                         help=("For each result given, drops the user into an "
                               "IPython shell with the result loaded in"))
@@ -72,11 +86,23 @@ def setup_command_line_args():
     return args
 
 
-def read_in_results(filename_list):
-    results_list = []
-    for filename in filename_list:
-        results_list.append(bilby.core.result.read_in_result(filename=filename))
-    return bilby.core.result.ResultList(results_list)
+def read_in_results(filename_list, npool=1, metadata_only=False):
+    return bilby.core.result.ResultList(
+        filename_list, npool=npool, metadata_only=metadata_only)
+
+
+def only_metadata_required(args):
+    """ Check if the requested operations only need the result metadata """
+    if args.convert or args.call is not None or args.ipython:
+        return False
+    if args.merge and args.extension != "columnar":
+        return False
+    if args.keys is not None:
+        for key in args.keys:
+            for attr in bilby.core.result._COLUMNAR_ARRAY_ATTRS:
+                if key in "_{}".format(attr):
+                    return False
+    return True
 
 
 def print_bayes_factors(results_list):
@@ -115,7 +141,9 @@ def print_matches(results_list, args):
 
 def main():
     args = setup_command_line_args()
-    results_list = read_in_results(args.results)
+    results_list = read_in_results(
+        args.results, npool=args.npool,
+        metadata_only=only_metadata_required(args))
     if args.convert:
         for r in results_list:
             r.save_to_file(extension=args.convert, outdir=args.outdir)
@@ -129,7 +157,10 @@ def main():
         print_bayes_factors(results_list)
     if args.ipython:
         drop_to_ipython(results_list)
-    if args.merge:
+    if args.merge and args.extension == "columnar":
+        bilby.core.result.combine_result_files(
+            args.results, outdir=args.outdir, label=args.label, npool=args.npool)
+    elif args.merge:
         result = results_list.combine()
         if args.label is not None:
             result.label = args.label
@@ -546,6 +546,91 @@ class TestInterferometer(unittest.TestCase):
             m.return_value = 1
             self.assertEqual(self.ifo.time_delay_from_geocenter(1, 2, 3), 1)
 
+    def test_detector_response_inner_products(self):
+        ifo = bilby.gw.detector.get_empty_interferometer("H1")
+        ifo.set_strain_data_from_power_spectral_density(
+            sampling_frequency=512, duration=4, start_time=0)
+        frequencies = ifo.frequency_array
+        polarizations = dict(
+            plus=1e-22 * np.exp(1j * frequencies) / (1 + frequencies),
+            cross=1e-22 * np.exp(2j * frequencies) / (1 + frequencies))
+        parameters = dict(ra=1.2, dec=-0.3, geocent_time=2, psi=0.4)
+
+        def assert_matches_unfused():
+            signal = ifo.get_detector_response(polarizations, parameters)
+            d_inner_h, optimal_snr_squared = \
+                ifo.get_detector_response_inner_products(polarizations, parameters)
+            self.assertAlmostEqual(d_inner_h, ifo.inner_product(signal), 10)
+            self.assertAlmostEqual(
+                optimal_snr_squared, ifo.optimal_snr_squared(signal).real, 10)
+
+        assert_matches_unfused()
+        ifo.set_strain_data_from_power_spectral_density(
+            sampling_frequency=512, duration=4, start_time=0)
+        assert_matches_unfused()
+        ifo.minimum_frequency = 30
+        assert_matches_unfused()
+        ifo.power_spectral_density = bilby.gw.detector.PowerSpectralDensity.from_aligo()
+        assert_matches_unfused()
+
+    def test_cached_data_products_invalidated(self):
+        ifo = bilby.gw.detector.get_empty_interferometer("H1")
+        ifo.set_strain_data_from_power_spectral_density(
+            sampling_frequency=512, duration=4, start_time=0)
+        psd = ifo.power_spectral_density_array
+        self.assertIs(
+            ifo.inverse_power_spectral_density_array,
+            ifo.inverse_power_spectral_density_array)
+        self.assertTrue(np.array_equal(
+            ifo.inverse_power_spectral_density_array, 1 / psd))
+        self.assertTrue(np.array_equal(
+            ifo.masked_frequency_array, ifo.frequency_array[ifo.frequency_mask]))
+
+        ifo.power_spectral_density.psd_array = ifo.power_spectral_density.psd_array * 2
+        self.assertTrue(np.allclose(ifo.power_spectral_density_array, psd * 2))
+
+        ifo.minimum_frequency = 30
+        self.assertTrue(np.array_equal(
+            ifo.masked_frequency_array, ifo.frequency_array[ifo.frequency_mask]))
+
+        strain = ifo.strain_data.frequency_domain_strain
+        ifo.strain_data.frequency_domain_strain = strain * 2
+        self.assertTrue(np.allclose(
+            ifo.noise_weighted_frequency_domain_strain,
+            2 * strain / ifo.power_spectral_density_array))
+        self.assertTrue(np.allclose(
+            ifo.whitened_frequency_domain_strain,
+            2 * strain / ifo.amplitude_spectral_density_array))
+
+    def test_cached_data_products_read_only(self):
+        ifo = bilby.gw.detector.get_empty_interferometer("H1")
+        ifo.set_strain_data_from_power_spectral_density(
+            sampling_frequency=512, duration=4, start_time=0)
+        with self.assertRaises(ValueError):
+            ifo.inverse_power_spectral_density_array[0] = 0
+        with self.assertRaises(ValueError):
+            ifo.noise_weighted_frequency_domain_strain[0] = 0
+
+    def test_public_data_products_are_writable_copies(self):
+        ifo = bilby.gw.detector.get_empty_interferometer("H1")
+        ifo.set_strain_data_from_power_spectral_density(
+            sampling_frequency=512, duration=4, start_time=0)
+        expected = ifo.power_spectral_density.get_power_spectral_density_array(
+            frequency_array=ifo.strain_data.frequency_array)
+        whitened = ifo.whitened_frequency_domain_strain.copy()
+        psd = ifo.power_spectral_density_array
+        psd[ifo.frequency_mask] = 0
+        asd = ifo.amplitude_spectral_density_array
+        asd *= 2
+        strain = ifo.whitened_frequency_domain_strain
+        strain *= 2
+        self.assertTrue(np.array_equal(ifo.power_spectral_density_array, expected))
+        self.assertTrue(np.array_equal(
+            ifo.amplitude_spectral_density_array, expected ** 0.5))
+        self.assertTrue(np.array_equal(ifo.whitened_frequency_domain_strain, whitened))
+        self.assertTrue(np.array_equal(
+            ifo.inverse_power_spectral_density_array, 1 / expected))
+
     def test_vertex_position_geocentric(self):
         with mock.patch("bilby.gw.utils.get_vertex_position_geocentric") as m:
             m.return_value = 1
@@ -784,6 +869,20 @@ class TestInterferometerStrainData(unittest.TestCase):
                 np.array_equal(self.ifosd.frequency_mask, [False, True, False])
             )
 
+    def test_version_incremented_on_change(self):
+        version = self.ifosd.version
+        self.ifosd.set_from_zero_noise(sampling_frequency=64, duration=4)
+        self.assertGreater(self.ifosd.version, version)
+        _ = self.ifosd.frequency_domain_strain
+        version = self.ifosd.version
+        _ = self.ifosd.frequency_domain_strain
+        self.assertEqual(self.ifosd.version, version)
+        self.ifosd.maximum_frequency = 15
+        self.assertGreater(self.ifosd.version, version)
+        version = self.ifosd.version
+        self.ifosd.frequency_domain_strain = np.ones_like(self.ifosd.frequency_array)
+        self.assertGreater(self.ifosd.version, version)
+
     def test_set_data_fails(self):
         with mock.patch("bilby.core.utils.create_frequency_series") as m:
             m.return_value = [1, 2, 3]
@@ -1405,6 +1504,24 @@ class TestInterferometerList(unittest.TestCase):
         ifos.set_strain_data_from_power_spectral_densities(2048, 4)
         ifos.plot_data(outdir=self.outdir)
 
+    def test_antenna_responses_and_time_delays(self):
+        ifos = bilby.gw.detector.InterferometerList(["H1", "L1", "V1"])
+        ra = np.random.uniform(0, 2 * np.pi, 5)
+        dec = np.random.uniform(-np.pi / 2, np.pi / 2, 5)
+        psi = np.random.uniform(0, np.pi, 5)
+        time = np.array([1126259642.0, 1126259642.0, 1126259642.1, 1126259643.0, 1126259700.0])
+        output = ifos.antenna_responses_and_time_delays(
+            ra, dec, time, psi, modes=["plus", "cross"])
+        for ifo in ifos:
+            for ii in range(5):
+                for mode in ["plus", "cross"]:
+                    self.assertAlmostEqual(
+                        output[ifo.name][mode][ii],
+                        ifo.antenna_response(ra[ii], dec[ii], time[ii], psi[ii], mode), 12)
+                self.assertAlmostEqual(
+                    output[ifo.name]["time_delay"][ii],
+                    ifo.time_delay_from_geocenter(ra[ii], dec[ii], time[ii]), 15)
+
 
 class TestPowerSpectralDensityWithoutFiles(unittest.TestCase):
     def setUp(self):
@@ -332,3 +332,14 @@ class TestGrid(unittest.TestCase):
         assert np.array_equal(newgrid.ln_posterior, self.grid.ln_posterior)
 
         del newgrid
+
+    def test_grid_npool_matches_serial(self):
+        grid = bilby.core.grid.Grid(
+            label="label",
+            outdir="outdir",
+            priors=self.priors,
+            grid_size=self.grid_size,
+            likelihood=self.likelihood,
+            npool=2,
+        )
+        self.assertTrue(np.allclose(grid.ln_likelihood, self.grid.ln_likelihood))
@@ -2,7 +2,9 @@ from __future__ import division, absolute_import
 import unittest
 import numpy
 import lalsimulation as lalsim
+import bilby
 from bilby.gw.eos import SpectralDecompositionEOS, EOSFamily, TabularEOS
+from bilby.gw.eos.tov_solver import IntegrateTOV
 from bilby.core import utils
 
 
@@ -63,6 +65,28 @@ class TestEOSFamily(unittest.TestCase):
         self.assertAlmostEqual(EOS_FROM_SPRECTRAL_DECOMPOSITION.eos.pseudo_enthalpy_from_energy_density(ENERGY_DENSITY),
                                0.02420629785967365)
 
+    def test_batched_tov_integration_matches_single_stars(self):
+        energy_densities = numpy.logspace(-9.5, -8.7, 4)
+        reference = numpy.array([IntegrateTOV(EOS_FROM_TABLE.eos, eps).integrate_TOV(rel_err=1e-11)
+                                 for eps in energy_densities]).T
+        batch = numpy.array(IntegrateTOV(EOS_FROM_TABLE.eos, energy_densities).integrate_TOV(rel_err=1e-8))
+        numpy.testing.assert_allclose(batch, reference, rtol=1e-6)
+        # mass, radius and k2 at the default (lalsimulation) tolerance
+        batch = numpy.array(IntegrateTOV(EOS_FROM_TABLE.eos, energy_densities).integrate_TOV())
+        numpy.testing.assert_allclose(batch[:2], reference[:2], rtol=1e-4)
+        numpy.testing.assert_allclose(batch[2], reference[2], rtol=1e-2)
+
+    def test_maximum_mass_is_final_point(self):
+        self.assertTrue(numpy.all(numpy.diff(EOS_FROM_TABLE.mass) > 0))
+        self.assertEqual(EOS_FROM_TABLE.maximum_mass,
+                         EOS_FROM_TABLE.mass[-1] * bilby.gw.eos.eos.conversion_dict['mass']['m_sol'])
+
+    def test_lambda_from_mass_matches_tabulated_family(self):
+        masses = EOS_FROM_TABLE.mass[100:110] / (utils.solar_mass * utils.gravitational_constant
+                                                 / utils.speed_of_light ** 2)
+        numpy.testing.assert_allclose(EOS_FROM_TABLE.lambda_from_mass(masses),
+                                      EOS_FROM_TABLE.tidal_deformability[100:110], rtol=1e-10)
+
 
 class TestBilbyLALSimComparison(unittest.TestCase):
     def test_spectral_decomposition_MPA1(self):
@@ -1,8 +1,13 @@
 from __future__ import division, absolute_import
 import unittest
+from unittest import mock
 import os
+import tempfile
 
 import numpy as np
+import pandas as pd
+from scipy.interpolate import interp1d
+from scipy.special import logsumexp
 import bilby
 from bilby.gw.likelihood import BilbyROQParamsRangeError
 
@@ -541,6 +546,148 @@ class TestMarginalizedLikelihood(unittest.TestCase):
         with self.assertRaises(bilby.core.sampler.SamplingMarginalisedParameterError):
             bilby.run_sampler(like, new_prior)
 
+    def test_distance_lookup_table_cached_in_shared_directory(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch.dict(os.environ, dict(BILBY_CACHE_DIR=cache_dir)):
+                like = bilby.gw.likelihood.GravitationalWaveTransient(
+                    interferometers=self.interferometers,
+                    waveform_generator=self.waveform_generator,
+                    priors=self.prior.copy(),
+                    distance_marginalization=True,
+                    lookup_table_shape=(20, 40),
+                )
+                self.assertEqual(
+                    cache_dir, os.path.dirname(like.cached_lookup_table_filename))
+                self.assertTrue(os.path.isfile(like.cached_lookup_table_filename))
+                self.assertEqual((20, 40), like._dist_margd_loglikelihood_array.shape)
+                with mock.patch.object(
+                        bilby.gw.likelihood.GravitationalWaveTransient,
+                        "_create_lookup_table") as m:
+                    new_like = bilby.gw.likelihood.GravitationalWaveTransient(
+                        interferometers=self.interferometers,
+                        waveform_generator=self.waveform_generator,
+                        priors=self.prior.copy(),
+                        distance_marginalization=True,
+                        lookup_table_shape=(20, 40),
+                    )
+                    m.assert_not_called()
+                self.assertTrue(np.array_equal(
+                    like._dist_margd_loglikelihood_array,
+                    new_like._dist_margd_loglikelihood_array))
+
+    def test_distance_lookup_table_leaves_no_lock_file(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch.dict(os.environ, dict(BILBY_CACHE_DIR=cache_dir)):
+                like = bilby.gw.likelihood.GravitationalWaveTransient(
+                    interferometers=self.interferometers,
+                    waveform_generator=self.waveform_generator,
+                    priors=self.prior.copy(),
+                    distance_marginalization=True,
+                    lookup_table_shape=(10, 20),
+                )
+                self.assertEqual(
+                    [os.path.basename(like.cached_lookup_table_filename)],
+                    os.listdir(cache_dir))
+
+    def test_distance_lookup_table_built_when_cache_is_not_writable(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch.dict(os.environ, dict(BILBY_CACHE_DIR=cache_dir)):
+                with mock.patch(
+                        "bilby.gw.likelihood.atomic_savez",
+                        side_effect=PermissionError("read-only")):
+                    like = bilby.gw.likelihood.GravitationalWaveTransient(
+                        interferometers=self.interferometers,
+                        waveform_generator=self.waveform_generator,
+                        priors=self.prior.copy(),
+                        distance_marginalization=True,
+                        lookup_table_shape=(10, 20),
+                    )
+                self.assertEqual((10, 20), like._dist_margd_loglikelihood_array.shape)
+                self.assertFalse(os.path.isfile(like.cached_lookup_table_filename))
+                self.assertEqual([], os.listdir(cache_dir))
+
+    def test_distance_lookup_table_filename_depends_on_prior(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch.dict(os.environ, dict(BILBY_CACHE_DIR=cache_dir)):
+                filenames = list()
+                for maximum in [4000, 5000]:
+                    prior = self.prior.copy()
+                    prior["luminosity_distance"] = bilby.gw.prior.UniformSourceFrame(
+                        minimum=100, maximum=maximum, name="luminosity_distance")
+                    like = bilby.gw.likelihood.GravitationalWaveTransient(
+                        interferometers=self.interferometers,
+                        waveform_generator=self.waveform_generator,
+                        priors=prior,
+                        distance_marginalization=True,
+                        lookup_table_shape=(10, 20),
+                    )
+                    filenames.append(like.cached_lookup_table_filename)
+                self.assertNotEqual(filenames[0], filenames[1])
+
+    def distance_marginalized_likelihood(self, **kwargs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch.dict(os.environ, dict(BILBY_CACHE_DIR=cache_dir)):
+                return bilby.gw.likelihood.GravitationalWaveTransient(
+                    interferometers=self.interferometers,
+                    waveform_generator=self.waveform_generator,
+                    priors=self.prior.copy(),
+                    distance_marginalization=True,
+                    lookup_table_shape=(50, 100),
+                    **kwargs
+                )
+
+    def test_time_sample_without_time_marginalization(self):
+        like = self.distance_marginalized_likelihood()
+        like.parameters.update(self.parameters)
+        like.parameters["luminosity_distance"] = like._ref_dist
+        new_time = like.generate_time_sample_from_marginalized_likelihood()
+        self.assertGreaterEqual(new_time, self.prior["geocent_time"].minimum)
+        self.assertLessEqual(new_time, self.prior["geocent_time"].maximum)
+
+    def test_reconstruction_matches_per_sample_reconstruction(self):
+        injection = self.parameters.copy()
+        injection["luminosity_distance"] = 1000.0
+        self.interferometers.inject_signal(
+            waveform_generator=self.waveform_generator, parameters=injection)
+        like = self.distance_marginalized_likelihood(
+            time_marginalization=True, phase_marginalization=True)
+        n_samples = 100
+        samples = pd.DataFrame(
+            {key: np.full(n_samples, value) for key, value in self.parameters.items()})
+        samples["geocent_time"] = float(self.interferometers.start_time)
+        samples["luminosity_distance"] = like._ref_dist
+        samples["phase"] = 0.0
+        samples["time_jitter"] = np.random.uniform(
+            -like._delta_tc / 2, like._delta_tc / 2, n_samples)
+        vectorised = bilby.gw.conversion.generate_posterior_samples_from_marginalized_likelihood(
+            samples.copy(), like)
+        per_sample = bilby.gw.conversion._generate_posterior_samples_from_marginalized_likelihood_per_sample(
+            samples.copy(), like)
+        for key in ["geocent_time", "luminosity_distance", "phase"]:
+            std = np.std(per_sample[key])
+            self.assertLess(
+                abs(np.mean(vectorised[key]) - np.mean(per_sample[key])),
+                4 * std * (2 / n_samples) ** 0.5)
+            self.assertAlmostEqual(np.std(vectorised[key]) / std, 1, delta=0.3)
+
+    def test_build_distance_lookup_table_matches_direct_sum(self):
+        distance_array = np.linspace(100, 5000, 1000)
+        prior_array = distance_array ** 2 / np.trapz(distance_array ** 2, distance_array)
+        optimal_snr_squared_refs = np.logspace(-5, 10, 10)
+        d_inner_h_refs = np.hstack((-np.logspace(3, -3, 10), np.logspace(-3, 10, 10)))
+        weights = prior_array * (distance_array[1] - distance_array[0])
+        expected = np.array([[
+            logsumexp(d_inner_h * distance_array[0] / distance_array -
+                      optimal_snr_squared * distance_array[0] ** 2 / distance_array ** 2 / 2,
+                      b=weights)
+            for d_inner_h in d_inner_h_refs] for optimal_snr_squared in optimal_snr_squared_refs])
+        expected -= logsumexp(np.zeros_like(distance_array), b=weights)
+        for npool in [1, 2]:
+            table = bilby.gw.likelihood._build_distance_lookup_table(
+                optimal_snr_squared_refs, d_inner_h_refs, distance_array,
+                prior_array, npool=npool)
+            self.assertTrue(np.allclose(expected, table))
+
 
 class TestPhaseMarginalization(unittest.TestCase):
     def setUp(self):
@@ -746,6 +893,65 @@ class TestTimePhaseMarginalization(unittest.TestCase):
             marg_like, self.time_phase.log_likelihood_ratio(), delta=0.5
         )
 
+    def test_restricted_time_window_matches_full_segment(self):
+        """
+        Test the time marginalised likelihood restricted to the support of a
+        narrow time prior matches the sum over the full segment.
+        """
+        priors = self.priors.copy()
+        priors["geocent_time"] = bilby.prior.Uniform(
+            minimum=self.parameters["geocent_time"] - 0.1,
+            maximum=self.parameters["geocent_time"] + 0.1,
+        )
+        like = bilby.gw.likelihood.GravitationalWaveTransient(
+            interferometers=self.interferometers,
+            waveform_generator=self.waveform_generator,
+            time_marginalization=True,
+            priors=priors,
+        )
+        self.assertIsNotNone(like._pruned_fft_length)
+        self.assertLess(
+            like._time_window.stop - like._time_window.start, len(like._times) / 4)
+        like.parameters = self.parameters.copy()
+        like.parameters["time_jitter"] = 0.3 * like._delta_tc
+        parameters = like.parameters.copy()
+        parameters["geocent_time"] += parameters["time_jitter"]
+        ifo = self.interferometers[0]
+        signal = ifo.get_detector_response(
+            self.waveform_generator.frequency_domain_strain(parameters), parameters)
+        d_inner_h_tc_array = 4 / self.duration * np.fft.fft(
+            signal[:-1] * ifo.noise_weighted_frequency_domain_strain.conjugate()[:-1])
+        optimal_snr_squared = ifo.optimal_snr_squared(signal=signal).real
+        time_prior_array = like.priors["geocent_time"].prob(
+            like._times + parameters["time_jitter"]) * like._delta_tc
+        expected = logsumexp(
+            d_inner_h_tc_array.real - optimal_snr_squared / 2, b=time_prior_array)
+        self.assertAlmostEqual(expected, like.log_likelihood_ratio(), places=8)
+
+    def test_reconstruct_marginalized_parameters(self):
+        n_samples = 20
+        samples = {key: np.full(n_samples, value) for key, value in self.parameters.items()}
+        samples["geocent_time"] = np.full(n_samples, self.interferometers.start_time)
+        samples["phase"] = np.zeros(n_samples)
+        samples["time_jitter"] = np.random.uniform(
+            -self.time_phase._delta_tc / 2, self.time_phase._delta_tc / 2, n_samples)
+        new_samples = self.time_phase.reconstruct_marginalized_parameters(samples)
+        prior = self.time_phase.priors["geocent_time"]
+        self.assertTrue(all(new_samples["geocent_time"] >= prior.minimum))
+        self.assertTrue(all(new_samples["geocent_time"] <= prior.maximum))
+        self.assertTrue(all(new_samples["phase"] >= 0))
+        self.assertTrue(all(new_samples["phase"] <= 2 * np.pi))
+        self.assertEqual(
+            len(np.unique(new_samples["geocent_time"])), n_samples)
+
+    def test_draw_from_gridded_posteriors_inverts_cdf(self):
+        grid = np.linspace(0, 1, 1001)
+        posteriors = np.vstack([grid, np.ones_like(grid)])
+        uniforms = np.array([0.25, 0.3])
+        draws = bilby.gw.likelihood._draw_from_gridded_posteriors(
+            grid, posteriors, uniforms)
+        self.assertTrue(np.allclose(draws, [0.5, 0.3], atol=1e-5))
+
 
 class TestROQLikelihood(unittest.TestCase):
     def setUp(self):
@@ -766,6 +972,11 @@ class TestROQLikelihood(unittest.TestCase):
         if roq_dir is None:
             raise Exception("Unable to load ROQ basis: cannot proceed with tests")
 
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.environment = mock.patch.dict(
+            os.environ, dict(BILBY_CACHE_DIR=self.cache_directory.name))
+        self.environment.start()
+
         linear_matrix_file = "{}/B_linear.npy".format(roq_dir)
         quadratic_matrix_file = "{}/B_quadratic.npy".format(roq_dir)
 
@@ -869,6 +1080,8 @@ class TestROQLikelihood(unittest.TestCase):
         )
 
     def tearDown(self):
+        self.environment.stop()
+        self.cache_directory.cleanup()
         del (
             self.roq,
             self.non_roq,
@@ -1025,6 +1238,171 @@ class TestROQLikelihood(unittest.TestCase):
             )
 
 
+class TestROQWeightConstruction(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(1)
+        self.ifos = bilby.gw.detector.InterferometerList(["H1", "L1"])
+        self.ifos.set_strain_data_from_power_spectral_densities(
+            sampling_frequency=512, duration=4, start_time=0)
+        n_frequencies = sum(self.ifos[0].frequency_mask)
+        self.linear_matrix = (
+            np.random.normal(0, 1, (n_frequencies, 10)) +
+            1j * np.random.normal(0, 1, (n_frequencies, 10)))
+        self.quadratic_matrix = np.random.normal(0, 1, (n_frequencies, 5))
+        self.directory = tempfile.TemporaryDirectory()
+        self.linear_matrix_file = os.path.join(self.directory.name, "B_linear.npy")
+        self.quadratic_matrix_file = os.path.join(self.directory.name, "B_quadratic.npy")
+        np.save(self.linear_matrix_file, self.linear_matrix.T)
+        np.save(self.quadratic_matrix_file, self.quadratic_matrix.T)
+        self.waveform_generator = bilby.gw.WaveformGenerator(
+            duration=4, sampling_frequency=512,
+            frequency_domain_source_model=bilby.gw.source.roq,
+            waveform_arguments=dict(
+                frequency_nodes_linear=np.arange(10.),
+                frequency_nodes_quadratic=np.arange(5.)))
+        self.priors = bilby.gw.prior.BBHPriorDict()
+        self.priors["geocent_time"] = bilby.core.prior.Uniform(1.9, 2.1)
+        self.cache_directory = os.path.join(self.directory.name, "cache")
+        self.environment = mock.patch.dict(
+            os.environ, dict(BILBY_CACHE_DIR=self.cache_directory))
+        self.environment.start()
+
+    def tearDown(self):
+        self.environment.stop()
+        self.directory.cleanup()
+
+    def _make_likelihood(self, **kwargs):
+        return bilby.gw.likelihood.ROQGravitationalWaveTransient(
+            interferometers=self.ifos,
+            waveform_generator=self.waveform_generator,
+            linear_matrix=self.linear_matrix_file,
+            quadratic_matrix=self.quadratic_matrix_file,
+            priors=self.priors,
+            **kwargs
+        )
+
+    def test_weights_are_not_cached_by_default(self):
+        self._make_likelihood()
+        self.assertFalse(os.path.isdir(self.cache_directory) and any(
+            name.startswith("roq_weights") for name in os.listdir(self.cache_directory)))
+
+    def test_weights_are_reused_from_cache(self):
+        roq = self._make_likelihood(cache_weights=True)
+        with mock.patch.object(
+                bilby.gw.likelihood.ROQGravitationalWaveTransient,
+                "_build_weights") as m:
+            new_roq = self._make_likelihood(cache_weights=True)
+            m.assert_not_called()
+        self.assertEqual(set(roq.weights.keys()), set(new_roq.weights.keys()))
+        for key in roq.weights:
+            self.assertTrue(np.array_equal(roq.weights[key], new_roq.weights[key]))
+        self.assertIsInstance(new_roq.weights["H1_linear"], np.memmap)
+
+    def test_weights_are_rebuilt_when_inputs_change(self):
+        self._make_likelihood(cache_weights=True)
+        self.ifos[0].power_spectral_density = \
+            bilby.gw.detector.PowerSpectralDensity.from_aligo()
+        with mock.patch.object(
+                bilby.gw.likelihood.ROQGravitationalWaveTransient,
+                "_build_weights") as m:
+            self._make_likelihood(cache_weights=True)
+            m.assert_called_once()
+        self.assertEqual(2, len(os.listdir(self.cache_directory)))
+
+    def test_weights_are_used_when_cache_is_not_writable(self):
+        with mock.patch(
+                "bilby.gw.likelihood._write_weights_directory",
+                side_effect=PermissionError("read-only")):
+            roq = self._make_likelihood(cache_weights=True)
+        self.assertIn("H1_linear", roq.weights)
+        self.assertFalse(any(
+            name.startswith("roq_weights") for name in os.listdir(self.cache_directory)))
+
+    def test_calculate_snrs_matches_cubic_interpolation(self):
+        roq = self._make_likelihood()
+        parameters = dict(ra=1.3, dec=-0.4, psi=0.7, geocent_time=2.0137)
+        roq.parameters.update(parameters)
+        polarizations = {
+            kind: {mode: np.random.normal(0, 1, n) + 1j * np.random.normal(0, 1, n)
+                   for mode in ["plus", "cross"]}
+            for kind, n in [("linear", 10), ("quadratic", 5)]}
+        time_samples = roq.weights["time_samples"]
+        for ifo in self.ifos:
+            snrs = roq.calculate_snrs(polarizations, ifo)
+            f_plus = ifo.antenna_response(
+                parameters["ra"], parameters["dec"], parameters["geocent_time"],
+                parameters["psi"], "plus")
+            f_cross = ifo.antenna_response(
+                parameters["ra"], parameters["dec"], parameters["geocent_time"],
+                parameters["psi"], "cross")
+            ifo_time = parameters["geocent_time"] + ifo.time_delay_from_geocenter(
+                parameters["ra"], parameters["dec"], parameters["geocent_time"])
+            closest = np.argmin(abs(time_samples - ifo_time))
+            indices = np.arange(closest - 2, closest + 3)
+            d_inner_h_tc_array = np.dot(
+                roq.weights[ifo.name + "_linear"][indices],
+                np.conjugate(f_plus * polarizations["linear"]["plus"] +
+                             f_cross * polarizations["linear"]["cross"]))
+            d_inner_h = interp1d(
+                time_samples[indices], d_inner_h_tc_array, kind="cubic")(ifo_time)
+            self.assertLess(abs(d_inner_h - snrs.d_inner_h) / abs(d_inner_h), 1e-10)
+
+    def test_five_point_spline_weights_match_interp1d(self):
+        values = np.random.normal(0, 1, 5)
+        spline = interp1d(np.arange(-2, 3), values, kind="cubic")
+        for offset in np.linspace(-1, 1, 11):
+            weights = bilby.gw.likelihood._five_point_spline_weights(offset)
+            self.assertAlmostEqual(spline(offset), np.dot(weights, values))
+
+    def test_save_and_load_npy_weights(self):
+        roq = self._make_likelihood()
+        filename = os.path.join(self.directory.name, "weights")
+        roq.save_weights(filename, format="npy")
+        weights = roq.load_weights(filename + ".npy")
+        for key in roq.weights:
+            self.assertTrue(np.array_equal(roq.weights[key], weights[key]))
+
+    def test_loaded_npy_weights_are_checked_against_inputs(self):
+        roq = self._make_likelihood()
+        filename = os.path.join(self.directory.name, "weights")
+        roq.save_weights(filename, format="npy")
+        with mock.patch.object(bilby.gw.likelihood.logger, "warning") as m:
+            self._make_likelihood(weights=filename + ".npy")
+            m.assert_not_called()
+        self.ifos[0].power_spectral_density = \
+            bilby.gw.detector.PowerSpectralDensity.from_aligo()
+        with mock.patch.object(bilby.gw.likelihood.logger, "warning") as m:
+            self._make_likelihood(weights=filename + ".npy")
+            m.assert_called_once()
+            self.assertIn("H1", m.call_args[0][0])
+            self.assertNotIn("L1", m.call_args[0][0])
+
+    def test_loaded_weights_are_checked_against_time_prior(self):
+        weights = self._make_likelihood().weights
+        with mock.patch.object(bilby.gw.likelihood.logger, "warning") as m:
+            self._make_likelihood(weights=weights)
+            m.assert_not_called()
+        self.priors["geocent_time"] = bilby.core.prior.Uniform(1.8, 2.1)
+        with mock.patch.object(bilby.gw.likelihood.logger, "warning") as m:
+            self._make_likelihood(weights=weights)
+            m.assert_called_once()
+            self.assertIn("time_samples", m.call_args[0][0])
+
+    def test_streamed_weights_match_direct_calculation(self):
+        roq = self._make_likelihood(max_block_gigabytes=1e-4, nthreads=2)
+        time_samples = roq.weights["time_samples"]
+        for ifo in self.ifos:
+            frequencies = ifo.frequency_array[ifo.frequency_mask]
+            psd = ifo.power_spectral_density_array[ifo.frequency_mask]
+            data = ifo.frequency_domain_strain[ifo.frequency_mask]
+            tc_shifted_data = data / psd * np.exp(
+                2j * np.pi * np.outer(time_samples, frequencies))
+            linear = np.dot(tc_shifted_data, self.linear_matrix.conjugate()) * 4 / ifo.strain_data.duration
+            quadratic = np.dot(1 / psd, self.quadratic_matrix) * 4 / ifo.strain_data.duration
+            self.assertTrue(np.allclose(linear, roq.weights[ifo.name + "_linear"]))
+            self.assertTrue(np.allclose(quadratic, roq.weights[ifo.name + "_quadratic"]))
+
+
 class TestRescaledROQLikelihood(unittest.TestCase):
     def test_rescaling(self):
 
@@ -1099,6 +1477,254 @@ class TestRescaledROQLikelihood(unittest.TestCase):
         )
 
 
+class TestRelativeBinningLikelihood(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(500)
+        self.duration = 8
+        self.sampling_frequency = 2048
+        self.parameters = dict(
+            mass_1=31.0,
+            mass_2=29.0,
+            a_1=0.4,
+            a_2=0.3,
+            tilt_1=0.0,
+            tilt_2=0.0,
+            phi_12=1.7,
+            phi_jl=0.3,
+            luminosity_distance=1000.0,
+            theta_jn=0.4,
+            psi=2.659,
+            phase=1.3,
+            geocent_time=1126259642.413,
+            ra=1.375,
+            dec=-1.2108,
+        )
+        self.interferometers = bilby.gw.detector.InterferometerList(["H1", "L1"])
+        self.interferometers.set_strain_data_from_power_spectral_densities(
+            sampling_frequency=self.sampling_frequency,
+            duration=self.duration,
+            start_time=self.parameters["geocent_time"] - self.duration + 2,
+        )
+        self.interferometers.inject_signal(
+            parameters=self.parameters,
+            waveform_generator=bilby.gw.waveform_generator.WaveformGenerator(
+                duration=self.duration,
+                sampling_frequency=self.sampling_frequency,
+                frequency_domain_source_model=bilby.gw.source.lal_binary_black_hole,
+            ),
+        )
+
+        self.priors = bilby.gw.prior.BBHPriorDict()
+        self.priors["geocent_time"] = bilby.prior.Uniform(
+            self.parameters["geocent_time"] - 0.1,
+            self.parameters["geocent_time"] + 0.1,
+        )
+
+        self.non_bin = bilby.gw.likelihood.GravitationalWaveTransient(
+            interferometers=self.interferometers,
+            waveform_generator=bilby.gw.waveform_generator.WaveformGenerator(
+                duration=self.duration,
+                sampling_frequency=self.sampling_frequency,
+                frequency_domain_source_model=bilby.gw.source.lal_binary_black_hole,
+            ),
+            priors=self.priors.copy(),
+        )
+        self.binned_waveform_generator = bilby.gw.waveform_generator.WaveformGenerator(
+            duration=self.duration,
+            sampling_frequency=self.sampling_frequency,
+            frequency_domain_source_model=bilby.gw.source.lal_binary_black_hole_relative_binning,
+        )
+        self.binned = bilby.gw.likelihood.RelativeBinningGravitationalWaveTransient(
+            interferometers=self.interferometers,
+            waveform_generator=self.binned_waveform_generator,
+            fiducial_parameters=self.parameters,
+            priors=self.priors.copy(),
+            epsilon=0.05,
+        )
+
+    def tearDown(self):
+        del self.duration
+        del self.sampling_frequency
+        del self.parameters
+        del self.interferometers
+        del self.priors
+        del self.non_bin
+        del self.binned
+        del self.binned_waveform_generator
+
+    def test_bins_are_sorted_and_within_data(self):
+        bin_freqs = self.binned.bin_freqs
+        self.assertTrue(np.all(np.diff(bin_freqs) > 0))
+        self.assertGreaterEqual(bin_freqs[0], self.interferometers[0].minimum_frequency)
+        self.assertLessEqual(bin_freqs[-1], self.interferometers[0].maximum_frequency)
+        self.assertLess(self.binned.number_of_bins, len(self.interferometers.frequency_array))
+
+    def test_matches_non_binned_at_fiducial(self):
+        self.non_bin.parameters.update(self.parameters)
+        self.binned.parameters.update(self.parameters)
+        self.assertAlmostEqual(
+            self.non_bin.log_likelihood_ratio(),
+            self.binned.log_likelihood_ratio(),
+            delta=1e-3,
+        )
+
+    def test_matches_non_binned_near_fiducial(self):
+        parameters = self.parameters.copy()
+        parameters["mass_1"] += 0.05
+        parameters["geocent_time"] += 0.0005
+        parameters["ra"] += 0.02
+        self.non_bin.parameters.update(parameters)
+        self.binned.parameters.update(parameters)
+        regular = self.non_bin.log_likelihood_ratio()
+        binned = self.binned.log_likelihood_ratio()
+        self.assertLess(abs(regular - binned) / abs(regular), 1e-3)
+
+    def test_phase_marginalisation_matches_non_binned(self):
+        non_bin = bilby.gw.likelihood.GravitationalWaveTransient(
+            interferometers=self.interferometers,
+            waveform_generator=self.non_bin.waveform_generator,
+            priors=self.priors.copy(),
+            phase_marginalization=True,
+        )
+        binned = bilby.gw.likelihood.RelativeBinningGravitationalWaveTransient(
+            interferometers=self.interferometers,
+            waveform_generator=self.binned_waveform_generator,
+            fiducial_parameters=self.parameters,
+            priors=self.priors.copy(),
+            phase_marginalization=True,
+            epsilon=0.05,
+        )
+        non_bin.parameters.update(self.parameters)
+        binned.parameters.update(self.parameters)
+        self.assertAlmostEqual(
+            non_bin.log_likelihood_ratio(), binned.log_likelihood_ratio(), delta=1e-3
+        )
+
+    def test_time_marginalization_not_supported(self):
+        self.assertFalse(self.binned.time_marginalization)
+
+    def test_meta_data_contains_fiducial_parameters(self):
+        self.assertDictEqual(
+            self.binned.meta_data["fiducial_parameters"], self.parameters
+        )
+
+
+class TestMBLikelihood(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(500)
+        self.duration = 32
+        self.sampling_frequency = 1024
+        self.parameters = dict(
+            mass_1=2.5,
+            mass_2=2.0,
+            a_1=0.0,
+            a_2=0.0,
+            tilt_1=0.0,
+            tilt_2=0.0,
+            phi_12=1.7,
+            phi_jl=0.3,
+            luminosity_distance=200.0,
+            theta_jn=0.4,
+            psi=2.659,
+            phase=1.3,
+            geocent_time=1126259642.413,
+            ra=1.375,
+            dec=-1.2108,
+        )
+        self.interferometers = bilby.gw.detector.InterferometerList(["H1", "L1"])
+        self.interferometers.set_strain_data_from_power_spectral_densities(
+            sampling_frequency=self.sampling_frequency,
+            duration=self.duration,
+            start_time=self.parameters["geocent_time"] - self.duration + 2,
+        )
+        waveform_generator = bilby.gw.waveform_generator.WaveformGenerator(
+            duration=self.duration,
+            sampling_frequency=self.sampling_frequency,
+            frequency_domain_source_model=bilby.gw.source.lal_binary_black_hole,
+            waveform_arguments=dict(waveform_approximant="IMRPhenomD"),
+        )
+        self.interferometers.inject_signal(
+            parameters=self.parameters, waveform_generator=waveform_generator
+        )
+
+        self.priors = bilby.gw.prior.BBHPriorDict()
+        self.priors["chirp_mass"] = bilby.prior.Uniform(1.8, 2.2)
+        self.priors["geocent_time"] = bilby.prior.Uniform(
+            self.parameters["geocent_time"] - 0.1,
+            self.parameters["geocent_time"] + 0.1,
+        )
+
+        self.non_mb = bilby.gw.likelihood.GravitationalWaveTransient(
+            interferometers=self.interferometers,
+            waveform_generator=waveform_generator,
+            priors=self.priors.copy(),
+        )
+        self.mb_waveform_generator = bilby.gw.waveform_generator.WaveformGenerator(
+            duration=self.duration,
+            sampling_frequency=self.sampling_frequency,
+            frequency_domain_source_model=bilby.gw.source.binary_black_hole_frequency_sequence,
+            waveform_arguments=dict(waveform_approximant="IMRPhenomD"),
+        )
+        self.mb = bilby.gw.likelihood.MBGravitationalWaveTransient(
+            interferometers=self.interferometers,
+            waveform_generator=self.mb_waveform_generator,
+            priors=self.priors.copy(),
+        )
+
+    def tearDown(self):
+        del self.duration
+        del self.sampling_frequency
+        del self.parameters
+        del self.interferometers
+        del self.priors
+        del self.non_mb
+        del self.mb
+        del self.mb_waveform_generator
+
+    def test_reference_chirp_mass_from_prior(self):
+        self.assertEqual(self.mb.reference_chirp_mass, 1.8)
+
+    def test_fails_without_chirp_mass(self):
+        with self.assertRaises(ValueError):
+            bilby.gw.likelihood.MBGravitationalWaveTransient(
+                interferometers=self.interferometers,
+                waveform_generator=self.mb_waveform_generator,
+                priors=bilby.core.prior.PriorDict(
+                    dict(geocent_time=self.priors["geocent_time"])
+                ),
+            )
+
+    def test_bands_are_coarser_than_full_grid(self):
+        self.assertGreater(len(self.mb.band_durations), 1)
+        self.assertTrue(np.all(np.diff(self.mb.band_durations) < 0))
+        self.assertTrue(np.all(np.diff(self.mb.band_starts) > 0))
+        self.assertLess(
+            len(self.mb.unique_frequencies),
+            sum(self.interferometers[0].frequency_mask),
+        )
+
+    def test_windows_sum_to_one(self):
+        frequencies = self.interferometers.frequency_array
+        total = sum(
+            self.mb._window(frequencies, band)
+            for band in range(len(self.mb.band_durations))
+        )
+        self.assertTrue(np.allclose(total, 1))
+
+    def test_matches_non_mb(self):
+        for delta in [0, 0.01, 0.1]:
+            parameters = self.parameters.copy()
+            parameters["mass_1"] += delta
+            parameters["geocent_time"] += delta / 10
+            self.non_mb.parameters.update(parameters)
+            self.mb.parameters.update(parameters)
+            self.assertAlmostEqual(
+                self.non_mb.log_likelihood_ratio(),
+                self.mb.log_likelihood_ratio(),
+                delta=1e-2,
+            )
+
+
 class TestBBHLikelihoodSetUp(unittest.TestCase):
     def setUp(self):
         self.ifos = bilby.gw.detector.InterferometerList(["H1"])
@@ -5,6 +5,8 @@ import glob
 import os
 import sys
 import pickle
+import shutil
+import tempfile
 
 import numpy as np
 from astropy import cosmology
@@ -524,5 +526,77 @@ class TestAlignedSpin(unittest.TestCase):
         self.assertAlmostEqual(max_difference, 0, 2)
 
 
+class TestHealPixMapPriorDist(unittest.TestCase):
+    def setUp(self):
+        import healpy
+        from astropy.table import Table
+        self.outdir = tempfile.mkdtemp()
+        self.nside = 8
+        npix = healpy.nside2npix(self.nside)
+        theta, phi = healpy.pix2ang(self.nside, np.arange(npix))
+        self.prob = np.exp(-((theta - 1) ** 2 + (phi - 2) ** 2) / 0.2)
+        self.prob /= np.sum(self.prob)
+        distance_columns = [np.full(npix, 400.0), np.full(npix, 100.0), np.full(npix, 1e-7)]
+        self.flat_file = os.path.join(self.outdir, "flat.fits")
+        healpy.write_map(self.flat_file, [self.prob] + distance_columns, dtype=[float] * 4)
+
+        # order 1 map with the first pixel split into its four order 2 children
+        self.orders = np.array([2] * 4 + [1] * 47)
+        nested = np.concatenate([np.arange(4), np.arange(1, 48)])
+        self.uniq = 4 * 4 ** self.orders + nested
+        areas = 4 * np.pi / (12 * 4 ** self.orders)
+        density = np.random.uniform(1, 2, len(self.uniq))
+        self.moc_prob = density * areas / np.sum(density * areas)
+        table = Table(dict(
+            UNIQ=self.uniq, PROBDENSITY=self.moc_prob / areas, DISTMU=np.full(len(nested), 400.0),
+            DISTSIGMA=np.full(len(nested), 100.0), DISTNORM=np.full(len(nested), 1e-7)))
+        table.meta["ORDERING"] = "NUNIQ"
+        self.moc_file = os.path.join(self.outdir, "moc.fits")
+        table.write(self.moc_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir)
+
+    def test_samples_follow_pixel_probabilities(self):
+        import healpy
+        dist = bilby.gw.prior.HealPixMapPriorDist(self.flat_file, distance=True)
+        samples = dist._sample(100000)
+        pixels = healpy.ang2pix(self.nside, np.pi / 2 - samples[:, 1], samples[:, 0])
+        fractions = np.bincount(pixels, minlength=len(self.prob)) / len(pixels)
+        self.assertLess(np.max(np.abs(fractions - self.prob)), 0.005)
+        self.assertTrue(np.all(samples[:, 2] > 0))
+
+    def test_rescale_draws_distance_from_line_of_sight(self):
+        dist = bilby.gw.prior.HealPixMapPriorDist(self.flat_file, distance=True)
+        unit = np.random.uniform(0, 1, (10000, 3))
+        samples = dist.rescale(unit)
+        order = np.argsort(unit[:, 2])
+        self.assertTrue(np.all(np.diff(samples[order, 2]) >= 0))
+        expected = (400 ** 3 + 3 * 400 * 100 ** 2) / (400 ** 2 + 100 ** 2)
+        self.assertAlmostEqual(np.mean(samples[:, 2]) / expected, 1, 1)
+
+    def test_ln_prob_matches_pixel_density(self):
+        import healpy
+        dist = bilby.gw.prior.HealPixMapPriorDist(self.flat_file)
+        samples = dist._sample(10)
+        pixels = healpy.ang2pix(self.nside, np.pi / 2 - samples[:, 1], samples[:, 0])
+        expected = np.log(self.prob[pixels] / healpy.nside2pixarea(self.nside))
+        self.assertTrue(np.allclose(dist.ln_prob(samples), expected))
+
+    def test_multiorder_map_is_used_at_native_resolution(self):
+        import healpy
+        dist = bilby.gw.prior.HealPixMapPriorDist(self.moc_file, distance=True)
+        self.assertTrue(dist.multiorder)
+        self.assertEqual(dist.npix, len(self.uniq))
+        samples = dist._sample(50000)
+        pixels = dist._pixels_from_angles(samples[:, 0], samples[:, 1])
+        for order in [1, 2]:
+            nested = healpy.ang2pix(2 ** order, np.pi / 2 - samples[:, 1], samples[:, 0], nest=True)
+            mask = self.orders[pixels] == order
+            self.assertTrue(np.array_equal(nested[mask], (self.uniq - 4 * 4 ** self.orders)[pixels[mask]]))
+        fractions = np.bincount(pixels, minlength=len(self.uniq)) / len(pixels)
+        self.assertLess(np.max(np.abs(fractions - self.moc_prob)), 0.01)
+
+
 if __name__ == "__main__":
     unittest.main()
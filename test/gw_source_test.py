@@ -137,6 +137,64 @@ class TestLalBNS(unittest.TestCase):
             )
 
 
+class TestRelativeBinningBBH(unittest.TestCase):
+    def setUp(self):
+        self.parameters = dict(
+            mass_1=30.0,
+            mass_2=30.0,
+            luminosity_distance=400.0,
+            a_1=0.4,
+            tilt_1=0.2,
+            phi_12=1.0,
+            a_2=0.8,
+            tilt_2=2.7,
+            phi_jl=2.9,
+            theta_jn=0.3,
+            phase=0.0,
+        )
+        self.waveform_kwargs = dict(
+            waveform_approximant="IMRPhenomPv2",
+            reference_frequency=50.0,
+            minimum_frequency=20.0,
+        )
+        self.frequency_array = bilby.core.utils.create_frequency_series(2048, 4)
+        self.bin_indices = np.array([100, 200, 400, 800, 1600])
+
+    def tearDown(self):
+        del self.parameters
+        del self.waveform_kwargs
+        del self.frequency_array
+        del self.bin_indices
+
+    def test_matches_lal_bbh_without_bin_edges(self):
+        self.parameters.update(self.waveform_kwargs)
+        full = bilby.gw.source.lal_binary_black_hole(
+            self.frequency_array, **self.parameters
+        )
+        binned = bilby.gw.source.lal_binary_black_hole_relative_binning(
+            self.frequency_array, **self.parameters
+        )
+        for mode in full:
+            self.assertTrue(np.array_equal(full[mode], binned[mode]))
+
+    def test_evaluates_at_bin_edges(self):
+        self.parameters.update(self.waveform_kwargs)
+        full = bilby.gw.source.lal_binary_black_hole(
+            self.frequency_array, **self.parameters
+        )
+        binned = bilby.gw.source.lal_binary_black_hole_relative_binning(
+            self.frequency_array,
+            frequency_bin_edges=self.frequency_array[self.bin_indices],
+            **self.parameters
+        )
+        for mode in full:
+            self.assertEqual(len(binned[mode]), len(self.bin_indices))
+            self.assertLess(
+                max(abs(full[mode][self.bin_indices] - binned[mode]))
+                / max(abs(full[mode])), 1e-5
+            )
+
+
 class TestEccentricLalBBH(unittest.TestCase):
     def setUp(self):
         self.parameters = dict(
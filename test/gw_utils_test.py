@@ -65,6 +65,45 @@ class TestGWUtils(unittest.TestCase):
         with self.assertRaises(ValueError):
             gwutils.get_polarization_tensor(ra, dec, time, psi, "not-a-mode")
 
+    def test_greenwich_mean_sidereal_time(self):
+        times = np.array([10, 20, 10, 1126259642.4])
+        gmst = gwutils.greenwich_mean_sidereal_time(times)
+        for time, value in zip(times, gmst):
+            self.assertAlmostEqual(
+                value, np.fmod(lal.GreenwichMeanSiderealTime(time), 2 * np.pi), 12)
+        self.assertIsInstance(gwutils.greenwich_mean_sidereal_time(10), float)
+
+    def test_time_delay_geocentric_batch(self):
+        det1 = np.array([0.1, 0.2, 0.3])
+        det2 = np.array([0.1, 0.2, 0.5])
+        ra = np.array([0.5, 1.0])
+        dec = np.array([0.2, -0.3])
+        time = np.array([10, 20])
+        delays = gwutils.time_delay_geocentric_batch(det1, det2, ra, dec, time)
+        for ii in range(2):
+            self.assertAlmostEqual(
+                delays[ii],
+                gwutils.time_delay_geocentric(det1, det2, ra[ii], dec[ii], time[ii]),
+                20,
+            )
+
+    def test_get_polarization_tensors_batch(self):
+        ra = np.array([1, 2.5])
+        dec = np.array([2.0, -0.4])
+        time = np.array([10, 10])
+        psi = np.array([0.1, 1.2])
+        modes = ["plus", "cross", "breathing", "longitudinal", "x", "y"]
+        tensors = gwutils.get_polarization_tensors_batch(ra, dec, time, psi, modes)
+        for mode in modes:
+            self.assertEqual(tensors[mode].shape, (2, 3, 3))
+            for ii in range(2):
+                self.assertTrue(np.allclose(
+                    tensors[mode][ii],
+                    gwutils.get_polarization_tensor(ra[ii], dec[ii], time[ii], psi[ii], mode),
+                ))
+        with self.assertRaises(ValueError):
+            gwutils.get_polarization_tensors_batch(ra, dec, time, psi, ["not-a-mode"])
+
     def test_inner_product(self):
         aa = np.array([1, 2, 3])
         bb = np.array([5, 6, 7])
@@ -101,6 +140,14 @@ class TestGWUtils(unittest.TestCase):
         )
         self.assertEqual(mfsnr, 25.510869054168282)
 
+    def test_ln_i0(self):
+        values = np.array([0, 1e-3, 0.5, 3, 100])
+        self.assertTrue(np.allclose(np.log(np.i0(values)), gwutils.ln_i0(values)))
+        self.assertTrue(np.allclose(gwutils.ln_i0(-values), gwutils.ln_i0(values)))
+        large = 1e8
+        self.assertAlmostEqual(
+            large - 0.5 * np.log(2 * np.pi * large), gwutils.ln_i0(large))
+
     def test_get_event_time(self):
         events = [
             "GW150914",
@@ -288,6 +335,18 @@ class TestSkyFrameConversion(unittest.TestCase):
         self.assertGreaterEqual(ks_2samp(self.samples["ra"], ras).pvalue, 0.01)
         self.assertGreaterEqual(ks_2samp(self.samples["dec"], decs).pvalue, 0.01)
 
+    def test_vectorised_conversion_matches_scalar(self) -> None:
+        zeniths = self.samples["zenith"][:10]
+        azimuths = self.samples["azimuth"][:10]
+        times = self.samples["time"][:10]
+        ras, decs = bilby.gw.utils.zenith_azimuth_to_ra_dec(
+            zeniths, azimuths, times, self.ifos)
+        for ii in range(10):
+            ra, dec = bilby.gw.utils.zenith_azimuth_to_ra_dec(
+                zeniths[ii], azimuths[ii], times[ii], self.ifos)
+            self.assertAlmostEqual(ras[ii], ra)
+            self.assertAlmostEqual(decs[ii], dec)
+
 
 if __name__ == "__main__":
     unittest.main()
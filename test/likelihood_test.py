@@ -697,5 +697,132 @@ class TestJointLikelihood(unittest.TestCase):
     #     self.assertDictEqual(self.joint_likelihood.parameters, joint_likelihood.parameters)
 
 
+class TestLikelihoodBatch(unittest.TestCase):
+    def setUp(self):
+        self.N = 50
+        self.x = np.linspace(0, 1, self.N)
+        self.y = 2 * self.x + 1 + np.random.normal(0, 0.1, self.N)
+        self.batch = dict(m=np.random.uniform(1, 3, 20), c=np.random.uniform(0, 2, 20))
+
+        def linear(x, m, c):
+            return m * x + c
+
+        def scalar_only(x, m, c):
+            if m > 2:
+                return m * x
+            return m * x + c
+
+        self.linear = linear
+        self.scalar_only = scalar_only
+
+    def tearDown(self):
+        del self.N
+        del self.x
+        del self.y
+        del self.batch
+        del self.linear
+        del self.scalar_only
+
+    def _looped(self, likelihood, batch, method="log_likelihood"):
+        output = list()
+        for ii in range(len(list(batch.values())[0])):
+            likelihood.parameters.update({key: batch[key][ii] for key in batch})
+            output.append(getattr(likelihood, method)())
+        return np.array(output)
+
+    def test_gaussian_batch_matches_loop(self):
+        likelihood = GaussianLikelihood(self.x, self.y, self.linear, sigma=0.1)
+        batch = likelihood.log_likelihood_batch(self.batch)
+        self.assertTrue(np.allclose(batch, self._looped(likelihood, self.batch)))
+
+    def test_gaussian_batch_sigma_in_batch(self):
+        likelihood = GaussianLikelihood(self.x, self.y, self.linear)
+        self.batch["sigma"] = np.random.uniform(0.05, 0.2, 20)
+        batch = likelihood.log_likelihood_batch(self.batch)
+        self.assertTrue(np.allclose(batch, self._looped(likelihood, self.batch)))
+
+    def test_gaussian_batch_ratio_matches_loop(self):
+        likelihood = GaussianLikelihood(self.x, self.y, self.linear, sigma=0.1)
+        likelihood.noise_log_likelihood = MagicMock(return_value=-10)
+        batch = likelihood.log_likelihood_ratio_batch(self.batch)
+        self.assertTrue(np.allclose(
+            batch, self._looped(likelihood, self.batch, "log_likelihood_ratio")))
+
+    def test_batch_missing_parameter_uses_current_value(self):
+        likelihood = GaussianLikelihood(self.x, self.y, self.linear, sigma=0.1)
+        likelihood.parameters["c"] = 1.5
+        batch = likelihood.log_likelihood_batch(dict(m=self.batch["m"]))
+        expected = self._looped(likelihood, dict(m=self.batch["m"]))
+        self.assertTrue(np.allclose(batch, expected))
+
+    def test_non_vectorised_function_falls_back_to_loop(self):
+        likelihood = GaussianLikelihood(self.x, self.y, self.scalar_only, sigma=0.1)
+        batch = likelihood.log_likelihood_batch(self.batch)
+        self.assertTrue(np.allclose(batch, self._looped(likelihood, self.batch)))
+
+    def test_fallback_restores_parameters(self):
+        likelihood = GaussianLikelihood(self.x, self.y, self.scalar_only, sigma=0.1)
+        likelihood.parameters.update(dict(m=5, c=6))
+        likelihood.log_likelihood_batch(self.batch)
+        self.assertDictEqual(dict(m=5, c=6), likelihood.parameters)
+
+    def test_unequal_batch_lengths_raises(self):
+        likelihood = GaussianLikelihood(self.x, self.y, self.linear, sigma=0.1)
+        with self.assertRaises(ValueError):
+            likelihood.log_likelihood_batch(dict(m=np.ones(3), c=np.ones(4)))
+
+    def test_poisson_batch_matches_loop(self):
+        y = np.random.poisson(2 * self.x + 1)
+        likelihood = PoissonLikelihood(self.x, y, self.linear)
+        self.batch["c"][0] = 0
+        self.batch["m"][0] = 0
+        batch = likelihood.log_likelihood_batch(self.batch)
+        looped = self._looped(likelihood, self.batch)
+        self.assertEqual(batch[0], -np.inf)
+        self.assertTrue(np.allclose(batch[1:], looped[1:]))
+
+    def test_poisson_batch_negative_rate_raises(self):
+        likelihood = PoissonLikelihood(self.x, np.ones(self.N, dtype=int), self.linear)
+        with self.assertRaises(ValueError):
+            likelihood.log_likelihood_batch(dict(m=np.ones(2), c=-np.ones(2) * 3))
+
+    def test_exponential_batch_matches_loop(self):
+        likelihood = ExponentialLikelihood(self.x, np.abs(self.y), self.linear)
+        batch = likelihood.log_likelihood_batch(self.batch)
+        self.assertTrue(np.allclose(batch, self._looped(likelihood, self.batch)))
+
+    def test_student_t_batch_matches_loop(self):
+        likelihood = StudentTLikelihood(self.x, self.y, self.linear, nu=3, sigma=0.1)
+        batch = likelihood.log_likelihood_batch(self.batch)
+        self.assertTrue(np.allclose(batch, self._looped(likelihood, self.batch)))
+
+    def test_student_t_batch_negative_nu_raises(self):
+        likelihood = StudentTLikelihood(self.x, self.y, self.linear, sigma=0.1)
+        self.batch["nu"] = -np.ones(20)
+        with self.assertRaises(ValueError):
+            likelihood.log_likelihood_batch(self.batch)
+
+    def test_multidimensional_gaussian_batch_matches_loop(self):
+        likelihood = AnalyticalMultidimensionalCovariantGaussian(
+            mean=[0, 1], cov=[[1, 0.5], [0.5, 2]])
+        batch = dict(x0=np.random.normal(0, 1, 20), x1=np.random.normal(0, 1, 20))
+        self.assertTrue(np.allclose(
+            likelihood.log_likelihood_batch(batch), self._looped(likelihood, batch)))
+
+    def test_joint_batch_matches_loop(self):
+        first = GaussianLikelihood(self.x, self.y, self.linear, sigma=0.1)
+        second = ExponentialLikelihood(self.x, np.abs(self.y), self.linear)
+        joint = JointLikelihood(first, second)
+        batch = joint.log_likelihood_batch(self.batch)
+        self.assertTrue(np.allclose(batch, self._looped(joint, self.batch)))
+
+    def test_base_batch_loops(self):
+        likelihood = Likelihood(dict(a=1))
+        likelihood.log_likelihood = MagicMock(return_value=3)
+        batch = likelihood.log_likelihood_batch(dict(a=np.arange(4)))
+        self.assertTrue(np.array_equal(batch, 3 * np.ones(4)))
+        self.assertEqual(likelihood.log_likelihood.call_count, 4)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,6 +6,7 @@ import mock
 import numpy as np
 import os
 import scipy.stats as ss
+import tempfile
 
 
 class TestPriorInstantiationWithoutOptionalPriors(unittest.TestCase):
@@ -1196,6 +1197,64 @@ class TestPriorDict(unittest.TestCase):
         for key in self.prior_set_from_dict.keys():
             self.assertFalse(self.prior_set_from_dict.test_redundancy(key=key))
 
+    def test_rescale_array(self):
+        keys = ["mass", "speed"]
+        theta = np.random.uniform(0, 1, (10, 2))
+        expected = np.array([
+            self.prior_set_from_dict.rescale(keys=keys, theta=point)
+            for point in theta
+        ])
+        self.assertTrue(np.allclose(
+            expected, self.prior_set_from_dict.rescale_array(keys, theta)))
+
+    def test_ln_prob_array(self):
+        keys = ["mass", "speed"]
+        samples = self.prior_set_from_dict.sample_subset(keys=keys, size=10)
+        expected = self.prior_set_from_dict.ln_prob(samples, axis=0)
+        points = np.array([samples[key] for key in keys]).T
+        self.assertTrue(np.allclose(
+            expected, self.prior_set_from_dict.ln_prob_array(keys, points)))
+
+    def test_ln_prob_array_with_constraint(self):
+        def conversion(parameters):
+            parameters = parameters.copy()
+            parameters["total"] = parameters["mass"] + parameters["speed"]
+            return parameters
+
+        priors = bilby.core.prior.PriorDict(
+            dict(self.priors, total=bilby.core.prior.Constraint(0, 2)),
+            conversion_function=conversion,
+        )
+        keys = ["mass", "speed"]
+        points = np.array([[0.5, 1.2], [0.9, 1.5]])
+        ln_prob = priors.ln_prob_array(keys, points)
+        self.assertTrue(np.isfinite(ln_prob[0]))
+        self.assertEqual(-np.inf, ln_prob[1])
+
+    def test_joint_prior_array_methods(self):
+        dist = bilby.core.prior.MultivariateGaussianDist(
+            names=["x", "y"], nmodes=2, mus=[[0, 0], [3, 3]],
+            sigmas=[[1, 1], [1, 2]], weights=[1, 2])
+        priors = bilby.core.prior.PriorDict(dict(
+            mass=self.first_prior,
+            x=bilby.core.prior.MultivariateGaussian(dist, "x"),
+            y=bilby.core.prior.MultivariateGaussian(dist, "y"),
+        ))
+        keys = ["y", "mass", "x"]
+        points = priors.rescale_array(keys, np.random.uniform(0, 1, (10, 3)))
+        self.assertEqual((10, 3), points.shape)
+        expected = [priors.ln_prob(dict(zip(keys, point))) for point in points]
+        self.assertTrue(np.allclose(expected, priors.ln_prob_array(keys, points)))
+
+    def test_joint_prior_array_requires_all_parameters(self):
+        dist = bilby.core.prior.MultivariateGaussianDist(names=["x", "y"])
+        priors = bilby.core.prior.PriorDict(dict(
+            x=bilby.core.prior.MultivariateGaussian(dist, "x"),
+            y=bilby.core.prior.MultivariateGaussian(dist, "y"),
+        ))
+        with self.assertRaises(ValueError):
+            priors.rescale_array(["x"], np.random.uniform(0, 1, (10, 1)))
+
 
 class TestConstraintPriorNormalisation(unittest.TestCase):
     def setUp(self):
@@ -1222,6 +1281,55 @@ class TestConstraintPriorNormalisation(unittest.TestCase):
         integral = np.sum(prob * (dm1 * dm2)) / len(samples["mass_1"])
         self.assertAlmostEqual(1, integral, 5)
 
+    def test_sample_constrained(self):
+        def conversion(parameters):
+            parameters = parameters.copy()
+            parameters["mass_ratio"] = parameters["mass_2"] / parameters["mass_1"]
+            return parameters
+
+        self.priors.conversion_function = conversion
+        samples = self.priors.sample_subset_constrained(
+            keys=["mass_1", "mass_2", "mass_ratio"], size=(10, 100))
+        self.assertEqual({"mass_1", "mass_2"}, set(samples.keys()))
+        self.assertEqual((10, 100), samples["mass_1"].shape)
+        self.assertTrue(np.all(samples["mass_2"] <= samples["mass_1"]))
+        single = self.priors.sample_subset_constrained(keys=["mass_1", "mass_2"])
+        self.assertEqual(0, np.ndim(single["mass_1"]))
+        self.assertLessEqual(single["mass_2"], single["mass_1"])
+
+    def test_sample_constrained_size_zero(self):
+        def conversion(parameters):
+            parameters = parameters.copy()
+            parameters["mass_ratio"] = parameters["mass_2"] / parameters["mass_1"]
+            return parameters
+
+        self.priors.conversion_function = conversion
+        for size in [0, (0, 3)]:
+            samples = self.priors.sample_subset_constrained(
+                keys=["mass_1", "mass_2", "mass_ratio"], size=size)
+            self.assertEqual(np.shape(np.empty(size)), samples["mass_1"].shape)
+
+    def test_normalization_kept_by_copy(self):
+        keys = ("mass_1", "mass_2")
+        factor = self.priors.normalize_constraint_factor(keys)
+        self.assertEqual(factor, self.priors.copy().normalize_constraint_factor(keys))
+
+    def test_normalization_reset_on_change(self):
+        keys = ("mass_1", "mass_2")
+        self.priors.normalize_constraint_factor(keys)
+        new = self.priors.copy()
+        new["mass_2"] = bilby.core.prior.Uniform(5, 20)
+        self.assertDictEqual(dict(), new._cached_normalizations)
+
+    def test_normalization_written_to_json(self):
+        keys = ("mass_1", "mass_2")
+        factor = self.priors.normalize_constraint_factor(keys)
+        with tempfile.TemporaryDirectory() as outdir:
+            self.priors.to_json(outdir=outdir, label="normalization")
+            new = bilby.core.prior.PriorDict.from_json(
+                os.path.join(outdir, "normalization_prior.json"))
+        self.assertDictEqual({keys: factor}, new._cached_normalizations)
+
 
 class TestLoadPrior(unittest.TestCase):
     def test_load_prior_with_float(self):
@@ -1635,6 +1743,22 @@ class TestConditionalPriorDict(unittest.TestCase):
         )
         self.assertListEqual(ref_variables, res)
 
+    def test_rescale_array(self):
+        keys = list(self.test_sample.keys())
+        theta = np.random.uniform(0, 1, (10, 4))
+        expected = np.array([
+            self.conditional_priors.rescale(keys=keys, theta=point)
+            for point in theta
+        ])
+        self.assertTrue(np.allclose(
+            expected, self.conditional_priors.rescale_array(keys, theta)))
+
+    def test_ln_prob_array(self):
+        keys = list(self.test_sample.keys())
+        points = np.array([list(self.test_sample.values())] * 3)
+        self.assertTrue(np.array_equal(
+            np.zeros(3), self.conditional_priors.ln_prob_array(keys, points)))
+
     def test_rescale_illegal_conditions(self):
         del self.conditional_priors["var_0"]
         with self.assertRaises(bilby.core.prior.IllegalConditionsException):
@@ -1,10 +1,14 @@
 from __future__ import absolute_import, division
 
 import unittest
+from unittest import mock
 import numpy as np
 import pandas as pd
+import scipy.stats
 import shutil
 import os
+import subprocess
+import sys
 import json
 
 import bilby
@@ -110,6 +114,14 @@ class TestResult(unittest.TestCase):
             "{}/{}_result.hdf5".format(outdir, label),
         )
 
+    def test_result_file_name_columnar(self):
+        outdir = "outdir"
+        label = "label"
+        self.assertEqual(
+            bilby.core.result.result_file_name(outdir, label, extension="columnar"),
+            "{}/{}_result.h5".format(outdir, label),
+        )
+
     def test_fail_save_and_load(self):
         with self.assertRaises(ValueError):
             bilby.core.result.read_in_result()
@@ -207,6 +219,92 @@ class TestResult(unittest.TestCase):
         self.assertEqual(self.result.priors["c"], loaded_result.priors["c"])
         self.assertEqual(self.result.priors["d"], loaded_result.priors["d"])
 
+    def test_save_and_load_columnar(self):
+        self.result.save_to_file(extension="columnar")
+        loaded_result = bilby.core.result.read_in_result(
+            outdir=self.result.outdir, label=self.result.label, extension="columnar"
+        )
+        self.assertIsNone(loaded_result._posterior)
+        self.assertIsInstance(loaded_result.posterior, pd.DataFrame)
+        self.assertTrue(
+            pd.DataFrame.equals(self.result.posterior, loaded_result.posterior)
+        )
+        self.assertTrue(
+            self.result.fixed_parameter_keys == loaded_result.fixed_parameter_keys
+        )
+        self.assertEqual(self.result.meta_data, loaded_result.meta_data)
+        self.assertEqual(
+            self.result.injection_parameters, loaded_result.injection_parameters
+        )
+        self.assertEqual(self.result.log_evidence, loaded_result.log_evidence)
+        self.assertEqual(self.result.log_bayes_factor, loaded_result.log_bayes_factor)
+        self.assertEqual(self.result.priors["x"], loaded_result.priors["x"])
+        self.assertEqual(self.result.priors["c"], loaded_result.priors["c"])
+
+    def test_load_columnar_columns_and_metadata_only(self):
+        self.result.save_to_file(extension="columnar")
+        filename = bilby.core.result.result_file_name(
+            self.result.outdir, self.result.label, extension="columnar")
+        loaded_result = bilby.core.result.read_in_result(filename, columns=["y"])
+        self.assertEqual(list(loaded_result.posterior.keys()), ["y"])
+        self.assertTrue(np.array_equal(
+            self.result.posterior["y"], loaded_result.posterior["y"]))
+        loaded_result = bilby.core.result.read_in_result(
+            filename, metadata_only=True)
+        self.assertIsNone(loaded_result._posterior)
+        self.assertEqual(self.result.log_evidence, loaded_result.log_evidence)
+
+    def test_read_posterior_columns_columnar(self):
+        self.result.save_to_file(extension="columnar")
+        loaded_result = bilby.core.result.read_in_result(
+            outdir=self.result.outdir, label=self.result.label, extension="columnar"
+        )
+        columns = loaded_result.read_posterior_columns(["y"])
+        self.assertIsInstance(columns, pd.DataFrame)
+        self.assertTrue(pd.DataFrame.equals(self.result.posterior[["y"]], columns))
+        self.assertIsNone(loaded_result._posterior)
+        with self.assertRaises(KeyError):
+            loaded_result.read_posterior_columns(["z"])
+        self.assertTrue(pd.DataFrame.equals(
+            self.result.posterior[["x"]], loaded_result.read_posterior_columns(["x"])))
+
+    def test_columnar_posterior_with_conversion_functions(self):
+        self.result.save_to_file(extension="columnar")
+        loaded_result = bilby.core.result.read_in_result(
+            outdir=self.result.outdir, label=self.result.label, extension="columnar"
+        )
+        self.assertTrue(loaded_result.posterior.equals(self.result.posterior))
+        combined = pd.concat([loaded_result.posterior, self.result.posterior])
+        self.assertEqual(len(combined), 2 * len(self.result.posterior))
+        sample = dict(x=0.1, y=-0.2)
+        self.assertEqual(
+            loaded_result.posterior_probability(sample),
+            self.result.posterior_probability(sample))
+
+        def reconstruct(samples, uniforms):
+            return dict(
+                geocent_time=uniforms[:, 0], luminosity_distance=uniforms[:, 1],
+                phase=uniforms[:, 2])
+
+        likelihood = mock.MagicMock(
+            phase_marginalization=False, distance_marginalization=False,
+            time_marginalization=True)
+        likelihood.reconstruct_marginalized_parameters.side_effect = reconstruct
+        posterior = bilby.gw.conversion.generate_posterior_samples_from_marginalized_likelihood(
+            loaded_result.posterior, likelihood, block_size=30)
+        self.assertIsInstance(posterior, pd.DataFrame)
+        self.assertEqual(
+            list(posterior.keys()),
+            ["x", "y", "geocent_time", "luminosity_distance", "phase"])
+        self.assertEqual(len(posterior["phase"]), len(self.result.posterior))
+
+    def test_load_metadata_only_json(self):
+        self.result.save_to_file()
+        loaded_result = bilby.core.result.read_in_result(
+            outdir=self.result.outdir, label=self.result.label, metadata_only=True)
+        self.assertIsNone(loaded_result._posterior)
+        self.assertEqual(self.result.log_evidence, loaded_result.log_evidence)
+
     def test_save_and_load_default(self):
         self.result.save_to_file()
         loaded_result = bilby.core.result.read_in_result(
@@ -501,10 +599,65 @@ class TestResult(unittest.TestCase):
         self.assertTrue(
             np.array_equal(
                 self.result.posterior_probability(sample),
-                self.result.kde([[0, 0.1], [0.8, 0]]),
+                self.result.kde([[0, 0.8], [0.1, 0]]),
             )
         )
 
+    def test_posterior_probability_batched(self):
+        sample = pd.DataFrame(dict(x=np.linspace(-1, 1, 7), y=np.zeros(7)))
+        self.assertTrue(np.allclose(
+            self.result.posterior_probability(sample, batch_size=3),
+            self.result.kde(sample[["x", "y"]].values.T)))
+
+    def test_posterior_probability_gmm(self):
+        sample = [dict(x=0, y=0.1), dict(x=0.8, y=0), dict(x=-0.5, y=0.2)]
+        probability = self.result.posterior_probability(
+            sample, method="gmm", n_components=2)
+        self.assertEqual(len(probability), 3)
+        self.assertTrue(np.all(probability > 0))
+        density = self.result.get_density_estimator("gmm", n_components=2)
+        self.assertIsInstance(density, bilby.core.utils.GaussianMixtureDensity)
+        self.assertTrue(np.allclose(
+            probability, density([[0, 0.8, -0.5], [0.1, 0, 0.2]])))
+
+        mean = np.array([0.5, -1])
+        cov = np.array([[1, 0.6], [0.6, 2]])
+        self.result.posterior = pd.DataFrame(
+            np.random.multivariate_normal(mean, cov, 20000), columns=["x", "y"])
+        points = pd.DataFrame(
+            np.random.multivariate_normal(mean, cov, 50), columns=["x", "y"])
+        expected = scipy.stats.multivariate_normal(mean, cov).pdf(points.values)
+        for n_components in [1, 3]:
+            probability = self.result.posterior_probability(
+                points, method="gmm", n_components=n_components)
+            error = np.abs(probability / expected - 1)
+            self.assertLess(np.median(error), 0.05)
+            self.assertLess(np.max(error), 0.25)
+
+    def test_density_estimators_not_saved_if_unset(self):
+        self.result.save_to_file()
+        with open(bilby.core.result.result_file_name(
+                self.result.outdir, self.result.label)) as ff:
+            self.assertNotIn("density_estimators", json.load(ff))
+
+    def test_density_estimator_saved_with_result(self):
+        density = self.result.get_density_estimator("gmm", n_components=2)
+        self.result.save_to_file()
+        loaded_result = bilby.core.result.read_in_result(
+            outdir=self.result.outdir, label=self.result.label)
+        loaded_density = loaded_result.get_density_estimator("gmm", n_components=2)
+        points = np.random.normal(0, 1, (2, 10))
+        self.assertTrue(np.allclose(density(points), loaded_density(points)))
+
+    def test_density_estimator_max_samples(self):
+        density = self.result.get_density_estimator("kde", max_samples=20)
+        self.assertEqual(density.n, 20)
+        self.assertIs(
+            density, self.result.get_density_estimator("kde", max_samples=20))
+        self.result.posterior = self.result.posterior
+        self.assertIsNot(
+            density, self.result.get_density_estimator("kde", max_samples=20))
+
     def test_to_arviz(self):
         with self.assertRaises(TypeError):
             self.result.to_arviz(prior=dict())
@@ -643,11 +796,102 @@ class TestResultListError(unittest.TestCase):
         self.nested_results.append(self.outdir + "/" + self.label + "1_result.json")
         self.assertEqual(3, len(self.nested_results))
 
+    def test_init_from_filenames_in_parallel(self):
+        filenames = [
+            "{}/{}{}_result.json".format(self.outdir, self.label, ii)
+            for ii in range(2)]
+        results = bilby.core.result.ResultList(filenames, npool=2)
+        self.assertEqual(
+            [res.label for res in results], [self.label + "0", self.label + "1"])
+        for res, expected in zip(results, self.nested_results):
+            self.assertTrue(np.array_equal(res.posterior, expected.posterior))
+
+    def test_init_from_filenames_metadata_only(self):
+        filenames = [
+            "{}/{}{}_result.json".format(self.outdir, self.label, ii)
+            for ii in range(2)]
+        results = bilby.core.result.ResultList(filenames, metadata_only=True)
+        for res, expected in zip(results, self.nested_results):
+            self.assertEqual(res.label, expected.label)
+            self.assertEqual(res.log_evidence, expected.log_evidence)
+            self.assertEqual(res.log_bayes_factor, expected.log_bayes_factor)
+            self.assertEqual(res.priors, expected.priors)
+            self.assertIsNone(res._posterior)
+            self.assertIsNone(res._nested_samples)
+
     def test_append_result_type(self):
         self.nested_results.append(self.nested_results[1])
         self.expected_nested.append(self.expected_nested[1])
         self.assertListEqual(self.nested_results, self.nested_results)
 
+    def test_combine_result_files_matches_combine(self):
+        filenames = [
+            "{}/{}{}_result.json".format(self.outdir, self.label, ii)
+            for ii in range(2)]
+        np.random.seed(3)
+        expected = bilby.core.result.ResultList(filenames).combine()
+        np.random.seed(3)
+        combined = bilby.core.result.combine_result_files(filenames)
+        self.assertEqual(combined.label, expected.label)
+        self.assertEqual(combined.log_evidence, expected.log_evidence)
+        self.assertEqual(combined.log_evidence_err, expected.log_evidence_err)
+        self.assertIsNone(combined._nested_samples)
+        for key in ["x", "y", "log_likelihood"]:
+            self.assertTrue(np.array_equal(
+                np.sort(combined.posterior[key]),
+                np.sort(expected.posterior[key])))
+
+    def test_combine_result_files_inconsistent_priors(self):
+        self.nested_results[0].priors = bilby.prior.PriorDict(
+            dict(x=bilby.prior.Uniform(0, 1, "x"), c=1))
+        self.nested_results[0].save_to_file(overwrite=True)
+        filenames = [
+            "{}/{}{}_result.json".format(self.outdir, self.label, ii)
+            for ii in range(2)]
+        with self.assertRaises(bilby.result.ResultListError):
+            bilby.core.result.combine_result_files(filenames)
+
+    def test_get_injection_credible_levels(self):
+        filenames = [
+            "{}/{}{}_result.json".format(self.outdir, self.label, ii)
+            for ii in range(2)]
+        expected = pd.DataFrame(
+            [res.get_all_injection_credible_levels() for res in self.nested_results])
+        for results in [self.nested_results, filenames]:
+            levels = bilby.core.result.get_injection_credible_levels(
+                results, npool=2)
+            self.assertListEqual(
+                list(levels.index), [res.label for res in self.nested_results])
+            self.assertTrue(np.array_equal(levels.values, expected.values))
+
+    def test_get_injection_credible_levels_columnar(self):
+        filenames = list()
+        for res in self.nested_results:
+            res.save_to_file(extension="columnar", overwrite=True)
+            filenames.append(bilby.core.result.result_file_name(
+                self.outdir, res.label, extension="columnar"))
+        expected = pd.DataFrame(
+            [res.get_all_injection_credible_levels() for res in self.nested_results])
+        with mock.patch(
+                "bilby.core.result._read_columns",
+                wraps=bilby.core.result._read_columns) as m:
+            levels = bilby.core.result.get_injection_credible_levels(filenames)
+        self.assertTrue(np.array_equal(levels.values, expected.values))
+        posterior_reads = [
+            call for call in m.call_args_list if call[0][1] == "posterior"]
+        self.assertEqual(len(posterior_reads), len(filenames))
+        for call in posterior_reads:
+            self.assertEqual(call[0][2], ["x", "y"])
+
+    def test_make_pp_plot_from_credible_levels_file(self):
+        filename = "{}/credible_levels.txt".format(self.outdir)
+        _, pvals = bilby.core.result.make_pp_plot(
+            self.nested_results, save=False, credible_levels_filename=filename)
+        levels = bilby.core.result.read_injection_credible_levels(filename)
+        self.assertListEqual(list(levels.columns), ["x", "y"])
+        _, pvals_from_file = bilby.core.result.make_pp_plot(levels, save=False)
+        self.assertEqual(pvals.pvalues, pvals_from_file.pvalues)
+
     def test_combine_inconsistent_samplers(self):
         self.nested_results[0].sampler = "dynesty"
         with self.assertRaises(bilby.result.ResultListError):
@@ -722,6 +966,163 @@ class TestResultListError(unittest.TestCase):
             self.nested_results.combine()
 
 
+class TestReweight(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(7)
+        self.x = np.linspace(0, 1, 20)
+        self.y = 2 * self.x + np.random.normal(0, 1, len(self.x))
+        self.priors = bilby.core.prior.PriorDict(
+            dict(m=bilby.core.prior.Uniform(0, 4, "m")))
+        old_likelihood = bilby.core.likelihood.GaussianLikelihood(
+            self.x, self.y, self.model, sigma=1)
+        self.new_likelihood = bilby.core.likelihood.GaussianLikelihood(
+            self.x, self.y, self.model, sigma=1.5)
+        n = 500
+        samples = np.random.uniform(0, 4, n)
+        log_likelihood = list()
+        for value in samples:
+            old_likelihood.parameters["m"] = value
+            log_likelihood.append(old_likelihood.log_likelihood())
+        self.result = bilby.core.result.Result(
+            label="label", outdir="outdir", search_parameter_keys=["m"],
+            priors=self.priors, log_evidence=0, meta_data=dict())
+        self.result.posterior = pd.DataFrame(dict(
+            m=samples, log_likelihood=log_likelihood,
+            log_prior=self.priors.ln_prob_array(["m"], samples[:, None])))
+        self.resume_file = "outdir/reweight_resume.pickle"
+
+    def tearDown(self):
+        try:
+            shutil.rmtree("outdir")
+        except OSError:
+            pass
+
+    @staticmethod
+    def model(x, m):
+        return m * x
+
+    def serial_ln_weights(self):
+        ln_weights = list()
+        for _, sample in self.result.posterior.iterrows():
+            self.new_likelihood.parameters["m"] = sample["m"]
+            ln_weights.append(
+                self.new_likelihood.log_likelihood() - sample["log_likelihood"])
+        return np.array(ln_weights)
+
+    def test_weights_match_serial_evaluation(self):
+        ln_weights, _, _ = bilby.core.result.get_weights_for_reweighting(
+            self.result, new_likelihood=self.new_likelihood, chunk_size=64)
+        self.assertTrue(np.allclose(self.serial_ln_weights(), ln_weights))
+
+    def test_weights_with_pool(self):
+        ln_weights, _, _ = bilby.core.result.get_weights_for_reweighting(
+            self.result, new_likelihood=self.new_likelihood, chunk_size=64,
+            npool=2)
+        self.assertTrue(np.allclose(self.serial_ln_weights(), ln_weights))
+
+    def write_partial_resume_file(self, likelihood):
+        os.makedirs("outdir", exist_ok=True)
+        partial = np.zeros(len(self.result.posterior))
+        partial[:100] = likelihood.log_likelihood_batch(
+            dict(m=self.result.posterior["m"].values[:100]))
+        resume_hash = bilby.core.result._reweighting_hash(
+            self.result.posterior[["m"]].values, likelihood, None)
+        bilby.core.utils.safe_file_dump(
+            dict(log_likelihood=partial, completed=100, hash=resume_hash),
+            self.resume_file, bilby.core.result.pickle)
+
+    def test_weights_resume(self):
+        with mock.patch.object(
+                self.new_likelihood, "log_likelihood_batch",
+                wraps=self.new_likelihood.log_likelihood_batch) as m:
+            self.write_partial_resume_file(self.new_likelihood)
+            ln_weights, _, _ = bilby.core.result.get_weights_for_reweighting(
+                self.result, new_likelihood=self.new_likelihood,
+                chunk_size=1000, resume_file=self.resume_file)
+            self.assertEqual(400, len(m.call_args[0][0]["m"]))
+        self.assertTrue(np.allclose(self.serial_ln_weights(), ln_weights))
+        self.assertFalse(os.path.isfile(self.resume_file))
+
+    def test_weights_resume_ignores_other_likelihood(self):
+        other_likelihood = bilby.core.likelihood.GaussianLikelihood(
+            self.x, self.y, self.model, sigma=2)
+        with mock.patch.object(
+                self.new_likelihood, "log_likelihood_batch",
+                wraps=self.new_likelihood.log_likelihood_batch) as m:
+            self.write_partial_resume_file(other_likelihood)
+            ln_weights, _, _ = bilby.core.result.get_weights_for_reweighting(
+                self.result, new_likelihood=self.new_likelihood,
+                chunk_size=1000, resume_file=self.resume_file)
+            self.assertEqual(500, len(m.call_args[0][0]["m"]))
+        self.assertTrue(np.allclose(self.serial_ln_weights(), ln_weights))
+        self.assertFalse(os.path.isfile(self.resume_file))
+
+    def test_weights_resume_from_another_process(self):
+        os.makedirs("outdir", exist_ok=True)
+        np.savez(
+            "outdir/reweight_inputs.npz", x=self.x, y=self.y,
+            samples=self.result.posterior[["m"]].values)
+        script = "\n".join([
+            "import numpy as np",
+            "import bilby",
+            "def model(x, m):",
+            "    return m * x",
+            "inputs = np.load('outdir/reweight_inputs.npz')",
+            "likelihood = bilby.core.likelihood.GaussianLikelihood(",
+            "    inputs['x'], inputs['y'], model, sigma=1.5)",
+            "samples = inputs['samples']",
+            "partial = np.zeros(len(samples))",
+            "partial[:100] = likelihood.log_likelihood_batch(dict(m=samples[:100, 0]))",
+            "bilby.core.utils.safe_file_dump(",
+            "    dict(log_likelihood=partial, completed=100,",
+            "         hash=bilby.core.result._reweighting_hash(samples, likelihood, None)),",
+            "    '{}', bilby.core.result.pickle)".format(self.resume_file),
+        ])
+        env = dict(os.environ, PYTHONHASHSEED="3")
+        subprocess.check_call([sys.executable, "-c", script], env=env)
+        with mock.patch.object(
+                self.new_likelihood, "log_likelihood_batch",
+                wraps=self.new_likelihood.log_likelihood_batch) as m:
+            ln_weights, _, _ = bilby.core.result.get_weights_for_reweighting(
+                self.result, new_likelihood=self.new_likelihood,
+                chunk_size=1000, resume_file=self.resume_file)
+            self.assertEqual(400, len(m.call_args[0][0]["m"]))
+        self.assertTrue(np.allclose(self.serial_ln_weights(), ln_weights))
+
+    def test_weights_resume_ignores_other_resume_key(self):
+        self.write_partial_resume_file(self.new_likelihood)
+        with mock.patch.object(
+                self.new_likelihood, "log_likelihood_batch",
+                wraps=self.new_likelihood.log_likelihood_batch) as m:
+            bilby.core.result.get_weights_for_reweighting(
+                self.result, new_likelihood=self.new_likelihood,
+                chunk_size=1000, resume_file=self.resume_file,
+                resume_key="other")
+            self.assertEqual(1, m.call_count)
+            self.assertEqual(500, len(m.call_args[0][0]["m"]))
+
+    def test_importance_sample_size(self):
+        weights = np.exp(self.serial_ln_weights())
+        resampled = bilby.core.result.importance_sample(
+            self.result.posterior, weights)
+        normalised = weights / np.sum(weights)
+        self.assertEqual(int(1 / np.sum(normalised ** 2)), len(resampled))
+        self.assertTrue(set(resampled["m"]).issubset(self.result.posterior["m"]))
+
+    def test_reweight_importance(self):
+        reweighted = bilby.core.result.reweight(
+            self.result, new_likelihood=self.new_likelihood,
+            resampling_method="importance")
+        self.assertTrue(reweighted.meta_data["reweighted_using_importance_sampling"])
+        self.assertGreater(len(reweighted.posterior), 0)
+
+    def test_reweight_unknown_method(self):
+        with self.assertRaises(ValueError):
+            bilby.core.result.reweight(
+                self.result, new_likelihood=self.new_likelihood,
+                resampling_method="unknown")
+
+
 class TestMiscResults(unittest.TestCase):
     def test_sanity_check_labels(self):
         labels = ["a", "$a$", "a_1", "$a_1$"]
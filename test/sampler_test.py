@@ -90,15 +90,150 @@ class TestSampler(unittest.TestCase):
         _ = self.sampler.log_likelihood([0])
         self.assertDictEqual(self.sampler.likelihood.parameters, expected_dict)
 
+    def test_log_likelihood_batch_with_use_ratio(self):
+        self.sampler.use_ratio = True
+        self.assertListEqual(
+            list(self.sampler.log_likelihood_batch([[0], [0.5]])), [1, 1])
+
+    def test_log_likelihood_batch_without_use_ratio(self):
+        self.sampler.use_ratio = False
+        self.assertListEqual(
+            list(self.sampler.log_likelihood_batch([[0], [0.5]])), [2, 2])
+
     def test_get_random_draw(self):
         self.assertEqual(self.sampler.get_random_draw_from_prior(), np.array([0.5]))
 
+    def test_npool_default(self):
+        self.assertEqual(self.sampler.npool, 1)
+        self.assertIsNone(self.sampler.pool)
+
+    def test_npool_equivalent_kwargs(self):
+        for equiv in bilby.core.sampler.base_sampler.Sampler.npool_equiv_kwargs:
+            self.sampler.kwargs = {equiv: 3}
+            self.assertEqual(self.sampler.npool, 3)
+            self.assertNotIn(equiv, self.sampler.kwargs)
+
+    def test_map_log_likelihood_without_pool(self):
+        self.sampler.use_ratio = False
+        self.assertListEqual(
+            list(self.sampler.map_log_likelihood([[0], [0.5]])), [2, 2])
+
+
+class TestSamplerPool(unittest.TestCase):
+    def setUp(self):
+        x = np.linspace(0, 1, 10)
+        likelihood = bilby.core.likelihood.GaussianLikelihood(
+            x, 2 * x, lambda x, m: m * x, sigma=1)
+        priors = bilby.core.prior.PriorDict(dict(
+            m=bilby.core.prior.Uniform(0, 4),
+            m_constraint=bilby.core.prior.Constraint(0, 3)))
+
+        def conversion(parameters):
+            parameters = parameters.copy()
+            parameters["m_constraint"] = parameters["m"]
+            return parameters
+
+        priors.conversion_function = conversion
+        self.sampler = bilby.core.sampler.Sampler(
+            likelihood=likelihood,
+            priors=priors,
+            outdir="outdir",
+            skip_import_verification=True,
+            npool=2,
+        )
+        self.thetas = np.array([[0.5], [1.0], [2.0], [3.5]])
+
+    def tearDown(self):
+        self.sampler._close_pool()
+        del self.sampler
+
+    def test_map_log_likelihood_matches_serial(self):
+        self.sampler._setup_pool()
+        self.assertIsNotNone(self.sampler.pool)
+        expected = [self.sampler.log_likelihood(theta) for theta in self.thetas[:3]]
+        actual = self.sampler.map_log_likelihood(self.thetas)
+        self.assertTrue(np.allclose(expected, actual[:3]))
+        self.assertEqual(actual[3], np.nan_to_num(-np.inf))
+
+    def test_map_log_prior_matches_serial(self):
+        expected = self.sampler.map_log_prior(self.thetas)
+        self.sampler._setup_pool()
+        self.assertTrue(np.allclose(
+            expected, self.sampler.map_log_prior(self.thetas)))
+
+    def test_close_pool(self):
+        self.sampler._setup_pool()
+        self.sampler._close_pool()
+        self.assertIsNone(self.sampler.pool)
+
     def test_base_run_sampler(self):
         sampler_copy = copy.copy(self.sampler)
         self.sampler.run_sampler()
         self.assertDictEqual(sampler_copy.__dict__, self.sampler.__dict__)
 
 
+class TestIncrementalCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = "outdir/incremental_checkpoint"
+        self.checkpoint = bilby.core.sampler.base_sampler.IncrementalCheckpoint(
+            self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        del self.checkpoint
+
+    def test_read_without_checkpoint(self):
+        self.assertFalse(self.checkpoint.exists())
+        self.assertIsNone(self.checkpoint.read())
+
+    def test_rows_are_appended(self):
+        samples = np.random.uniform(0, 1, (40, 3))
+        for ii in range(10):
+            self.checkpoint.write(
+                header=dict(iteration=4 * (ii + 1)),
+                new_rows=dict(samples=samples[4 * ii:4 * (ii + 1)]),
+                arrays=dict(live=samples[4 * ii:4 * (ii + 1)].T))
+        self.assertEqual(self.checkpoint.rows("samples"), 40)
+        header, rows, arrays = bilby.core.sampler.base_sampler.IncrementalCheckpoint(
+            self.directory).read()
+        self.assertEqual(header["iteration"], 40)
+        self.assertTrue(np.array_equal(rows["samples"], samples))
+        self.assertTrue(np.array_equal(arrays["live"], samples[-4:].T))
+
+    def test_number_of_files_grows_logarithmically(self):
+        for ii in range(37):
+            self.checkpoint.write(header=dict(), new_rows=dict(x=[ii]))
+        # 37 = 32 + 4 + 1, one chunk per set bit, one state file and the header
+        self.assertEqual(len(os.listdir(self.directory)), 5)
+        _, rows, _ = self.checkpoint.read()
+        self.assertTrue(np.array_equal(rows["x"], np.arange(37)))
+
+    def test_read_removes_unreferenced_files(self):
+        self.checkpoint.write(header=dict(), new_rows=dict(x=[0]))
+        stray = os.path.join(self.directory, "chunk_100.npz")
+        np.savez(stray, x=[1])
+        _, rows, _ = self.checkpoint.read()
+        self.assertFalse(os.path.isfile(stray))
+        self.assertTrue(np.array_equal(rows["x"], [0]))
+
+    def test_random_state_round_trip(self):
+        state = np.random.RandomState(4).get_state()
+        values, keys = self.checkpoint.pack_random_state(state)
+        self.checkpoint.write(
+            header=dict(random_state=values), arrays=dict(random_keys=keys))
+        header, _, arrays = self.checkpoint.read()
+        rstate = np.random.RandomState()
+        rstate.set_state(self.checkpoint.unpack_random_state(
+            header["random_state"], arrays["random_keys"]))
+        self.assertEqual(
+            rstate.uniform(), np.random.RandomState(4).uniform())
+
+    def test_remove(self):
+        self.checkpoint.write(header=dict())
+        self.checkpoint.remove()
+        self.assertFalse(os.path.isdir(self.directory))
+
+
 class TestCPNest(unittest.TestCase):
     def setUp(self):
         self.likelihood = MagicMock()
@@ -306,6 +441,81 @@ class TestDynesty(unittest.TestCase):
         self.assertEqual([1, 3], self.sampler.kwargs["reflective"])
         self.assertEqual(self.sampler._reflective, self.sampler.kwargs["reflective"])
 
+    def test_incremental_check_point_format(self):
+        sampler = bilby.core.sampler.Dynesty(
+            self.likelihood,
+            self.priors,
+            outdir="outdir",
+            label="label",
+            plot=False,
+            skip_import_verification=True,
+            check_point_format="incremental",
+        )
+        self.assertEqual(
+            sampler.resume_file, "outdir/label_resume/checkpoint.json")
+        with self.assertRaises(bilby.core.sampler.dynesty.DynestySetupError):
+            bilby.core.sampler.Dynesty(
+                self.likelihood,
+                self.priors,
+                skip_import_verification=True,
+                check_point_format="hdf5",
+            )
+
+    def test_incremental_check_point_round_trip(self):
+        import dynesty
+        x = np.linspace(0, 1, 10)
+        likelihood = bilby.core.likelihood.GaussianLikelihood(
+            x, 2 * x, lambda x, a, b: a * x + b, sigma=1)
+        outdir = "outdir/dynesty_incremental"
+        self.addCleanup(shutil.rmtree, outdir, ignore_errors=True)
+
+        def new_sampler():
+            sampler = bilby.core.sampler.Dynesty(
+                likelihood, self.priors, outdir=outdir, label="label",
+                plot=False, check_point_plot=False, skip_import_verification=True,
+                check_point_format="incremental", nlive=50, sample="unif")
+            sampler.sampler = dynesty.NestedSampler(
+                loglikelihood=sampler.log_likelihood,
+                prior_transform=sampler.prior_transform,
+                ndim=sampler.ndim, **sampler.sampler_init_kwargs)
+            return sampler
+
+        np.random.seed(10)
+        sampler = new_sampler()
+        for _ in range(2):
+            sampler.sampler.run_nested(
+                maxiter=50, add_live=False, print_progress=False)
+            sampler.write_current_state()
+        self.assertFalse(os.path.isfile("{}/label_samples.dat".format(outdir)))
+        state = np.random.get_state()
+
+        resumed = new_sampler()
+        np.random.seed(11)
+        self.assertTrue(resumed.read_saved_state(continuing=True))
+        for name in bilby.core.sampler.dynesty._SAVED_ATTRIBUTES:
+            np.testing.assert_array_equal(
+                getattr(resumed.sampler, "saved_{}".format(name)),
+                getattr(sampler.sampler, "saved_{}".format(name)))
+        for name in bilby.core.sampler.dynesty._LIVE_ATTRIBUTES:
+            np.testing.assert_array_equal(
+                getattr(resumed.sampler, name), getattr(sampler.sampler, name))
+        self.assertEqual(resumed.sampler.it, sampler.sampler.it)
+        self.assertEqual(resumed.sampler.ncall, sampler.sampler.ncall)
+        header, _, arrays = resumed.incremental_checkpoint.read()
+        saved_state = bilby.core.sampler.base_sampler.IncrementalCheckpoint.unpack_random_state(
+            header["random_state"], arrays["random_state_keys"])
+        np.testing.assert_array_equal(saved_state[1], state[1])
+
+        n_dead = len(sampler.sampler.saved_logl)
+        resumed.sampler.run_nested(
+            maxiter=50, add_live=False, print_progress=False)
+        self.assertGreater(len(resumed.sampler.saved_logl), n_dead)
+        self.assertGreater(
+            min(resumed.sampler.saved_logl[n_dead:]),
+            sampler.sampler.saved_logl[-1])
+        np.testing.assert_array_equal(
+            resumed.sampler.saved_logl[:n_dead], sampler.sampler.saved_logl)
+
 
 class TestEmcee(unittest.TestCase):
     def setUp(self):
@@ -373,6 +583,19 @@ class TestEmcee(unittest.TestCase):
             self.sampler.kwargs = new_kwargs
             self.assertDictEqual(expected, self.sampler.kwargs)
 
+    def test_lnpostfn_array_matches_lnpostfn(self):
+        x = np.linspace(0, 1, 10)
+        likelihood = bilby.core.likelihood.GaussianLikelihood(
+            x, 2 * x, lambda x, a, b: a * x + b, sigma=1)
+        sampler = bilby.core.sampler.Emcee(
+            likelihood, self.priors, outdir="outdir", label="label",
+            use_ratio=False, plot=False, skip_import_verification=True)
+        thetas = np.random.uniform(-0.5, 1.5, (20, 2))
+        for (post, blob), theta in zip(sampler.lnpostfn_array(thetas), thetas):
+            expected_post, expected_blob = sampler.lnpostfn(theta)
+            self.assertEqual(post, expected_post)
+            np.testing.assert_allclose(blob, expected_blob)
+
 
 class TestKombine(unittest.TestCase):
     def setUp(self):
@@ -661,6 +884,87 @@ class TestPTEmcee(unittest.TestCase):
             self.sampler.kwargs = new_kwargs
             self.assertDictEqual(expected, self.sampler.kwargs)
 
+    def test_evaluate_walkers_matches_like_prior_evaluator(self):
+        x = np.linspace(0, 1, 10)
+        likelihood = bilby.core.likelihood.GaussianLikelihood(
+            x, 2 * x, lambda x, a, b: a * x + b, sigma=1)
+        sampler = bilby.core.sampler.Ptemcee(
+            likelihood, self.priors, outdir="outdir", label="label",
+            use_ratio=False, plot=False, skip_import_verification=True)
+        sampler._setup_pool()
+        ps = np.random.uniform(-0.5, 1.5, (3, 10, 2))
+        logl, logp = sampler.evaluate_walkers(ps)
+        self.assertEqual(logl.shape, (3, 10))
+        evaluator = bilby.core.sampler.ptemcee.LikePriorEvaluator(
+            sampler.search_parameter_keys)
+        expected = np.array([evaluator(x) for x in ps.reshape((-1, 2))])
+        np.testing.assert_allclose(logl.flatten(), expected[:, 0])
+        np.testing.assert_array_equal(logp.flatten(), expected[:, 1])
+
+    def test_incremental_check_point_round_trip(self):
+        outdir = "outdir/ptemcee_incremental"
+        self.addCleanup(shutil.rmtree, outdir, ignore_errors=True)
+
+        def new_sampler():
+            sampler = bilby.core.sampler.Ptemcee(
+                self.likelihood, self.priors, outdir=outdir, label="label",
+                plot=False, skip_import_verification=True,
+                check_point_format="incremental", ntemps=2, nwalkers=4)
+            sampler.sampler = MagicMock(
+                _random=np.random.RandomState(), _time=0,
+                _betas=np.array([1.0, 0.5]), nswap=np.zeros(2),
+                nswap_accepted=np.zeros(2), nprop=np.zeros((2, 4)),
+                nprop_accepted=np.zeros((2, 4)))
+            sampler.chain_array = sampler.get_zero_chain_array()
+            sampler.log_likelihood_array = sampler.get_zero_log_likelihood_array()
+            sampler.pos0 = np.zeros((2, 4, 2))
+            sampler.iteration = 0
+            sampler.time_per_check = []
+            sampler.beta_list = []
+            sampler.tau_list = []
+            sampler.tau_list_n = []
+            return sampler
+
+        sampler = new_sampler()
+        sampler.sampler._random.seed(3)
+        for step in range(5):
+            start, sampler.iteration = sampler.iteration, sampler.iteration + 7
+            sampler.chain_array[:, start:sampler.iteration, :] = np.random.uniform(
+                0, 1, (4, 7, 2))
+            sampler.log_likelihood_array[:, :, start:sampler.iteration] = (
+                np.random.normal(0, 1, (2, 4, 7)))
+            sampler.time_per_check.append(0.1 * step)
+            sampler.beta_list.append([1.0, 0.5])
+            sampler.tau_list.append([step, step])
+            sampler.tau_list_n.append(sampler.iteration)
+            sampler.sampler._time = sampler.iteration
+            sampler.sampler.nswap = sampler.sampler.nswap + 1
+            sampler.sampler._random.uniform()
+            sampler.write_current_state(plot=False)
+        self.assertFalse(os.path.isfile("{}/label_samples.txt".format(outdir)))
+
+        resumed = new_sampler()
+        resumed._read_incremental_state()
+        self.assertEqual(resumed.iteration, 35)
+        np.testing.assert_array_equal(resumed.chain_array, sampler.chain_array)
+        np.testing.assert_array_equal(
+            resumed.log_likelihood_array, sampler.log_likelihood_array)
+        self.assertEqual(resumed.time_per_check, sampler.time_per_check)
+        self.assertEqual(resumed.beta_list, sampler.beta_list)
+        self.assertEqual(resumed.tau_list, sampler.tau_list)
+        self.assertEqual(resumed.tau_list_n, sampler.tau_list_n)
+        self.assertEqual(resumed.sampler._time, 35)
+        np.testing.assert_array_equal(resumed.sampler.nswap, np.full(2, 5))
+        self.assertEqual(
+            resumed.sampler._random.uniform(), sampler.sampler._random.uniform())
+
+        with self.assertRaises(bilby.core.sampler.base_sampler.SamplerError):
+            bilby.core.sampler.Ptemcee(
+                self.likelihood, self.priors, outdir=outdir, label="label",
+                plot=False, skip_import_verification=True,
+                check_point_format="incremental", ntemps=2, nwalkers=6,
+            )._read_incremental_state()
+
 
 class TestPyMC3(unittest.TestCase):
     def setUp(self):